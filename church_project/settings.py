@@ -25,10 +25,16 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = variables.SECRET_KEY
 
+# Profil de rendu : 'dev' (défaut : templates relus à chaque modification, Tailwind compilé
+# dans le navigateur par le CDN) ou 'production' : templates compilés une fois et gardés en
+# mémoire, CSS Tailwind purgé construit par `manage.py construire_css`, fichiers statiques
+# nommés par empreinte (collectstatic) et servis avec un cache d'un an.
+RENDER_PROFILE = os.environ.get('RENDER_PROFILE', 'dev')
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = RENDER_PROFILE != 'production'
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [hote for hote in os.environ.get('ALLOWED_HOSTS', '').split(',') if hote]
 
 
 # Application definition
@@ -45,10 +51,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # HTML, JSON et CSV compressés (brotli si disponible, sinon gzip)
+    'core.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.routers.PrimaireCollanteMiddleware',
+    # Entrées du journal d'audit écrites en un seul lot en fin de requête
+    'core.audit.JournalAuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -70,6 +81,22 @@ TEMPLATES = [
     },
 ]
 
+TAILWIND_CDN = RENDER_PROFILE != 'production'
+TAILWIND_CSS = 'core/css/tailwind.css'
+# Commande de la CLI Tailwind (ou chemin de l'exécutable autonome)
+TAILWIND_CLI = os.environ.get('TAILWIND_CLI', 'npx --yes tailwindcss@3.4.17').split()
+
+if RENDER_PROFILE == 'production':
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['debug'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+    MIDDLEWARE.insert(1, 'core.staticfiles.StatiquesMiddleware')
+
 WSGI_APPLICATION = 'church_project.wsgi.application'
 
 
@@ -83,6 +110,32 @@ DATABASES = {
     }
 }
 
+# Réplique en lecture pour les vues de rapport (core.routers), déclarée dans variables.REPLICA
+# (dictionnaire de connexion Django). Sans réplique, tout passe par 'default'.
+REPLICA = getattr(variables, 'REPLICA', None)
+if REPLICA:
+    DATABASES['replica'] = REPLICA
+
+# Profil de test : deux fichiers SQLite locaux jouant le primaire et la réplique
+# (DB_REPLICA_PROFILE=sqlite ; copie du primaire vers la réplique : manage.py copier_replique).
+if os.environ.get('DB_REPLICA_PROFILE') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'primaire.sqlite3',
+        },
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'replique.sqlite3',
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# Durée (secondes) pendant laquelle un navigateur lit sur le primaire après une écriture
+REPLICA_STICKY_SECONDS = 15
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -121,6 +174,14 @@ USE_L10N = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+if RENDER_PROFILE == 'production':
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        # Empreintes (ManifestStaticFilesStorage) + variantes .gz/.br précompressées
+        'staticfiles': {'BACKEND': 'core.staticfiles.StockageCompresse'},
+    }
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -128,4 +189,54 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.CompteUtilisateur'
+
+# Le compte de session est résolu via le cache (avec son Membre) au lieu d'une requête par page
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
+
+# En production, un cache partagé entre workers est exigé (vérification core.E001)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'church-management'),
+    }
+}
+
+# Profil de sessions : 'db' (défaut), 'cached_db' (cache + base) ou 'signed_cookies' (aucun accès serveur)
+SESSION_PROFILES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_PROFILES[os.environ.get('SESSION_PROFILE', 'db')]
 LOGIN_URL = reverse_lazy('login')
+
+# Courtier des compteurs en direct du tableau de bord (core.live).
+# Le courtier en mémoire ne relie que les connexions d'un même processus.
+LIVE_COUNTERS_BROKER = 'core.live.InProcessBroker'
+
+# Limites de débit (tentatives, fenêtre en secondes) appliquées avant le travail coûteux
+RATE_LIMITS = {
+    'login_ip': (20, 300),
+    'login_username': (5, 300),
+    'demande_acces': (5, 3600),
+}
+# À activer uniquement derrière un proxy qui réécrit X-Forwarded-For
+RATELIMIT_TRUST_X_FORWARDED_FOR = False
+
+# Notifications groupées (core.notifications) : moteur par canal, débit maximal (messages/s)
+# par canal, threads d'envoi, taille des lots, tentatives par destinataire et délai initial
+# avant une nouvelle tentative (secondes, doublé à chaque échec).
+# Les emails passent par EMAIL_BACKEND (console en local : EMAIL_BACKEND=django.core.mail.backends.console.EmailBackend).
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+NOTIFICATIONS = {
+    'backends': {
+        'email': 'core.notifications.EmailBackend',
+        'sms': os.environ.get('SMS_BACKEND', 'core.notifications.ConsoleSmsBackend'),
+    },
+    'debit': {'email': 10, 'sms': 5},
+    'concurrence': 4,
+    'taille_lot': 200,
+    'tentatives_max': 3,
+    'delai_reessai': 60,
+    'sms_file_path': BASE_DIR / 'sms.log',
+}
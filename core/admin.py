@@ -1,16 +1,73 @@
 # admin.py
-from django.contrib import admin
+import uuid
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.db import transaction
+from django.utils import timezone
 from .models import (
     Membre, Role, MembreRole, CompteUtilisateur, Couple, ProgrammeMariage,
     ProgrammeEglise, Groupe, MembreGroupe, TransactionFinanciere, DonMateriel,
-    DemandeAcces
+    DemandeAcces, Presence, StatistiquePresence, Notification, EnvoiNotification,
+    MembreArchive, TransactionFinanciereArchive, DonMaterielArchive, JournalAudit
 )
+from .paginators import EstimatedCountPaginator
+from .versions import bump_version
+from .services import GROUPE_LOT_MAX, modifier_membres_lot
+
+
+class GrandeTableChangeList(ChangeList):
+    """Liste dont la page affichée suit celle servie par le paginateur (page hors limites ramenée)."""
+
+    def get_results(self, request):
+        super().get_results(request)
+        if self.paginator.numero_servi is not None:
+            self.page_num = self.paginator.numero_servi
+            self.result_count = self.paginator.count
+
+
+class GrandeTableAdmin(admin.ModelAdmin):
+    """Base des listes pouvant atteindre des millions de lignes.
+
+    Les plus volumineuses (membres, transactions, présences, journal d'audit)
+    n'ont pas de date_hierarchy : sa barre de navigation lance des agrégats
+    par année, mois et jour sur toute la table.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    def get_changelist(self, request, **kwargs):
+        return GrandeTableChangeList
+
 
 @admin.register(Membre)
-class MembreAdmin(admin.ModelAdmin):
-    list_display = ('nom', 'prenom', 'email', 'telephone', 'statut_baptismal', 'date_adhesion')
+class MembreAdmin(GrandeTableAdmin):
+    list_display = ('nom', 'prenom', 'email', 'telephone', 'statut_baptismal', 'date_adhesion', 'is_active')
     search_fields = ('nom', 'prenom', 'email')
-    list_filter = ('statut_baptismal', 'date_adhesion')
+    list_filter = ('is_active', 'statut_baptismal', 'date_adhesion')
+    actions = ('activer_membres', 'desactiver_membres')
+
+    def _changer_statut(self, request, queryset, is_active):
+        # Même chemin que la modification par lot : un UPDATE par tranche, journal d'audit,
+        # annuaire, comptes en cache et tableaux de bord invalidés une fois par tranche
+        ids = list(queryset.values_list('pk', flat=True))
+        nombre = 0
+        with transaction.atomic():
+            for debut in range(0, len(ids), GROUPE_LOT_MAX):
+                resultat = modifier_membres_lot(
+                    ids[debut:debut + GROUPE_LOT_MAX], {'is_active': is_active}, auteur=request.user
+                )
+                nombre += resultat['modifies']
+        etat = "activé(s)" if is_active else "désactivé(s)"
+        self.message_user(request, f"{nombre} membre(s) {etat}.", messages.SUCCESS)
+
+    @admin.action(description="Activer les membres sélectionnés")
+    def activer_membres(self, request, queryset):
+        self._changer_statut(request, queryset, True)
+
+    @admin.action(description="Désactiver les membres sélectionnés")
+    def desactiver_membres(self, request, queryset):
+        self._changer_statut(request, queryset, False)
 
 @admin.register(Role)
 class RoleAdmin(admin.ModelAdmin):
@@ -19,33 +76,44 @@ class RoleAdmin(admin.ModelAdmin):
     list_filter = ('nom_role',)
 
 @admin.register(MembreRole)
-class MembreRoleAdmin(admin.ModelAdmin):
+class MembreRoleAdmin(GrandeTableAdmin):
     list_display = ('membre', 'role')
+    list_select_related = ('membre', 'role')
+    list_filter = ('role',)
     search_fields = ('membre__nom', 'role__nom_role')
+    autocomplete_fields = ('membre', 'role')
 
 @admin.register(CompteUtilisateur)
 class CompteUtilisateurAdmin(admin.ModelAdmin):
     list_display = ('username', 'email', 'is_active', 'last_login', 'membre')
+    list_select_related = ('membre',)
     search_fields = ('username', 'email')
     list_filter = ('is_active', 'date_joined')
+    autocomplete_fields = ('membre',)
 
 @admin.register(Couple)
-class CoupleAdmin(admin.ModelAdmin):
+class CoupleAdmin(GrandeTableAdmin):
     list_display = ('membre_mari', 'membre_femme', 'statut_couple', 'date_mariage')
+    list_select_related = ('membre_mari', 'membre_femme')
     search_fields = ('membre_mari__nom', 'membre_femme__nom')
-    list_filter = ('statut_couple',)
+    list_filter = ('statut_couple', 'is_active')
+    autocomplete_fields = ('membre_mari', 'membre_femme')
 
 @admin.register(ProgrammeMariage)
-class ProgrammeMariageAdmin(admin.ModelAdmin):
+class ProgrammeMariageAdmin(GrandeTableAdmin):
     list_display = ('titre', 'couple', 'date_debut', 'date_fin', 'statut')
+    list_select_related = ('couple__membre_mari', 'couple__membre_femme')
     list_filter = ('statut', 'date_debut')
     search_fields = ('titre', 'couple__membre_mari__nom', 'couple__membre_femme__nom')
+    date_hierarchy = 'date_debut'
+    autocomplete_fields = ('couple',)
 
 @admin.register(ProgrammeEglise)
 class ProgrammeEgliseAdmin(admin.ModelAdmin):
     list_display = ('titre', 'categorie', 'date_debut', 'lieu')
     list_filter = ('categorie', 'date_debut')
     search_fields = ('titre', 'lieu')
+    date_hierarchy = 'date_debut'
 
 @admin.register(Groupe)
 class GroupeAdmin(admin.ModelAdmin):
@@ -53,24 +121,126 @@ class GroupeAdmin(admin.ModelAdmin):
     search_fields = ('nom_groupe',)
 
 @admin.register(MembreGroupe)
-class MembreGroupeAdmin(admin.ModelAdmin):
+class MembreGroupeAdmin(GrandeTableAdmin):
     list_display = ('membre', 'groupe')
+    list_select_related = ('membre', 'groupe')
+    list_filter = ('groupe',)
     search_fields = ('membre__nom', 'groupe__nom_groupe')
+    autocomplete_fields = ('membre', 'groupe')
 
 @admin.register(TransactionFinanciere)
-class TransactionFinanciereAdmin(admin.ModelAdmin):
+class TransactionFinanciereAdmin(GrandeTableAdmin):
     list_display = ('type_transaction', 'montant', 'date_transaction', 'membre', 'categorie_depense')
-    list_filter = ('type_transaction', 'categorie_depense', 'date_transaction')
+    list_select_related = ('membre',)
+    list_filter = ('type_transaction', 'categorie_depense')
     search_fields = ('membre__nom',)
+    raw_id_fields = ('membre',)
 
 @admin.register(DonMateriel)
-class DonMaterielAdmin(admin.ModelAdmin):
+class DonMaterielAdmin(GrandeTableAdmin):
     list_display = ('membre', 'description_objet', 'valeur_estimee', 'statut_don', 'date_don')
-    list_filter = ('statut_don', 'date_don')
+    list_select_related = ('membre',)
+    list_filter = ('statut_don',)
     search_fields = ('membre__nom', 'description_objet')
+    date_hierarchy = 'date_don'
+    raw_id_fields = ('membre',)
+    actions = ('marquer_utilises',)
+
+    @admin.action(description="Marquer les dons sélectionnés comme utilisés")
+    def marquer_utilises(self, request, queryset):
+        # update() n'émet pas de signaux : entrées du journal d'audit écrites ici, en un bulk_create
+        with transaction.atomic():
+            anciens = dict(
+                queryset.exclude(statut_don='utilise').select_for_update().values_list('pk', 'statut_don')
+            )
+            nombre = DonMateriel.objects.filter(pk__in=anciens).update(
+                statut_don='utilise', updated_at=timezone.now()
+            )
+            lot = uuid.uuid4()
+            JournalAudit.objects.bulk_create([
+                JournalAudit(
+                    modele='don_materiel', objet_id=pk, action='modification',
+                    changements={'statut_don': [statut, 'utilise']}, auteur=request.user, lot=lot,
+                )
+                for pk, statut in anciens.items()
+            ], batch_size=500)
+            transaction.on_commit(lambda: bump_version('don_materiel'))
+        self.message_user(request, f"{nombre} don(s) marqué(s) comme utilisé(s).", messages.SUCCESS)
 
 @admin.register(DemandeAcces)
 class DemandeAccesAdmin(admin.ModelAdmin):
     list_display = ('nom_complet', 'email', 'role_souhaite', 'est_traitee', 'date_demande')
     list_filter = ('est_traitee', 'role_souhaite')
     search_fields = ('nom_complet', 'email')
+
+@admin.register(Presence)
+class PresenceAdmin(GrandeTableAdmin):
+    list_display = ('membre', 'programme', 'date_occurrence')
+    list_filter = ('programme__categorie',)
+    list_select_related = ('membre', 'programme')
+    raw_id_fields = ('membre', 'programme')
+
+@admin.register(StatistiquePresence)
+class StatistiquePresenceAdmin(admin.ModelAdmin):
+    list_display = ('portee', 'cle', 'presences', 'occurrences', 'taux', 'calcule_le')
+    list_filter = ('portee',)
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('sujet', 'canal', 'description_cible', 'auteur', 'created_at')
+    list_filter = ('canal',)
+    list_select_related = ('auteur',)
+    raw_id_fields = ('auteur',)
+
+
+@admin.register(EnvoiNotification)
+class EnvoiNotificationAdmin(GrandeTableAdmin):
+    list_display = ('destinataire', 'notification', 'statut', 'tentatives', 'envoye_le')
+    list_filter = ('statut',)
+    search_fields = ('destinataire',)
+    list_select_related = ('notification',)
+    raw_id_fields = ('notification', 'membre')
+
+
+class ArchiveAdmin(GrandeTableAdmin):
+    """Archives consultables en lecture seule."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MembreArchive)
+class MembreArchiveAdmin(ArchiveAdmin):
+    list_display = ('nom', 'prenom', 'email', 'date_adhesion', 'archive_le')
+    search_fields = ('nom', 'prenom', 'email')
+    date_hierarchy = 'archive_le'
+
+
+@admin.register(TransactionFinanciereArchive)
+class TransactionFinanciereArchiveAdmin(ArchiveAdmin):
+    list_display = ('date_transaction', 'type_transaction', 'montant', 'membre')
+    list_filter = ('type_transaction',)
+    list_select_related = ('membre',)
+    raw_id_fields = ('membre',)
+
+
+@admin.register(DonMaterielArchive)
+class DonMaterielArchiveAdmin(ArchiveAdmin):
+    list_display = ('date_don', 'membre', 'valeur_estimee', 'statut_don')
+    list_select_related = ('membre',)
+    raw_id_fields = ('membre',)
+
+
+@admin.register(JournalAudit)
+class JournalAuditAdmin(ArchiveAdmin):
+    list_display = ('horodatage', 'modele', 'objet_id', 'action', 'auteur', 'lot')
+    list_filter = ('modele', 'action')
+    list_select_related = ('auteur',)
+    raw_id_fields = ('auteur',)
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,408 @@
+# api.py
+"""API JSON en lecture/écriture pour l'application mobile et les scripts de rapport.
+
+Chaque ressource (même nom que dans le flux de synchronisation) déclare
+ses champs publics, ses champs par défaut, ses champs modifiables et ses
+relations. Les réponses sont construites par `.values()` : la requête ne
+lit que les colonnes demandées et aucun objet modèle n'est instancié.
+
+- `?fields=nom,prenom` : champs de la ressource (l'id est toujours inclus) ;
+  `?fields[membre]=nom` : champs d'une relation incluse.
+- `?include=membre,groupes` : une relation simple (clé étrangère) est lue
+  par jointure dans la même requête, comme select_related ; une relation
+  multiple coûte une requête de plus pour toute la page, comme
+  prefetch_related.
+- `?limit=50&cursor=...` : pagination par curseur sur l'id (index de clé
+  primaire) ; `next` vaut null sur la dernière page.
+- `?<champ>=<valeur>` sur les champs filtrables de la ressource.
+
+La sérialisation passe par orjson s'il est installé, sinon par le module
+json de la bibliothèque standard.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.forms.models import model_to_dict, modelform_factory
+from .models import (
+    Membre, Couple, Groupe, MembreGroupe, ProgrammeEglise, ProgrammeMariage,
+    TransactionFinanciere, DonMateriel
+)
+from .planning import conflits
+from .services import valider_conjoints
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LIMITE_DEFAUT = 50
+LIMITE_MAX = 200
+PARAMETRES_RESERVES = {'fields', 'include', 'cursor', 'limit'}
+
+
+class ErreurApi(Exception):
+    def __init__(self, message, status=400, details=None):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+@dataclass(frozen=True)
+class Relation:
+    """Relation incluable : clé étrangère (`champ`) ou relation multiple (`modele` + `source`).
+
+    Pour une relation multiple, `modele` est la table lue, `source` sa clé
+    vers la ressource parente et `prefixe` le chemin vers la ressource liée
+    ('groupe__' à travers MembreGroupe, '' si `modele` est la ressource liée).
+    """
+    ressource: str
+    champ: str = ''
+    modele: type = None
+    source: str = ''
+    prefixe: str = ''
+
+    @property
+    def multiple(self):
+        return self.modele is not None
+
+
+@dataclass(frozen=True)
+class Ressource:
+    modele: type
+    champs: tuple
+    champs_defaut: tuple
+    ecriture: tuple
+    filtres: tuple = ()
+    relations: dict = field(default_factory=dict)
+    roles_lecture: tuple = ()
+    roles_ecriture: tuple = ()
+    # Fonction (instance) -> réservations du lieu en conflit, appelée avant l'enregistrement
+    verifier: object = None
+    # Fonction (instance) -> messages d'erreur métier, appelée après la validation du formulaire
+    valider: object = None
+
+    @property
+    def queryset(self):
+        # Les ressources à suppression logique n'exposent que les lignes actives
+        return self.modele.objects.all()
+
+
+def _conflits_programme_eglise(programme):
+    programme.calculer_intervalle()
+    if not programme.lieu or not programme.debut_complet:
+        return []
+    return conflits(programme.lieu, programme.debut_complet, programme.fin_complet, exclure_eglise=programme.pk)
+
+
+def _conjoints_couple(couple):
+    return valider_conjoints(couple.membre_mari_id, couple.membre_femme_id, couple if couple.pk else None)
+
+
+def _conflits_programme_mariage(programme):
+    if programme.statut == 'annule' or not programme.lieu:
+        return []
+    return conflits(programme.lieu, programme.date_debut, programme.date_fin, exclure_mariage=programme.pk)
+
+
+RESSOURCES = {
+    'membre': Ressource(
+        Membre,
+        champs=('id', 'nom', 'prenom', 'date_naissance', 'sexe', 'telephone', 'email', 'adresse',
+                'statut_baptismal', 'date_adhesion', 'photo_profil_url', 'is_active', 'created_at', 'updated_at'),
+        champs_defaut=('id', 'nom', 'prenom', 'sexe', 'telephone', 'email', 'statut_baptismal'),
+        ecriture=('nom', 'prenom', 'date_naissance', 'sexe', 'telephone', 'email', 'adresse',
+                  'statut_baptismal', 'date_adhesion', 'photo_profil_url'),
+        filtres=('sexe', 'statut_baptismal'),
+        relations={'groupes': Relation('groupe', modele=MembreGroupe, source='membre_id', prefixe='groupe__')},
+    ),
+    'couple': Ressource(
+        Couple,
+        champs=('id', 'membre_mari_id', 'membre_femme_id', 'statut_couple', 'date_mariage', 'is_active',
+                'created_at', 'updated_at'),
+        champs_defaut=('id', 'membre_mari_id', 'membre_femme_id', 'statut_couple', 'date_mariage'),
+        ecriture=('membre_mari_id', 'membre_femme_id', 'statut_couple', 'date_mariage'),
+        filtres=('statut_couple',),
+        relations={
+            'membre_mari': Relation('membre', champ='membre_mari'),
+            'membre_femme': Relation('membre', champ='membre_femme'),
+            'programmes_mariage': Relation('programme_mariage', modele=ProgrammeMariage, source='couple_id'),
+        },
+        valider=_conjoints_couple,
+    ),
+    'groupe': Ressource(
+        Groupe,
+        champs=('id', 'nom_groupe', 'description', 'is_active', 'created_at', 'updated_at'),
+        champs_defaut=('id', 'nom_groupe', 'description'),
+        ecriture=('nom_groupe', 'description'),
+        relations={'membres': Relation('membre', modele=MembreGroupe, source='groupe_id', prefixe='membre__')},
+        roles_ecriture=('pasteur',),
+    ),
+    'programme_eglise': Ressource(
+        ProgrammeEglise,
+        champs=('id', 'titre', 'description', 'date_debut', 'heure_debut', 'date_fin', 'heure_fin', 'lieu',
+                'categorie', 'recurrence', 'created_at', 'updated_at'),
+        champs_defaut=('id', 'titre', 'date_debut', 'heure_debut', 'date_fin', 'heure_fin', 'lieu', 'categorie'),
+        ecriture=('titre', 'description', 'date_debut', 'heure_debut', 'date_fin', 'heure_fin', 'lieu',
+                  'categorie', 'recurrence'),
+        filtres=('categorie', 'lieu'),
+        roles_ecriture=('coordinateur_programme', 'pasteur'),
+        verifier=_conflits_programme_eglise,
+    ),
+    'programme_mariage': Ressource(
+        ProgrammeMariage,
+        champs=('id', 'couple_id', 'titre', 'description', 'date_debut', 'date_fin', 'lieu', 'statut',
+                'created_at', 'updated_at'),
+        champs_defaut=('id', 'couple_id', 'titre', 'date_debut', 'date_fin', 'lieu', 'statut'),
+        ecriture=('couple_id', 'titre', 'description', 'date_debut', 'date_fin', 'lieu', 'statut'),
+        filtres=('statut', 'couple_id'),
+        relations={'couple': Relation('couple', champ='couple')},
+        roles_ecriture=('coordinateur_programme', 'pasteur'),
+        verifier=_conflits_programme_mariage,
+    ),
+    'transaction': Ressource(
+        TransactionFinanciere,
+        champs=('id', 'type_transaction', 'montant', 'date_transaction', 'description', 'membre_id',
+                'categorie_depense', 'created_at', 'updated_at'),
+        champs_defaut=('id', 'type_transaction', 'montant', 'date_transaction', 'membre_id', 'categorie_depense'),
+        ecriture=('type_transaction', 'montant', 'date_transaction', 'description', 'membre_id', 'categorie_depense'),
+        filtres=('type_transaction', 'categorie_depense', 'membre_id'),
+        relations={'membre': Relation('membre', champ='membre')},
+        roles_lecture=('tresorier', 'pasteur'),
+        roles_ecriture=('tresorier', 'pasteur'),
+    ),
+    'don_materiel': Ressource(
+        DonMateriel,
+        champs=('id', 'membre_id', 'description_objet', 'valeur_estimee', 'date_don', 'statut_don',
+                'created_at', 'updated_at'),
+        champs_defaut=('id', 'membre_id', 'description_objet', 'valeur_estimee', 'date_don', 'statut_don'),
+        ecriture=('membre_id', 'description_objet', 'valeur_estimee', 'date_don', 'statut_don'),
+        filtres=('statut_don', 'membre_id'),
+        relations={'membre': Relation('membre', champ='membre')},
+        roles_lecture=('tresorier', 'pasteur'),
+        roles_ecriture=('tresorier', 'pasteur'),
+    ),
+}
+
+
+# --- Sérialisation ---
+
+def _defaut(valeur):
+    # Montants en chaîne, comme DjangoJSONEncoder, pour ne pas perdre de précision
+    if isinstance(valeur, Decimal):
+        return str(valeur)
+    raise TypeError
+
+
+def dumps(donnees):
+    if orjson is not None:
+        return orjson.dumps(donnees, default=_defaut, option=orjson.OPT_UTC_Z)
+    return json.dumps(donnees, cls=DjangoJSONEncoder).encode()
+
+
+def loads(contenu):
+    try:
+        donnees = orjson.loads(contenu) if orjson is not None else json.loads(contenu)
+    except ValueError:
+        raise ErreurApi("JSON invalide")
+    if not isinstance(donnees, dict):
+        raise ErreurApi("Objet JSON attendu")
+    return donnees
+
+
+# --- Lecture ---
+
+def get_ressource(nom):
+    try:
+        return RESSOURCES[nom]
+    except KeyError:
+        raise ErreurApi("Ressource inconnue", status=404)
+
+
+def _liste(valeur):
+    return [element.strip() for element in valeur.split(',') if element.strip()]
+
+
+def _champs(ressource, valeur, nom):
+    """Champs demandés (l'id toujours en premier), validés contre les champs publics."""
+    if not valeur:
+        return list(ressource.champs_defaut)
+    champs = _liste(valeur)
+    inconnus = [champ for champ in champs if champ not in ressource.champs]
+    if inconnus:
+        raise ErreurApi(f"Champ(s) inconnu(s) pour {nom} : {', '.join(inconnus)}")
+    return ['id'] + [champ for champ in champs if champ != 'id']
+
+
+def encoder_curseur(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip('=')
+
+
+def decoder_curseur(curseur):
+    try:
+        valeur = int(base64.urlsafe_b64decode(curseur + '=' * (-len(curseur) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ErreurApi("Curseur invalide")
+    # Un identifiant hors des bornes d'un BIGINT ferait échouer la requête
+    if not 0 <= valeur < 2 ** 63:
+        raise ErreurApi("Curseur invalide")
+    return valeur
+
+
+class Requete:
+    """Paramètres de lecture (fields, include, filtres) validés avant toute requête SQL."""
+
+    def __init__(self, nom, params):
+        self.nom = nom
+        self.ressource = get_ressource(nom)
+        self.champs = _champs(self.ressource, params.get('fields'), nom)
+        self.inclusions = {}
+        for relation_nom in _liste(params.get('include', '')):
+            relation = self.ressource.relations.get(relation_nom)
+            if relation is None:
+                raise ErreurApi(f"Relation inconnue pour {nom} : {relation_nom}")
+            self.inclusions[relation_nom] = (
+                relation, _champs(RESSOURCES[relation.ressource], params.get(f'fields[{relation_nom}]'), relation_nom)
+            )
+        self.filtres = {}
+        for cle, valeur in params.items():
+            if cle in PARAMETRES_RESERVES or cle.startswith('fields['):
+                continue
+            if cle not in self.ressource.filtres:
+                raise ErreurApi(f"Filtre inconnu pour {nom} : {cle}")
+            # Valeur convertie par le champ du modèle : une valeur invalide est une erreur 400, pas une 500
+            try:
+                self.filtres[cle] = self.ressource.modele._meta.get_field(cle).to_python(valeur)
+            except (ValidationError, ValueError, TypeError):
+                raise ErreurApi(f"Valeur invalide pour le filtre {cle} : {valeur}")
+
+    def colonnes(self):
+        """Colonnes de .values() : champs propres et champs des clés étrangères incluses (jointure)."""
+        colonnes = list(self.champs)
+        for relation_nom, (relation, champs) in self.inclusions.items():
+            if not relation.multiple:
+                colonnes += [f"{relation.champ}__{champ}" for champ in champs]
+        return colonnes
+
+    def lignes(self, queryset):
+        """Exécute le queryset et assemble les relations incluses ; une requête par relation multiple."""
+        lignes = list(queryset.values(*self.colonnes()))
+        for ligne in lignes:
+            for relation_nom, (relation, champs) in self.inclusions.items():
+                if relation.multiple:
+                    continue
+                lie = {champ: ligne.pop(f"{relation.champ}__{champ}") for champ in champs}
+                ligne[relation_nom] = lie if lie['id'] is not None else None
+
+        ids = [ligne['id'] for ligne in lignes]
+        for relation_nom, (relation, champs) in self.inclusions.items():
+            if not relation.multiple:
+                continue
+            par_parent = {pk: [] for pk in ids}
+            if ids:
+                lies = relation.modele.objects.filter(**{f"{relation.source}__in": ids})
+                modele_lie = RESSOURCES[relation.ressource].modele
+                if hasattr(modele_lie, 'tous'):
+                    lies = lies.filter(**{f"{relation.prefixe}is_active": True})
+                colonnes = [relation.prefixe + champ for champ in champs]
+                for lie in lies.order_by(relation.prefixe + 'id').values(relation.source, *colonnes):
+                    par_parent[lie[relation.source]].append(
+                        {champ: lie[relation.prefixe + champ] for champ in champs}
+                    )
+            for ligne in lignes:
+                ligne[relation_nom] = par_parent[ligne['id']]
+        return lignes
+
+
+def lister(nom, params):
+    requete = Requete(nom, params)
+    try:
+        limite = max(1, min(int(params.get('limit', LIMITE_DEFAUT)), LIMITE_MAX))
+    except ValueError:
+        raise ErreurApi("limit doit être un entier")
+    queryset = requete.ressource.queryset.filter(**requete.filtres).order_by('id')
+    if params.get('cursor'):
+        queryset = queryset.filter(id__gt=decoder_curseur(params['cursor']))
+    lignes = requete.lignes(queryset[:limite + 1])
+    suivant = encoder_curseur(lignes[limite - 1]['id']) if len(lignes) > limite else None
+    return {'data': lignes[:limite], 'next': suivant}
+
+
+def detail(nom, pk, params):
+    requete = Requete(nom, params)
+    lignes = requete.lignes(requete.ressource.queryset.filter(pk=pk))
+    if not lignes:
+        raise ErreurApi("Objet introuvable", status=404)
+    return {'data': lignes[0]}
+
+
+# --- Écriture ---
+
+def _instance(ressource, pk):
+    try:
+        return ressource.queryset.get(pk=pk)
+    except ressource.modele.DoesNotExist:
+        raise ErreurApi("Objet introuvable", status=404)
+
+
+def enregistrer(nom, donnees, pk=None, partiel=False):
+    """Crée (pk=None) ou modifie un objet avec la validation du modèle ; renvoie son pk.
+
+    Les clés étrangères s'écrivent sous leur nom de lecture (`membre_id`).
+    Une modification partielle (PATCH) complète les données avec les
+    valeurs actuelles ; un remplacement (PUT) exige tous les champs requis.
+    """
+    ressource = get_ressource(nom)
+    inconnus = set(donnees) - set(ressource.ecriture)
+    if inconnus:
+        raise ErreurApi(f"Champ(s) non modifiable(s) : {', '.join(sorted(inconnus))}")
+
+    # Nom du champ de formulaire (membre) pour chaque champ d'écriture (membre_id)
+    noms = {attname: ressource.modele._meta.get_field(attname).name for attname in ressource.ecriture}
+    Formulaire = modelform_factory(ressource.modele, fields=list(noms.values()))
+    instance = _instance(ressource, pk) if pk is not None else None
+    donnees_form = model_to_dict(instance, fields=list(noms.values())) if instance and partiel else {}
+    donnees_form.update({noms[attname]: valeur for attname, valeur in donnees.items()})
+
+    formulaire = Formulaire(donnees_form, instance=instance)
+    if not formulaire.is_valid():
+        raise ErreurApi("Données invalides", details=formulaire.errors.get_json_data())
+    objet = formulaire.save(commit=False)
+    if ressource.valider is not None:
+        erreurs = ressource.valider(objet)
+        if erreurs:
+            raise ErreurApi("Données invalides", details=erreurs)
+    if ressource.verifier is not None:
+        reservations = ressource.verifier(objet)
+        if reservations:
+            raise ErreurApi("Lieu déjà réservé", status=409, details=[
+                {'titre': reservation.titre, 'debut': reservation.debut, 'fin': reservation.fin}
+                for reservation in reservations[:5]
+            ])
+    with transaction.atomic():
+        objet.save()
+    return objet.pk
+
+
+def supprimer(nom, pk):
+    """Supprime un objet ; membres, couples et groupes sont seulement désactivés.
+
+    La désactivation est soumise aux mêmes règles que la suppression
+    (`verifier_suppression` du modèle : couple avec des programmes actifs).
+    """
+    ressource = get_ressource(nom)
+    objet = _instance(ressource, pk)
+    if hasattr(objet, 'verifier_suppression'):
+        try:
+            objet.verifier_suppression()
+        except ValidationError as erreur:
+            raise ErreurApi(" ".join(erreur.messages), status=409)
+    if hasattr(ressource.modele, 'tous'):
+        objet.is_active = False
+        objet.save(update_fields=['is_active', 'updated_at'])
+    else:
+        objet.delete()
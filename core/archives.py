@@ -0,0 +1,84 @@
+# archives.py
+"""Archivage des membres inactifs depuis longtemps.
+
+Les membres désactivés restent dans la table Membre (managers `tous` et
+`objects`) ; après un délai, la commande `archiver_membres` les déplace
+avec leurs transactions et dons matériels vers les tables *Archive, par
+lots, pour garder les tables courantes petites. L'historique reste
+consultable dans les tables d'archive (administration, `historique_archive`).
+
+Ne sont archivés que les membres qui n'ont ni compte utilisateur ni
+couple (ces suppressions en cascade effaceraient des données encore
+utiles), ni transaction ou don postérieur au délai. Leurs rôles,
+appartenances aux groupes et présences sont supprimés avec eux.
+"""
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from .models import (
+    Membre, Couple, CompteUtilisateur, TransactionFinanciere, DonMateriel,
+    MembreArchive, TransactionFinanciereArchive, DonMaterielArchive
+)
+
+CHAMPS_MEMBRE = [
+    'id', 'nom', 'prenom', 'date_naissance', 'adresse', 'telephone', 'email', 'sexe',
+    'statut_baptismal', 'date_adhesion', 'photo_profil_url', 'created_at', 'updated_at',
+]
+CHAMPS_TRANSACTION = [
+    'id', 'membre_id', 'type_transaction', 'montant', 'date_transaction', 'description',
+    'categorie_depense', 'created_at', 'updated_at',
+]
+CHAMPS_DON = [
+    'id', 'membre_id', 'description_objet', 'valeur_estimee', 'date_don', 'statut_don',
+    'created_at', 'updated_at',
+]
+
+
+def membres_archivables(jours):
+    """Membres inactifs non modifiés depuis `jours` jours, sans compte, couple ni activité récente."""
+    limite = timezone.now() - timedelta(days=jours)
+    return Membre.tous.filter(is_active=False, updated_at__lt=limite).exclude(
+        Exists(CompteUtilisateur.objects.filter(membre=OuterRef('pk')))
+    ).exclude(
+        Exists(Couple.tous.filter(Q(membre_mari=OuterRef('pk')) | Q(membre_femme=OuterRef('pk'))))
+    ).exclude(
+        Exists(TransactionFinanciere.objects.filter(membre=OuterRef('pk'), date_transaction__gte=limite))
+    ).exclude(
+        Exists(DonMateriel.objects.filter(membre=OuterRef('pk'), date_don__gte=limite))
+    )
+
+
+def archiver_lot(ids):
+    """Copie un lot de membres et leur historique dans les archives, puis les supprime des tables courantes."""
+    maintenant = timezone.now()
+    with transaction.atomic():
+        membres = list(Membre.tous.select_for_update().filter(pk__in=ids, is_active=False).values(*CHAMPS_MEMBRE))
+        ids = [membre['id'] for membre in membres]
+        MembreArchive.objects.bulk_create(
+            [MembreArchive(archive_le=maintenant, **membre) for membre in membres], batch_size=500
+        )
+        transactions = TransactionFinanciere.objects.filter(membre_id__in=ids)
+        TransactionFinanciereArchive.objects.bulk_create(
+            [TransactionFinanciereArchive(archive_le=maintenant, **ligne)
+             for ligne in transactions.values(*CHAMPS_TRANSACTION)], batch_size=500
+        )
+        DonMaterielArchive.objects.bulk_create(
+            [DonMaterielArchive(archive_le=maintenant, **ligne)
+             for ligne in DonMateriel.objects.filter(membre_id__in=ids).values(*CHAMPS_DON)], batch_size=500
+        )
+        # Les transactions ne suivent pas le membre (SET_NULL) : supprimées explicitement.
+        # Les suppressions passent par le collecteur pour créer les traces de synchronisation.
+        transactions.delete()
+        Membre.tous.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+def historique_archive(pk):
+    """Membre archivé avec ses transactions et dons, pour une consultation ponctuelle."""
+    membre = MembreArchive.objects.get(pk=pk)
+    return {
+        'membre': membre,
+        'transactions': list(membre.transactions.all()),
+        'dons_materiels': list(membre.dons_materiels.all()),
+    }
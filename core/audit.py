@@ -0,0 +1,216 @@
+# audit.py
+"""Journal d'audit des membres, couples et transactions financières.
+
+Chaque enregistrement ou suppression d'un objet audité produit une entrée
+JournalAudit avec le détail des champs modifiés ({champ: [avant, après]}).
+Les valeurs précédentes viennent de la lecture déjà faite par le signal
+pre_save des compteurs (core.signals) : l'audit n'ajoute pas de requête
+par écriture.
+
+Pendant une requête, les entrées sont mises en tampon (après validation de
+la transaction, pour ne jamais journaliser une écriture annulée) puis
+écrites par `JournalAuditMiddleware` en un seul bulk_create à la fin de la
+réponse, avec l'utilisateur connecté comme auteur. Hors requête (commandes,
+shell), elles sont écrites dès la validation.
+
+La table est en ajout seul et, sous PostgreSQL et MySQL, partitionnée par
+mois sur `horodatage` (migration 0018) ; `manage.py partitions_journal`
+crée les partitions des mois à venir. Des déclencheurs refusent toute
+modification ou suppression d'une ligne.
+"""
+from contextvars import ContextVar
+from datetime import date
+from django.db import transaction
+from django.utils import timezone
+from .models import JournalAudit, Membre, Couple, TransactionFinanciere
+
+TABLE = 'core_journalaudit'
+
+# Modèles audités et nom enregistré dans JournalAudit.modele (mêmes noms que le flux de synchronisation)
+MODELES_AUDITES = {
+    Membre: 'membre',
+    Couple: 'couple',
+    TransactionFinanciere: 'transaction',
+}
+
+MODELES_PAR_NOM = {nom: model for model, nom in MODELES_AUDITES.items()}
+
+# Rôles autorisés à consulter l'historique d'un objet
+ROLES_HISTORIQUE = {
+    'membre': ('pasteur',),
+    'couple': ('pasteur',),
+    'transaction': ('tresorier', 'pasteur'),
+}
+
+# Tampon et requête en cours (None hors requête)
+_tampon = ContextVar('journal_audit', default=None)
+_requete = ContextVar('journal_audit_requete', default=None)
+
+
+def champs_audites(model):
+    """Champs suivis : champs modifiables, hors clé primaire et horodatages automatiques."""
+    return [champ for champ in model._meta.concrete_fields if champ.editable and not champ.primary_key]
+
+
+def instantane(instance):
+    """Valeurs des champs suivis d'une instance, normalisées par le champ (dates, montants...)."""
+    valeurs = {}
+    for champ in champs_audites(type(instance)):
+        valeur = champ.value_from_object(instance)
+        try:
+            valeur = champ.to_python(valeur)
+        except Exception:
+            # Valeur invalide : l'écriture échouera ou la base la convertira, on garde la valeur brute
+            pass
+        valeurs[champ.attname] = valeur
+    return valeurs
+
+
+def differences(avant, apres, champs=None):
+    """{champ: [avant, après]} des champs qui diffèrent (limités à `champs` si fourni)."""
+    noms = apres.keys() if champs is None else [nom for nom in apres if nom in champs]
+    return {nom: [avant.get(nom), apres[nom]] for nom in noms if avant.get(nom) != apres[nom]}
+
+
+def enregistrer(modele, objet_id, action, changements):
+    """Ajoute une entrée au journal, une fois la transaction en cours validée."""
+    entree = JournalAudit(modele=modele, objet_id=objet_id, action=action, changements=changements)
+
+    def ajouter():
+        requete = _requete.get()
+        utilisateur = getattr(requete, 'user', None)
+        if utilisateur is not None and utilisateur.is_authenticated:
+            entree.auteur_id = utilisateur.pk
+        tampon = _tampon.get()
+        if tampon is None:
+            entree.save()
+        else:
+            tampon.append(entree)
+    transaction.on_commit(ajouter)
+
+
+class JournalAuditMiddleware:
+    """Écrit en un seul bulk_create les entrées d'audit produites pendant la requête."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tampon = []
+        jeton_tampon = _tampon.set(tampon)
+        jeton_requete = _requete.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _requete.reset(jeton_requete)
+            _tampon.reset(jeton_tampon)
+            if tampon:
+                JournalAudit.objects.bulk_create(tampon, batch_size=500)
+
+
+def historique(modele, objet_id):
+    """Entrées d'un objet, des plus récentes aux plus anciennes (index modele, objet_id, horodatage)."""
+    return (
+        JournalAudit.objects.filter(modele=modele, objet_id=objet_id)
+        .select_related('auteur__membre').order_by('-horodatage', '-id')
+    )
+
+
+def lignes(model, changements):
+    """Changements d'une entrée pour l'affichage : (libellé du champ, avant, après), choix en clair."""
+    champs = {champ.attname: champ for champ in champs_audites(model)}
+    resultat = []
+    for nom, (avant, apres) in changements.items():
+        champ = champs.get(nom)
+        if champ is None:
+            resultat.append((nom, avant, apres))
+            continue
+        choix = dict(champ.flatchoices)
+        resultat.append((champ.verbose_name, choix.get(avant, avant), choix.get(apres, apres)))
+    return resultat
+
+
+# --- Partitionnement mensuel (PostgreSQL, MySQL) ---
+
+def _mois(debut, nombre):
+    """(premier jour, premier jour du mois suivant) pour `nombre` mois à partir de `debut`."""
+    annee, mois = debut.year, debut.month
+    for _ in range(nombre):
+        suivant = (annee + mois // 12, mois % 12 + 1)
+        yield date(annee, mois, 1), date(*suivant, 1)
+        annee, mois = suivant
+
+
+def est_partitionnee(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [TABLE])
+            row = cursor.fetchone()
+            return row is not None and row[0] == 'p'
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.partitions "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL", [TABLE]
+            )
+            return cursor.fetchone()[0] > 0
+    return False
+
+
+def _creer_partition_postgresql(cursor, nom, debut, fin):
+    """Crée la partition d'un mois, en y déplaçant les lignes déjà tombées dans la partition par défaut.
+
+    PostgreSQL refuse de créer une partition dont les bornes couvrent des
+    lignes de la partition par défaut (commande lancée en retard). La
+    partition par défaut est alors détachée et mise de côté, remplacée par
+    une partition par défaut vide, et ses lignes sont réinsérées par la
+    table mère, qui les répartit. Sans DELETE, le déclencheur d'ajout seul
+    n'est pas concerné.
+    """
+    bornes = f"FROM ('{debut} 00:00:00+00') TO ('{fin} 00:00:00+00')"
+    defaut = f"{TABLE}_defaut"
+    cursor.execute("SELECT 1 FROM pg_class WHERE relname = %s", [defaut])
+    if cursor.fetchone() is not None:
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {defaut} WHERE horodatage >= %s AND horodatage < %s)",
+            [f"{debut} 00:00:00+00", f"{fin} 00:00:00+00"]
+        )
+        if cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {defaut}")
+            cursor.execute(f"ALTER TABLE {defaut} RENAME TO {defaut}_ancien")
+            cursor.execute(f"CREATE TABLE {nom} PARTITION OF {TABLE} FOR VALUES {bornes}")
+            cursor.execute(f"CREATE TABLE {defaut} PARTITION OF {TABLE} DEFAULT")
+            cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {defaut}_ancien")
+            cursor.execute(f"DROP TABLE {defaut}_ancien")
+            return
+    cursor.execute(f"CREATE TABLE {nom} PARTITION OF {TABLE} FOR VALUES {bornes}")
+
+
+def creer_partitions(connection, nombre=3):
+    """Crée les partitions du mois courant et des `nombre` mois suivants ; renvoie celles créées."""
+    if not est_partitionnee(connection):
+        return []
+    creees = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for debut, fin in _mois(timezone.now().date(), nombre + 1):
+                nom = f"{TABLE}_p{debut:%Y%m}"
+                cursor.execute("SELECT 1 FROM pg_class WHERE relname = %s", [nom])
+                if cursor.fetchone() is None:
+                    _creer_partition_postgresql(cursor, nom, debut, fin)
+                    creees.append(nom)
+        else:
+            cursor.execute(
+                "SELECT partition_name FROM information_schema.partitions "
+                "WHERE table_schema = DATABASE() AND table_name = %s", [TABLE]
+            )
+            existantes = {row[0] for row in cursor.fetchall()}
+            for debut, fin in _mois(timezone.now().date(), nombre + 1):
+                nom = f"p{debut:%Y%m}"
+                if nom not in existantes:
+                    # REORGANIZE répartit les lignes déjà présentes dans pmax (commande lancée en retard)
+                    cursor.execute(
+                        f"ALTER TABLE {TABLE} REORGANIZE PARTITION pmax INTO ("
+                        f"PARTITION {nom} VALUES LESS THAN ('{fin}'), PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+                    )
+                    creees.append(nom)
+    return creees
@@ -0,0 +1,33 @@
+# backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = 'core:compte:{}'
+USER_CACHE_TIMEOUT = 300
+
+
+def invalider_compte(user_id):
+    """Retire un compte du cache après modification."""
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend dont la résolution de l'utilisateur de session passe par le cache.
+
+    Le compte est chargé une seule fois avec son `Membre` (select_related),
+    puis servi depuis le cache aux requêtes suivantes ; les signaux
+    l'invalident dès que le compte ou le membre lié est modifié.
+    """
+
+    def get_user(self, user_id):
+        key = USER_CACHE_KEY.format(user_id)
+        user = cache.get(key)
+        if user is None:
+            UserModel = get_user_model()
+            try:
+                user = UserModel._default_manager.select_related('membre').get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,82 @@
+# checks.py
+"""Vérifications système propres à l'application (`manage.py check`, au démarrage).
+
+Elles font échouer un déploiement dont la configuration rendrait une
+fonctionnalité silencieusement incorrecte, plutôt que de le découvrir en
+production. Elles portent sur le profil de rendu 'production'
+(RENDER_PROFILE, qui désactive DEBUG) plutôt que sur DEBUG lui-même, que
+le lanceur de tests force à False.
+"""
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.checks import Error, Tags, register
+from .ressources import RESSOURCES, chemin_statique
+
+# Caches propres à un processus : chaque worker aurait ses propres valeurs
+CACHES_PAR_PROCESSUS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def en_production():
+    return getattr(settings, 'RENDER_PROFILE', 'dev') == 'production'
+
+
+@register(Tags.caches)
+def verifier_cache_partage(app_configs, **kwargs):
+    """En production, le cache par défaut doit être partagé entre les workers.
+
+    Il porte les versions des modèles (annuaire des membres, rôles conservés
+    en session, ETag des pages), les comptes de session et les compteurs de
+    limitation de débit : avec un cache par processus, une modification faite
+    sur un worker resterait invisible des autres.
+    """
+    if not en_production():
+        return []
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in CACHES_PAR_PROCESSUS:
+        return []
+    return [Error(
+        f"Le cache par défaut ({backend.rsplit('.', 1)[-1]}) est propre à chaque processus : versions des "
+        "modèles, rôles en session, comptes en cache et limitation de débit divergeraient entre les workers.",
+        hint="Définir CACHE_BACKEND et CACHE_LOCATION (Redis, Memcached ou DatabaseCache). "
+             "Pour un déploiement à un seul processus, ajouter 'core.E001' à SILENCED_SYSTEM_CHECKS.",
+        id='core.E001',
+    )]
+
+
+@register()
+def verifier_css_construit(app_configs, **kwargs):
+    """Sans le CDN Tailwind, le CSS construit par `construire_css` doit exister.
+
+    Il n'est pas versionné et collectstatic ne le produit pas : sans lui les
+    pages s'afficheraient sans aucun style, sans autre erreur qu'un 404.
+    """
+    if settings.TAILWIND_CDN or finders.find(settings.TAILWIND_CSS):
+        return []
+    return [Error(
+        f"Le CSS Tailwind ({settings.TAILWIND_CSS}) n'a pas été construit : les pages seraient sans style.",
+        hint="Lancer `manage.py construire_css` avant `manage.py collectstatic`.",
+        id='core.E002',
+    )]
+
+
+@register()
+def verifier_ressources_vendorisees(app_configs, **kwargs):
+    """En production, les bibliothèques front-end doivent être servies localement.
+
+    Le repli sur le CDN d'origine ne sert qu'à une installation de
+    développement : en production il ferait dépendre chaque page de serveurs
+    tiers, sans empreinte ni précompression.
+    """
+    if not en_production():
+        return []
+    manquantes = [
+        nom for nom, ressource in RESSOURCES.items()
+        if not all(finders.find(chemin_statique(nom, fichier)) for fichier in ressource['fichiers'])
+    ]
+    if not manquantes:
+        return []
+    return [Error(
+        f"Bibliothèque(s) non vendorisée(s), chargée(s) depuis leur CDN : {', '.join(manquantes)}.",
+        hint="Lancer `manage.py vendoriser_ressources` et versionner core/static/vendor.",
+        id='core.E003',
+    )]
@@ -0,0 +1,47 @@
+# compression.py
+"""Compression des réponses HTML, JSON et CSV.
+
+Pour le JSON et le CSV, brotli est préféré quand le module `brotli` est
+installé et que le navigateur l'accepte, sinon gzip (GZipMiddleware de
+Django). Le HTML passe toujours par gzip : il contient le jeton CSRF, et
+seul GZipMiddleware ajoute le remplissage aléatoire qui protège des
+attaques de type BREACH. Les autres
+types sont laissés tels quels : les fichiers statiques ont déjà leurs
+variantes précompressées (core.staticfiles) et le flux des compteurs en
+direct (text/event-stream) ne doit pas être mis en mémoire tampon.
+"""
+import re
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from .staticfiles import brotli, encodages_acceptes
+
+TYPES_COMPRESSES = {'text/html', 'application/json', 'text/csv'}
+# Types sans jeton CSRF, compressés en brotli sans remplissage aléatoire
+TYPES_BROTLI = {'application/json', 'text/csv'}
+TAILLE_MIN = 200
+# Qualité brotli adaptée à la compression à la volée (11 est réservé aux fichiers précompressés)
+QUALITE_BROTLI = 5
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def process_response(self, request, response):
+        type_contenu = response.get('Content-Type', '').split(';')[0].strip()
+        if type_contenu not in TYPES_COMPRESSES:
+            return response
+        acceptes = encodages_acceptes(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is None or response.streaming or 'br' not in acceptes or type_contenu not in TYPES_BROTLI:
+            return super().process_response(request, response)
+
+        if len(response.content) < TAILLE_MIN or response.has_header('Content-Encoding'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compresse = brotli.compress(response.content, quality=QUALITE_BROTLI)
+        if len(compresse) >= len(response.content):
+            return response
+        response.content = compresse
+        response['Content-Length'] = str(len(compresse))
+        # Le contenu transmis n'est plus identique octet pour octet : ETag faible
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+        response['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,52 @@
+# conditionnel.py
+"""GET conditionnels pour les pages lourdes (listes, calendrier).
+
+L'ETag d'une page est calculé avant la vue, à partir des versions des
+modèles qu'elle affiche (core.versions, lues dans le cache) : quand rien
+n'a changé depuis la dernière visite, le navigateur reçoit un 304 sans
+qu'aucune requête ne parte vers la base. `Cache-Control: private, no-cache`
+oblige le navigateur à revalider à chaque affichage et écarte les caches
+partagés.
+
+L'ETag couvre aussi l'adresse complète (filtres, page), l'utilisateur et
+son jeton CSRF (les formulaires de la page restent valides). Une page avec
+des messages en attente est toujours rendue.
+"""
+import hashlib
+from functools import wraps
+from django.conf import settings
+from django.contrib import messages
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from .versions import get_version
+
+
+def etag_versions(request, modeles):
+    if len(messages.get_messages(request)):
+        return None
+    parties = [
+        request.get_full_path(),
+        str(request.user.pk),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+    ]
+    parties += [f"{modele}:{get_version(modele)}" for modele in modeles]
+    return hashlib.md5('|'.join(parties).encode()).hexdigest()
+
+
+def version_page(*modeles):
+    """Décorateur : 304 tant que les modèles `modeles` n'ont pas changé.
+
+    À placer sous @login_required / @role_required, pour que l'accès soit
+    vérifié avant de répondre 304.
+    """
+    def decorator(view_func):
+        vue = condition(etag_func=lambda request, *args, **kwargs: etag_versions(request, modeles))(view_func)
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            response = vue(request, *args, **kwargs)
+            if response.has_header('ETag'):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,105 @@
+# directory.py
+"""Annuaire compact des membres, partagé entre les requêtes d'un worker.
+
+Plusieurs pages n'ont besoin que de l'id, du nom, du prénom, du sexe et du
+statut actif de chaque membre (listes déroulantes du formulaire de couple,
+filtre des finances...). Plutôt que de charger des instances `Membre`
+complètes (adresse comprise) à chaque requête, on garde en mémoire des
+enregistrements à `__slots__`, triés par nom, reconstruits uniquement quand
+la version des membres change.
+"""
+import sys
+import threading
+from bisect import bisect_left
+from .models import Membre
+from .versions import get_version
+
+
+class EntreeAnnuaire:
+    __slots__ = ('id', 'nom', 'prenom', 'sexe', 'is_active', 'cle')
+
+    def __init__(self, id, nom, prenom, sexe, is_active):
+        self.id = id
+        self.nom = nom
+        self.prenom = prenom
+        self.sexe = sexe
+        self.is_active = is_active
+        # Clé de tri et de recherche par préfixe
+        self.cle = f"{nom} {prenom}".casefold()
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def nom_complet(self):
+        return f"{self.prenom} {self.nom}"
+
+    def __str__(self):
+        return self.nom_complet
+
+    def __repr__(self):
+        return f"<EntreeAnnuaire {self.id}: {self.nom_complet}>"
+
+
+class AnnuaireMembres:
+    """Instantané immuable de l'annuaire, trié par (nom, prénom)."""
+
+    def __init__(self, entrees, version):
+        self.entrees = tuple(sorted(entrees, key=lambda e: (e.cle, e.id)))
+        self.cles = [entree.cle for entree in self.entrees]
+        self.version = version
+
+    @classmethod
+    def depuis_base(cls, version):
+        rows = Membre.tous.order_by().values_list('id', 'nom', 'prenom', 'sexe', 'is_active')
+        return cls((EntreeAnnuaire(*row) for row in rows.iterator(chunk_size=2000)), version)
+
+    def __len__(self):
+        return len(self.entrees)
+
+    def __iter__(self):
+        return iter(self.entrees)
+
+    def filtrer(self, sexe=None, actifs_seulement=False):
+        """Membres filtrés par sexe et/ou statut actif, dans l'ordre alphabétique."""
+        return [
+            entree for entree in self.entrees
+            if (sexe is None or entree.sexe == sexe) and (not actifs_seulement or entree.is_active)
+        ]
+
+    def prefixe(self, texte, limite=20):
+        """Membres dont « nom prénom » commence par `texte` (recherche dichotomique)."""
+        texte = texte.casefold()
+        debut = bisect_left(self.cles, texte)
+        resultats = []
+        for entree in self.entrees[debut:]:
+            if not entree.cle.startswith(texte) or len(resultats) >= limite:
+                break
+            resultats.append(entree)
+        return resultats
+
+    def taille_memoire(self):
+        """Empreinte mémoire approximative de l'instantané, en octets."""
+        taille = sys.getsizeof(self.entrees) + sys.getsizeof(self.cles)
+        for entree in self.entrees:
+            taille += sys.getsizeof(entree)
+            taille += sum(sys.getsizeof(getattr(entree, slot)) for slot in ('nom', 'prenom', 'cle'))
+        return taille
+
+
+_annuaire = None
+_annuaire_lock = threading.Lock()
+
+
+def get_annuaire():
+    """Annuaire à jour ; reconstruit paresseusement quand la version des membres a changé."""
+    global _annuaire
+    version = get_version('membre')
+    annuaire = _annuaire
+    if annuaire is None or annuaire.version != version:
+        with _annuaire_lock:
+            if _annuaire is None or _annuaire.version != version:
+                _annuaire = AnnuaireMembres.depuis_base(version)
+            annuaire = _annuaire
+    return annuaire
@@ -0,0 +1,86 @@
+# live.py
+"""Diffusion en direct des compteurs du tableau de bord (server-sent events).
+
+Chaque écriture sur Membre, Couple ou TransactionFinanciere publie un petit
+événement de variation (delta) ; les tableaux de bord ouverts s'y abonnent
+au lieu de recalculer toutes leurs requêtes à chaque rafraîchissement.
+
+Le courtier par défaut est en mémoire, donc propre à un processus. Pour un
+déploiement multi-workers, fournir une classe compatible avec `BaseBroker`
+(Redis pub/sub, PostgreSQL LISTEN/NOTIFY, ...) via le réglage
+`LIVE_COUNTERS_BROKER`.
+
+Une connexion SSE reste ouverte tant que la page l'est : elle n'est servie
+que sous ASGI (church_project.asgi). Sous WSGI, où elle occuperait un
+worker en permanence, la vue répond 204 et la page interroge les compteurs
+JSON à intervalle régulier (GET conditionnel sur les versions).
+"""
+import asyncio
+import threading
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseBroker:
+    """Interface d'un courtier de publication/abonnement."""
+
+    def publish(self, event):
+        raise NotImplementedError
+
+    def subscribe(self):
+        """Renvoie une file asyncio recevant les événements publiés."""
+        raise NotImplementedError
+
+    def unsubscribe(self, queue):
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    """Courtier en mémoire : une publication = un envoi par abonné, sans requête SQL."""
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            # Les signaux sont émis depuis un thread synchrone : on passe par la boucle de l'abonné
+            loop.call_soon_threadsafe(self._deliver, queue, event)
+
+    @staticmethod
+    def _deliver(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client trop lent : on lui demande de recharger les compteurs complets
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({'type': 'refresh'})
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Courtier configuré (instancié une seule fois par processus)."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'LIVE_COUNTERS_BROKER', 'core.live.InProcessBroker')
+                _broker = import_string(path)()
+    return _broker
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from core.archives import archiver_lot, membres_archivables
+
+
+class Command(BaseCommand):
+    help = ("Déplace par lots les membres inactifs depuis longtemps, avec leurs transactions "
+            "et dons matériels, vers les tables d'archive.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jours', type=int, default=730, help="Inactivité minimale en jours (défaut : 730).")
+        parser.add_argument('--taille-lot', type=int, default=200, help="Membres archivés par lot (défaut : 200).")
+        parser.add_argument('--simulation', action='store_true', help="Affiche le nombre de membres concernés sans rien modifier.")
+
+    def handle(self, *args, **options):
+        candidats = membres_archivables(options['jours'])
+        if options['simulation']:
+            self.stdout.write(f"{candidats.count()} membre(s) seraient archivés.")
+            return
+
+        total = 0
+        while True:
+            ids = list(candidats.order_by('pk').values_list('pk', flat=True)[:options['taille_lot']])
+            if not ids:
+                break
+            archives = archiver_lot(ids)
+            if not archives:
+                break
+            total += archives
+
+        self.stdout.write(self.style.SUCCESS(f"{total} membre(s) archivé(s)."))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.models import ProgrammeMariage
+from core.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = ("Fait avancer le statut des programmes de mariage échus : "
+            "« en cours » une fois commencés, « terminé » une fois finis. À planifier (cron).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=1000, help="Programmes mis à jour par lot (défaut : 1000).")
+
+    def _avancer(self, programmes, statut, taille_lot, maintenant):
+        """Passe `programmes` au `statut` donné par lots de UPDATE ... WHERE id IN (...)."""
+        total = 0
+        while True:
+            ids = list(programmes.order_by().values_list('pk', flat=True)[:taille_lot])
+            if not ids:
+                return total
+            # update() ne déclenche pas auto_now : updated_at est posé explicitement
+            # pour que le flux de synchronisation voie ces changements
+            total += programmes.filter(pk__in=ids).update(statut=statut, updated_at=maintenant)
+            bump_version('programme_mariage')
+
+    def handle(self, *args, **options):
+        maintenant = timezone.now()
+        taille_lot = options['taille_lot']
+
+        # Les deux requêtes ne portent que sur les statuts actifs (index partiel)
+        termines = self._avancer(
+            ProgrammeMariage.objects.filter(statut__in=ProgrammeMariage.STATUTS_ACTIFS, date_fin__lte=maintenant),
+            'termine', taille_lot, maintenant,
+        )
+        en_cours = self._avancer(
+            ProgrammeMariage.objects.filter(statut='planifie', date_debut__lte=maintenant, date_fin__gt=maintenant),
+            'en_cours', taille_lot, maintenant,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{termines} programme(s) terminé(s), {en_cours} programme(s) passé(s) en cours."
+        ))
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from core.models import Groupe, Membre, MembreGroupe, Presence, ProgrammeEglise, StatistiquePresence
+
+
+def _taux(presences, attendues):
+    if not attendues:
+        return Decimal('0')
+    return (Decimal(presences) * 100 / attendues).quantize(Decimal('0.01'))
+
+
+class Command(BaseCommand):
+    help = "Précalcule les taux de présence par membre, groupe et catégorie (à lancer chaque nuit)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jours', type=int, default=90, help="Période analysée, en jours (défaut : 90).")
+
+    def handle(self, *args, **options):
+        fin = timezone.localdate()
+        debut = fin - timedelta(days=options['jours'])
+        presences = Presence.objects.filter(date_occurrence__range=(debut, fin))
+
+        # Occurrences tenues = couples (programme, date) ayant au moins une présence
+        occurrences = presences.values('programme_id', 'date_occurrence').distinct().count()
+        occurrences_par_categorie = {}
+        for categorie, _, _ in presences.values_list(
+            'programme__categorie', 'programme_id', 'date_occurrence'
+        ).distinct():
+            occurrences_par_categorie[categorie] = occurrences_par_categorie.get(categorie, 0) + 1
+
+        par_membre = dict(
+            presences.values('membre_id').annotate(total=Count('id')).values_list('membre_id', 'total')
+        )
+        par_categorie = dict(
+            presences.values('programme__categorie').annotate(total=Count('id'))
+            .values_list('programme__categorie', 'total')
+        )
+        # Groupes comptés sur leurs membres actifs, comme le dénominateur des catégories
+        adhesions = MembreGroupe.objects.filter(membre__is_active=True)
+        par_groupe = dict(
+            adhesions.filter(
+                membre__presences__date_occurrence__range=(debut, fin)
+            ).values('groupe_id').annotate(total=Count('membre__presences')).values_list('groupe_id', 'total')
+        )
+        taille_groupes = dict(
+            adhesions.values('groupe_id').annotate(total=Count('id')).values_list('groupe_id', 'total')
+        )
+
+        # Tous les membres et groupes actifs ont une ligne, à 0 % s'ils n'ont aucune présence
+        membres = list(Membre.objects.filter(is_active=True).values_list('id', flat=True))
+        groupes = Groupe.objects.values_list('id', flat=True)
+        membres_actifs = len(membres)
+
+        calcule_le = timezone.now()
+        commun = {'periode_debut': debut, 'periode_fin': fin, 'calcule_le': calcule_le}
+        statistiques = [
+            StatistiquePresence(
+                portee='membre', cle=str(membre_id), presences=par_membre.get(membre_id, 0),
+                occurrences=occurrences, taux=_taux(par_membre.get(membre_id, 0), occurrences), **commun
+            )
+            for membre_id in membres
+        ]
+        statistiques += [
+            StatistiquePresence(
+                portee='groupe', cle=str(groupe_id), presences=par_groupe.get(groupe_id, 0),
+                occurrences=occurrences,
+                taux=_taux(par_groupe.get(groupe_id, 0), occurrences * taille_groupes.get(groupe_id, 0)), **commun
+            )
+            for groupe_id in groupes
+        ]
+        statistiques += [
+            StatistiquePresence(
+                portee='categorie', cle=categorie, presences=par_categorie.get(categorie, 0),
+                occurrences=occurrences_par_categorie.get(categorie, 0),
+                taux=_taux(
+                    par_categorie.get(categorie, 0),
+                    occurrences_par_categorie.get(categorie, 0) * membres_actifs
+                ),
+                **commun
+            )
+            for categorie, _ in ProgrammeEglise.CATEGORIE_CHOICES
+        ]
+
+        with transaction.atomic():
+            StatistiquePresence.objects.all().delete()
+            StatistiquePresence.objects.bulk_create(statistiques, batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(statistiques)} statistiques de présence calculées ({debut} → {fin})."
+        ))
+
@@ -0,0 +1,41 @@
+import subprocess
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SOURCES = Path(__file__).resolve().parents[2] / 'static_src'
+SORTIE = Path(__file__).resolve().parents[2] / 'static'
+
+
+class Command(BaseCommand):
+    help = "Construit le CSS Tailwind purgé et minifié à partir des classes utilisées dans les templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help="Reconstruit à chaque modification des templates.")
+
+    def handle(self, *args, **options):
+        sortie = SORTIE / settings.TAILWIND_CSS
+        sortie.parent.mkdir(parents=True, exist_ok=True)
+        commande = [
+            *settings.TAILWIND_CLI,
+            '--config', str(SOURCES / 'tailwind.config.js'),
+            '--input', str(SOURCES / 'tailwind.css'),
+            '--output', str(sortie),
+            '--minify',
+        ]
+        if options['watch']:
+            commande.append('--watch')
+
+        try:
+            subprocess.run(commande, check=True)
+        except FileNotFoundError:
+            raise CommandError(
+                f"CLI Tailwind introuvable ({settings.TAILWIND_CLI[0]}). Installez Node.js ou indiquez "
+                "l'exécutable autonome de Tailwind dans la variable d'environnement TAILWIND_CLI."
+            )
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(f"La construction du CSS a échoué (code {exc.returncode}).")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{sortie} : {sortie.stat().st_size // 1024} Ko. Lancez ensuite collectstatic."
+        ))
@@ -0,0 +1,26 @@
+import sqlite3
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Copie la base principale SQLite vers la réplique (profil de test DB_REPLICA_PROFILE=sqlite)."
+
+    def handle(self, *args, **options):
+        replica = getattr(settings, 'REPLICA_DATABASE', 'replica')
+        if replica not in settings.DATABASES:
+            raise CommandError("Aucune réplique configurée.")
+        bases = (settings.DATABASES['default'], settings.DATABASES[replica])
+        if any(base['ENGINE'] != 'django.db.backends.sqlite3' for base in bases):
+            raise CommandError("La copie ne concerne que le profil SQLite ; une vraie réplique se synchronise seule.")
+
+        # API de sauvegarde SQLite : copie cohérente même si le primaire est en cours d'utilisation
+        source = sqlite3.connect(bases[0]['NAME'])
+        cible = sqlite3.connect(bases[1]['NAME'])
+        try:
+            source.backup(cible)
+        finally:
+            cible.close()
+            source.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Réplique « {replica} » mise à jour depuis le primaire."))
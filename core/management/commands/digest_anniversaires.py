@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.rappels import anniversaires_a_venir
+
+
+class Command(BaseCommand):
+    help = "Produit le récapitulatif quotidien des anniversaires de naissance et de mariage. À planifier (cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jours', type=int, default=1, help="Nombre de jours couverts, aujourd'hui compris (défaut : 1).")
+
+    def handle(self, *args, **options):
+        rappels = anniversaires_a_venir(jours=options['jours'])
+        aujourd_hui = timezone.localdate()
+        self.stdout.write(f"Anniversaires à partir du {aujourd_hui:%d/%m/%Y} ({options['jours']} jour(s)) :")
+        if not rappels:
+            self.stdout.write("  Aucun anniversaire.")
+            return
+        for rappel in rappels:
+            quoi = f"{rappel.annees} an(s) de mariage" if rappel.type == 'mariage' else f"{rappel.annees} an(s)"
+            self.stdout.write(f"  {rappel.date:%d/%m} - {rappel.libelle} ({quoi})")
+        self.stdout.write(self.style.SUCCESS(f"{len(rappels)} anniversaire(s)."))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from core.notifications import distribuer_lot, liberer_envois_abandonnes, reglage, reserver_lot
+
+
+class Command(BaseCommand):
+    help = ("Envoie les notifications en attente par lots, avec un nombre de threads borné "
+            "et un débit maximal par canal. À planifier (cron) ou à lancer en tâche de fond.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=None, help="Envois réservés par lot (défaut : NOTIFICATIONS['taille_lot']).")
+        parser.add_argument('--concurrence', type=int, default=None, help="Threads d'envoi (défaut : NOTIFICATIONS['concurrence']).")
+        parser.add_argument('--max-lots', type=int, default=None, help="Arrête après ce nombre de lots (défaut : jusqu'à épuisement de la file).")
+
+    def handle(self, *args, **options):
+        taille_lot = options['taille_lot'] or reglage('taille_lot')
+        liberes = liberer_envois_abandonnes()
+        if liberes:
+            self.stdout.write(f"{liberes} envoi(s) abandonné(s) remis en attente.")
+
+        totaux = {'envoyes': 0, 'echecs': 0, 'a_reessayer': 0}
+        cadences = {}
+        lots = 0
+        while options['max_lots'] is None or lots < options['max_lots']:
+            envois = reserver_lot(taille_lot)
+            if not envois:
+                break
+            resultat = distribuer_lot(envois, options['concurrence'], cadences)
+            for cle, valeur in resultat.items():
+                totaux[cle] += valeur
+            lots += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{totaux['envoyes']} message(s) envoyé(s), {totaux['echecs']} échec(s) définitif(s), "
+            f"{totaux['a_reessayer']} à réessayer ({lots} lot(s))."
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from core.audit import creer_partitions, est_partitionnee
+
+
+class Command(BaseCommand):
+    help = "Crée les partitions mensuelles du journal d'audit pour les mois à venir (à lancer chaque mois)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mois', type=int, default=3, help="Nombre de mois à préparer après le mois courant")
+
+    def handle(self, *args, **options):
+        if not est_partitionnee(connection):
+            self.stdout.write("Journal d'audit non partitionné (base SQLite) : rien à faire.")
+            return
+        creees = creer_partitions(connection, options['mois'])
+        for nom in creees:
+            self.stdout.write(f"Partition {nom} créée.")
+        self.stdout.write(self.style.SUCCESS(f"{len(creees)} partition(s) créée(s)."))
@@ -0,0 +1,111 @@
+import gzip
+import re
+from pathlib import Path
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.template import Context, TemplateSyntaxError, engines
+from django.template.library import SimpleNode
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.templatetags.static import StaticNode
+from core.ressources import RESSOURCES, chemin_statique, est_vendorisee
+from core.staticfiles import brotli
+
+DOSSIER_TEMPLATES = Path(__file__).resolve().parents[2] / 'templates'
+URL_EXTERNE = re.compile(r'''(?:src|href)=["'](https?://[^"']+)["']''')
+
+
+class Command(BaseCommand):
+    help = "Poids de chaque page : gabarit et fichiers statiques chargés, bruts et compressés."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--template', help="Limite le rapport aux templates contenant ce texte.")
+
+    def handle(self, *args, **options):
+        moteur = engines['django'].engine
+        lignes = []
+        for chemin in sorted(DOSSIER_TEMPLATES.rglob('*.html')):
+            nom = chemin.relative_to(DOSSIER_TEMPLATES).as_posix()
+            if options['template'] and options['template'] not in nom:
+                continue
+            gabarit, statiques, externes = 0, set(), set()
+            try:
+                chaine = self.chaine(moteur, nom)
+            except TemplateSyntaxError as exc:
+                self.stderr.write(f"{nom} : template invalide ({exc}).")
+                continue
+            for template in chaine:
+                gabarit += len(template.source.encode())
+                externes.update(URL_EXTERNE.findall(template.source))
+                for node in template.nodelist.get_nodes_by_type(StaticNode):
+                    statiques.add(node.path.resolve(Context()))
+                for node in template.nodelist.get_nodes_by_type(SimpleNode):
+                    self.ressources_du_tag(node, statiques, externes)
+            brut, gz, br, absents = self.poids(statiques)
+            lignes.append((nom, gabarit, len(statiques), brut, gz, br, len(externes), absents))
+
+        self.stdout.write(
+            f"{'Template':45} {'Gabarit':>9} {'Fichiers':>8} {'Statiques':>10} {'gzip':>9} "
+            f"{'brotli':>9} {'Externes':>8}"
+        )
+        for nom, gabarit, nombre, brut, gz, br, externes, absents in sorted(lignes, key=lambda l: -l[3] - l[1]):
+            self.stdout.write(
+                f"{nom:45} {self.ko(gabarit):>9} {nombre:>8} {self.ko(brut):>10} {self.ko(gz):>9} "
+                f"{self.ko(br) if brotli else '-':>9} {externes:>8}" + (f"  (absents : {absents})" if absents else '')
+            )
+        self.stdout.write(
+            "Gabarit : source des templates (page avant rendu). Externes : requêtes vers un autre domaine "
+            "(taille inconnue, une résolution DNS et une connexion TLS chacune)."
+        )
+
+    def chaine(self, moteur, nom, vus=None):
+        """Le template, ses parents ({% extends %}) et ses inclusions ({% include %}) littéraux."""
+        vus = vus if vus is not None else set()
+        if nom in vus:
+            return []
+        vus.add(nom)
+        template = moteur.get_template(nom)
+        templates = [template]
+        for node in template.nodelist.get_nodes_by_type(ExtendsNode):
+            if isinstance(node.parent_name.var, str):
+                templates += self.chaine(moteur, node.parent_name.var, vus)
+        for node in template.nodelist.get_nodes_by_type(IncludeNode):
+            if isinstance(node.template.var, str):
+                templates += self.chaine(moteur, node.template.var, vus)
+        return templates
+
+    def ressources_du_tag(self, node, statiques, externes):
+        nom_tag = node.func.__name__
+        if nom_tag == 'tailwind_css':
+            if settings.TAILWIND_CDN:
+                externes.add('tailwind')
+            else:
+                statiques.add(settings.TAILWIND_CSS)
+        elif nom_tag in ('ressource_css', 'ressource_js'):
+            nom = node.args[0].resolve(Context())
+            if est_vendorisee(nom):
+                statiques.update(chemin_statique(nom, fichier) for fichier in self.fichiers_charges(nom))
+            else:
+                externes.add(nom)
+
+    def fichiers_charges(self, nom):
+        """Fichiers téléchargés par le navigateur : le principal et, pour une feuille de style, les woff2."""
+        fichiers = RESSOURCES[nom]['fichiers']
+        return [fichier for fichier in fichiers if fichier == RESSOURCES[nom]['principal'] or fichier.endswith('.woff2')]
+
+    def poids(self, statiques):
+        brut = gz = br = absents = 0
+        for chemin in statiques:
+            fichier = finders.find(chemin)
+            if not fichier:
+                absents += 1
+                continue
+            contenu = Path(fichier).read_bytes()
+            brut += len(contenu)
+            gz += min(len(contenu), len(gzip.compress(contenu, compresslevel=9)))
+            if brotli:
+                br += min(len(contenu), len(brotli.compress(contenu)))
+        return brut, gz, br, absents
+
+    def ko(self, octets):
+        return f"{octets / 1024:.1f} Ko"
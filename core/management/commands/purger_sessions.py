@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Supprime les sessions expirées par lots, sans verrouiller longtemps la table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-lot', type=int, default=5000, help="Sessions supprimées par lot (défaut : 5000).")
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE.endswith('signed_cookies'):
+            self.stdout.write("Sessions en cookies signés : rien à purger côté serveur.")
+            return
+
+        maintenant = timezone.now()
+        taille_lot = options['taille_lot']
+        total = 0
+        while True:
+            cles = list(
+                Session.objects.filter(expire_date__lt=maintenant)
+                .values_list('session_key', flat=True)[:taille_lot]
+            )
+            if not cles:
+                break
+            supprimees, _ = Session.objects.filter(session_key__in=cles).delete()
+            total += supprimees
+
+        self.stdout.write(self.style.SUCCESS(f"{total} session(s) expirée(s) supprimée(s)."))
@@ -0,0 +1,35 @@
+import urllib.request
+from django.core.management.base import BaseCommand, CommandError
+from core.ressources import DOSSIER_VENDOR, RESSOURCES, url_cdn
+
+
+class Command(BaseCommand):
+    help = "Télécharge les bibliothèques front-end épinglées dans core/static/vendor."
+
+    def add_arguments(self, parser):
+        parser.add_argument('noms', nargs='*', help="Bibliothèques à récupérer (toutes par défaut).")
+        parser.add_argument('--force', action='store_true', help="Retélécharge les fichiers déjà présents.")
+
+    def handle(self, *args, **options):
+        noms = options['noms'] or list(RESSOURCES)
+        inconnus = set(noms) - set(RESSOURCES)
+        if inconnus:
+            raise CommandError(f"Bibliothèque(s) inconnue(s) : {', '.join(sorted(inconnus))}.")
+
+        for nom in noms:
+            ressource = RESSOURCES[nom]
+            dossier = DOSSIER_VENDOR / f"{nom}-{ressource['version']}"
+            for fichier in ressource['fichiers']:
+                cible = dossier / fichier
+                if cible.exists() and not options['force']:
+                    continue
+                cible.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    with urllib.request.urlopen(url_cdn(nom, fichier), timeout=30) as reponse:
+                        contenu = reponse.read()
+                except OSError as exc:
+                    raise CommandError(f"{nom} : impossible de télécharger {fichier} ({exc}).")
+                cible.write_bytes(contenu)
+                self.stdout.write(f"{nom} {ressource['version']} : {fichier} ({len(contenu) // 1024} Ko)")
+
+        self.stdout.write(self.style.SUCCESS("Bibliothèques à jour dans core/static/vendor."))
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_programmeeglise_recurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Suppression',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modele', models.CharField(max_length=50)),
+                ('objet_id', models.BigIntegerField()),
+                ('supprime_le', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Suppression',
+                'verbose_name_plural': 'Suppressions',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='couple',
+            index=models.Index(fields=['updated_at', 'id'], name='core_couple_updated_569cac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donmateriel',
+            index=models.Index(fields=['updated_at', 'id'], name='core_donmat_updated_e8fef7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupe',
+            index=models.Index(fields=['updated_at', 'id'], name='core_groupe_updated_1914db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membre',
+            index=models.Index(fields=['updated_at', 'id'], name='core_membre_updated_1c3046_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membregroupe',
+            index=models.Index(fields=['updated_at', 'id'], name='core_membre_updated_05798d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membrerole',
+            index=models.Index(fields=['updated_at', 'id'], name='core_membre_updated_5bba13_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='programmeeglise',
+            index=models.Index(fields=['updated_at', 'id'], name='core_progra_updated_436098_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='programmemariage',
+            index=models.Index(fields=['updated_at', 'id'], name='core_progra_updated_e2d9a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(fields=['updated_at', 'id'], name='core_role_updated_b409ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transactionfinanciere',
+            index=models.Index(fields=['updated_at', 'id'], name='core_transa_updated_812ef2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='suppression',
+            index=models.Index(fields=['modele', 'supprime_le', 'id'], name='core_suppre_modele_a1ba7e_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_sync_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatistiquePresence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('portee', models.CharField(choices=[('membre', 'Membre'), ('groupe', 'Groupe'), ('categorie', 'Catégorie')], max_length=10)),
+                ('cle', models.CharField(max_length=50)),
+                ('presences', models.PositiveIntegerField(default=0)),
+                ('occurrences', models.PositiveIntegerField(default=0)),
+                ('taux', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=5)),
+                ('periode_debut', models.DateField()),
+                ('periode_fin', models.DateField()),
+                ('calcule_le', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Statistique de Présence',
+                'verbose_name_plural': 'Statistiques de Présence',
+                'unique_together': {('portee', 'cle')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Presence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_occurrence', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('membre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='presences', to='core.membre')),
+                ('programme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='presences', to='core.programmeeglise')),
+            ],
+            options={
+                'verbose_name': 'Présence',
+                'verbose_name_plural': 'Présences',
+                'indexes': [models.Index(fields=['programme', 'date_occurrence'], name='core_presen_program_1bafd9_idx'), models.Index(fields=['updated_at', 'id'], name='core_presen_updated_f0a8bc_idx')],
+                'unique_together': {('membre', 'programme', 'date_occurrence')},
+            },
+        ),
+    ]
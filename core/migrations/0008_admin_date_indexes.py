@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_presence'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='donmateriel',
+            name='date_don',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='membre',
+            name='date_adhesion',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='presence',
+            name='date_occurrence',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='programmeeglise',
+            name='date_debut',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='programmemariage',
+            name='date_debut',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='transactionfinanciere',
+            name='date_transaction',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:08
+
+from django.db import migrations, models
+
+
+def marquer_demandes_traitees(apps, schema_editor):
+    # Les demandes déjà traitées avant la file de modération étaient des approbations
+    DemandeAcces = apps.get_model('core', 'DemandeAcces')
+    DemandeAcces.objects.filter(est_traitee=True).update(statut='approuvee')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_admin_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='demandeacces',
+            options={'verbose_name': "Demande d'Accès", 'verbose_name_plural': "Demandes d'Accès"},
+        ),
+        migrations.AddField(
+            model_name='demandeacces',
+            name='statut',
+            field=models.CharField(choices=[('en_attente', 'En attente'), ('approuvee', 'Approuvée'), ('rejetee', 'Rejetée')], default='en_attente', max_length=15),
+        ),
+        migrations.AddField(
+            model_name='demandeacces',
+            name='traitee_le',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(marquer_demandes_traitees, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='demandeacces',
+            index=models.Index(fields=['est_traitee', 'date_demande', 'id'], name='core_demand_est_tra_cefb87_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_demandeacces_moderation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membre',
+            index=models.Index(fields=['sexe', 'is_active', 'nom', 'prenom'], name='core_membre_sexe_fa393d_idx'),
+        ),
+    ]
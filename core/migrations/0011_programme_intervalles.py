@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:11
+
+from datetime import datetime, time, timedelta
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def calculer_intervalles(apps, schema_editor):
+    # Même calcul que ProgrammeEglise.calculer_intervalle (indisponible sur le modèle historique)
+    ProgrammeEglise = apps.get_model('core', 'ProgrammeEglise')
+    programmes = list(ProgrammeEglise.objects.exclude(date_debut=None))
+    for programme in programmes:
+        debut = timezone.make_aware(datetime.combine(programme.date_debut, programme.heure_debut or time.min))
+        jour_fin = programme.date_fin or programme.date_debut
+        if programme.heure_fin:
+            fin = datetime.combine(jour_fin, programme.heure_fin)
+        else:
+            fin = datetime.combine(jour_fin + timedelta(days=1), time.min)
+        programme.debut_complet = debut
+        programme.fin_complet = max(timezone.make_aware(fin), debut)
+    ProgrammeEglise.objects.bulk_update(programmes, ['debut_complet', 'fin_complet'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_membre_conjoint_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='programmeeglise',
+            name='debut_complet',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='programmeeglise',
+            name='fin_complet',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='programmeeglise',
+            index=models.Index(fields=['lieu', 'debut_complet', 'fin_complet'], name='core_progra_lieu_04296f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='programmemariage',
+            index=models.Index(fields=['lieu', 'date_debut', 'date_fin'], name='core_progra_lieu_5cbaa3_idx'),
+        ),
+        migrations.RunPython(calculer_intervalles, migrations.RunPython.noop),
+    ]
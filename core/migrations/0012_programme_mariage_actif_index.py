@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_programme_intervalles'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='programmemariage',
+            index=models.Index(condition=models.Q(('statut__in', ['planifie', 'en_cours'])), fields=['couple'], name='prog_mariage_actif_couple_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='programmemariage',
+            index=models.Index(condition=models.Q(('statut__in', ['planifie', 'en_cours'])), fields=['date_fin', 'date_debut'], name='prog_mariage_actif_dates_idx'),
+        ),
+    ]
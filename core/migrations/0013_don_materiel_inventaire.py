@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:15
+
+from django.db import migrations, models
+
+
+# Index texte intégral sur la description, propre à chaque moteur
+# (SQLite n'en a pas : la recherche y reste un LIKE)
+INDEX_TEXTE_INTEGRAL = {
+    'postgresql': (
+        "CREATE INDEX core_donmateriel_description_fts ON core_donmateriel "
+        "USING GIN (to_tsvector('french'::regconfig, COALESCE(description_objet, '')))",
+        "DROP INDEX IF EXISTS core_donmateriel_description_fts",
+    ),
+    'mysql': (
+        "CREATE FULLTEXT INDEX core_donmateriel_description_fts ON core_donmateriel (description_objet)",
+        "DROP INDEX core_donmateriel_description_fts ON core_donmateriel",
+    ),
+}
+
+
+def creer_index_texte_integral(apps, schema_editor):
+    sql = INDEX_TEXTE_INTEGRAL.get(schema_editor.connection.vendor)
+    if sql:
+        schema_editor.execute(sql[0])
+
+
+def supprimer_index_texte_integral(apps, schema_editor):
+    sql = INDEX_TEXTE_INTEGRAL.get(schema_editor.connection.vendor)
+    if sql:
+        schema_editor.execute(sql[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_programme_mariage_actif_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donmateriel',
+            index=models.Index(fields=['statut_don', 'date_don', 'valeur_estimee'], name='core_donmat_statut__6cd1cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donmateriel',
+            index=models.Index(fields=['membre', 'valeur_estimee'], name='core_donmat_membre__4e9664_idx'),
+        ),
+        migrations.RunPython(creer_index_texte_integral, supprimer_index_texte_integral),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:18
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+
+def calculer_jours_anniversaire(apps, schema_editor):
+    # Même valeur que models.jour_annuel (MMJJ), calculée en base par deux UPDATE
+    Membre = apps.get_model('core', 'Membre')
+    Couple = apps.get_model('core', 'Couple')
+    Membre.objects.update(
+        jour_anniversaire=ExtractMonth('date_naissance') * 100 + ExtractDay('date_naissance')
+    )
+    Couple.objects.exclude(date_mariage=None).update(
+        jour_anniversaire_mariage=ExtractMonth('date_mariage') * 100 + ExtractDay('date_mariage')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_don_materiel_inventaire'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='couple',
+            name='jour_anniversaire_mariage',
+            field=models.PositiveSmallIntegerField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='membre',
+            name='jour_anniversaire',
+            field=models.PositiveSmallIntegerField(db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(calculer_jours_anniversaire, migrations.RunPython.noop),
+    ]
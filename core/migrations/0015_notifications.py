@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_jours_anniversaire'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('canal', models.CharField(choices=[('email', 'Email'), ('sms', 'SMS')], default='email', max_length=10)),
+                ('sujet', models.CharField(blank=True, max_length=200)),
+                ('message', models.TextField()),
+                ('description_cible', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('auteur', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notification',
+                'verbose_name_plural': 'Notifications',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EnvoiNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destinataire', models.CharField(max_length=254)),
+                ('statut', models.CharField(choices=[('en_attente', 'En attente'), ('en_cours', 'En cours'), ('envoye', 'Envoyé'), ('echec', 'Échec')], default='en_attente', max_length=15)),
+                ('tentatives', models.PositiveSmallIntegerField(default=0)),
+                ('erreur', models.TextField(blank=True)),
+                ('verrouille_le', models.DateTimeField(blank=True, null=True)),
+                ('envoye_le', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('membre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='envois_notifications', to='core.membre')),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='envois', to='core.notification')),
+            ],
+            options={
+                'verbose_name': 'Envoi de Notification',
+                'verbose_name_plural': 'Envois de Notifications',
+                'indexes': [models.Index(fields=['statut', 'id'], name='core_envoin_statut_3c08cf_idx'), models.Index(fields=['notification', 'statut'], name='core_envoin_notific_123b67_idx')],
+                'unique_together': {('notification', 'destinataire')},
+            },
+        ),
+    ]
@@ -0,0 +1,137 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:22
+
+import django.db.models.deletion
+import django.db.models.manager
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonMaterielArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('description_objet', models.TextField()),
+                ('valeur_estimee', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('date_don', models.DateTimeField(db_index=True)),
+                ('statut_don', models.CharField(choices=[('recu', 'Reçu'), ('utilise', 'Utilisé'), ('en_attente', 'En attente')], max_length=15)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archive_le', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Don matériel archivé',
+                'verbose_name_plural': 'Dons matériels archivés',
+                'ordering': ['-date_don'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MembreArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('nom', models.CharField(max_length=100)),
+                ('prenom', models.CharField(max_length=100)),
+                ('date_naissance', models.DateField()),
+                ('adresse', models.TextField()),
+                ('telephone', models.CharField(max_length=20)),
+                ('email', models.EmailField(max_length=254)),
+                ('sexe', models.CharField(blank=True, choices=[('M', 'Masculin'), ('F', 'Féminin')], max_length=1, null=True)),
+                ('statut_baptismal', models.CharField(choices=[('baptise_eglise', 'Baptisé Église'), ('non_baptise', 'Non Baptisé'), ('baptise_autre_eglise', 'Baptisé Autre Église')], max_length=25)),
+                ('date_adhesion', models.DateField()),
+                ('photo_profil_url', models.URLField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archive_le', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Membre archivé',
+                'verbose_name_plural': 'Membres archivés',
+                'ordering': ['nom', 'prenom'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TransactionFinanciereArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('type_transaction', models.CharField(choices=[('offrande', 'Offrande'), ('don', 'Don'), ('depense', 'Dépense')], max_length=10)),
+                ('montant', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date_transaction', models.DateTimeField(db_index=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('categorie_depense', models.CharField(blank=True, choices=[('loyer', 'Loyer'), ('salaires', 'Salaires'), ('materiel', 'Matériel'), ('oeuvres_sociales', 'Œuvres sociales'), ('entretien', 'Entretien'), ('electricite', 'Électricité'), ('eau', 'Eau'), ('autres', 'Autres')], max_length=20, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archive_le', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Transaction archivée',
+                'verbose_name_plural': 'Transactions archivées',
+                'ordering': ['-date_transaction'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='couple',
+            options={'default_manager_name': 'tous', 'verbose_name': 'Couple', 'verbose_name_plural': 'Couples'},
+        ),
+        migrations.AlterModelOptions(
+            name='groupe',
+            options={'default_manager_name': 'tous', 'ordering': ['nom_groupe'], 'verbose_name': 'Groupe', 'verbose_name_plural': 'Groupes'},
+        ),
+        migrations.AlterModelOptions(
+            name='membre',
+            options={'default_manager_name': 'tous', 'ordering': ['nom', 'prenom'], 'verbose_name': 'Membre', 'verbose_name_plural': 'Membres'},
+        ),
+        migrations.AlterModelManagers(
+            name='couple',
+            managers=[
+                ('tous', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name='groupe',
+            managers=[
+                ('tous', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name='membre',
+            managers=[
+                ('tous', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='couple',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-date_mariage'], name='couple_actif_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupe',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['nom_groupe'], name='groupe_actif_nom_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membre',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['nom', 'prenom'], name='membre_actif_nom_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membre',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['updated_at'], name='membre_inactif_maj_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membrearchive',
+            index=models.Index(fields=['nom', 'prenom'], name='core_membre_nom_0a50ab_idx'),
+        ),
+        migrations.AddField(
+            model_name='donmaterielarchive',
+            name='membre',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dons_materiels', to='core.membrearchive'),
+        ),
+        migrations.AddField(
+            model_name='transactionfinancierearchive',
+            name='membre',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to='core.membrearchive'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:38
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_archivage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalAudit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modele', models.CharField(max_length=50)),
+                ('objet_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('creation', 'Création'), ('modification', 'Modification'), ('suppression', 'Suppression')], max_length=15)),
+                ('changements', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('lot', models.UUIDField(blank=True, null=True)),
+                ('horodatage', models.DateTimeField(default=django.utils.timezone.now)),
+                ('auteur', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': "Entrée du journal d'audit",
+                'verbose_name_plural': "Journal d'audit",
+                'ordering': ['-horodatage'],
+                'indexes': [models.Index(fields=['modele', 'objet_id', 'horodatage'], name='audit_objet_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:05
+
+from datetime import date
+from django.db import migrations
+from django.utils import timezone
+
+# Le SQL est recopié ici plutôt qu'importé de core.audit : la migration doit
+# rester identique même si le module change par la suite.
+TABLE = 'core_journalaudit'
+
+
+def _mois(debut, nombre):
+    annee, mois = debut.year, debut.month
+    for _ in range(nombre):
+        suivant = (annee + mois // 12, mois % 12 + 1)
+        yield date(annee, mois, 1), date(*suivant, 1)
+        annee, mois = suivant
+
+
+def partitionner_journal(apps, schema_editor):
+    """Convertit la table du journal en table partitionnée par mois, en ajout seul.
+
+    La clé primaire devient (id, horodatage), la colonne de partition devant
+    faire partie de toute clé unique ; `id` reste unique par construction.
+    Les lignes déjà présentes sont conservées. Sans effet sous SQLite
+    (développement) : la table reste une table simple.
+    """
+    connection = schema_editor.connection
+    if connection.vendor not in ('postgresql', 'mysql'):
+        return
+    # Mois courant et trois mois suivants ; la commande partitions_journal prépare les suivants
+    mois = list(_mois(timezone.now().date(), 4))
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_avant")
+            cursor.execute("DROP INDEX audit_objet_idx")
+            cursor.execute(
+                f"CREATE TABLE {TABLE} (LIKE {TABLE}_avant INCLUDING DEFAULTS) PARTITION BY RANGE (horodatage)"
+            )
+            cursor.execute(f"CREATE SEQUENCE {TABLE}_part_id_seq OWNED BY {TABLE}.id")
+            cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_part_id_seq')")
+            cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, horodatage)")
+            cursor.execute(f"CREATE INDEX audit_objet_idx ON {TABLE} (modele, objet_id, horodatage)")
+            cursor.execute(f"CREATE INDEX {TABLE}_auteur_idx ON {TABLE} (auteur_id)")
+            for debut, fin in mois:
+                cursor.execute(
+                    f"CREATE TABLE {TABLE}_p{debut:%Y%m} PARTITION OF {TABLE} "
+                    f"FOR VALUES FROM ('{debut} 00:00:00+00') TO ('{fin} 00:00:00+00')"
+                )
+            # Lignes hors des partitions mensuelles (lignes anciennes, mois non encore créé)
+            cursor.execute(f"CREATE TABLE {TABLE}_defaut PARTITION OF {TABLE} DEFAULT")
+            cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {TABLE}_avant")
+            cursor.execute(
+                f"SELECT setval('{TABLE}_part_id_seq', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+            )
+            cursor.execute(f"DROP TABLE {TABLE}_avant")
+            cursor.execute(
+                "CREATE OR REPLACE FUNCTION core_journalaudit_ajout_seul() RETURNS trigger AS $$ "
+                "BEGIN RAISE EXCEPTION 'Le journal d''audit est en ajout seul'; END; $$ LANGUAGE plpgsql"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER core_journalaudit_ajout_seul BEFORE UPDATE OR DELETE ON {TABLE} "
+                f"FOR EACH ROW EXECUTE PROCEDURE core_journalaudit_ajout_seul()"
+            )
+        else:
+            partitions = ", ".join(
+                f"PARTITION p{debut:%Y%m} VALUES LESS THAN ('{fin}')" for debut, fin in mois
+            )
+            cursor.execute(f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, horodatage)")
+            cursor.execute(
+                f"ALTER TABLE {TABLE} PARTITION BY RANGE COLUMNS(horodatage) ("
+                f"{partitions}, PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+            )
+            for evenement in ('UPDATE', 'DELETE'):
+                cursor.execute(
+                    f"CREATE TRIGGER core_journalaudit_sans_{evenement.lower()} BEFORE {evenement} ON {TABLE} "
+                    f"FOR EACH ROW SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Le journal d''audit est en ajout seul'"
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_journal_audit'),
+    ]
+
+    operations = [
+        migrations.RunPython(partitionner_journal, migrations.RunPython.noop),
+    ]
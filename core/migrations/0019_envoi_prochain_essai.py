@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_journal_audit_partitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='envoinotification',
+            name='prochain_essai',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -4,8 +4,45 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from decimal import Decimal
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
-from datetime import timedelta,datetime
+from datetime import timedelta,datetime,time
+from django.utils.dateparse import parse_date, parse_time
+
+
+def jour_annuel(valeur):
+    """Jour de l'année au format MMJJ (ex. 1225), identique d'une année à l'autre.
+
+    Contrairement au rang du jour dans l'année, cette forme ne dépend pas des
+    années bissextiles : le 29 février vaut toujours 229 et les plages de
+    dates se traduisent en simples plages d'entiers indexées.
+    """
+    if isinstance(valeur, str):
+        valeur = parse_date(valeur)
+    if valeur is None:
+        return None
+    return valeur.month * 100 + valeur.day
+
+
+def _avec_champ_calcule(kwargs, source, champ):
+    # save(update_fields=...) : le champ calculé suit le champ dont il dépend
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and source in update_fields:
+        kwargs['update_fields'] = set(update_fields) | {champ}
+    return kwargs
+
+
+class ActifsManager(models.Manager):
+    """Manager `objects` des modèles archivables : seules les lignes actives.
+
+    Le manager par défaut du modèle (Meta.default_manager_name) reste `tous`,
+    non filtré : administration, relations, get_object_or_404 et
+    synchronisation voient donc aussi les lignes désactivées.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
 
 class Membre(models.Model):
     SEXE_CHOICES = [
@@ -21,6 +58,8 @@ class Membre(models.Model):
     nom = models.CharField(max_length=100)
     prenom = models.CharField(max_length=100)
     date_naissance = models.DateField()
+    # MMJJ de date_naissance, maintenu par save() pour les rappels d'anniversaire
+    jour_anniversaire = models.PositiveSmallIntegerField(null=True, editable=False, db_index=True)
     is_active = models.BooleanField(default=True)
     adresse = models.TextField()
     telephone = models.CharField(
@@ -40,15 +79,28 @@ class Membre(models.Model):
         choices=STATUT_BAPTISMAL_CHOICES,
         default='non_baptise'
     )
-    date_adhesion = models.DateField()
+    date_adhesion = models.DateField(db_index=True)
     photo_profil_url = models.URLField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ActifsManager()
+    tous = models.Manager()
+    
     class Meta:
         verbose_name = "Membre"
         verbose_name_plural = "Membres"
         ordering = ['nom', 'prenom']
+        default_manager_name = 'tous'
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            # Recherche des conjoints possibles par sexe, triés par nom
+            models.Index(fields=['sexe', 'is_active', 'nom', 'prenom']),
+            # Liste des membres actifs (manager objects), limitée aux lignes actives
+            models.Index(fields=['nom', 'prenom'], condition=models.Q(is_active=True), name='membre_actif_nom_idx'),
+            # Recherche des membres à archiver
+            models.Index(fields=['updated_at'], condition=models.Q(is_active=False), name='membre_inactif_maj_idx'),
+        ]
     
     def __str__(self):
         return f"{self.prenom} {self.nom}"
@@ -56,6 +108,10 @@ class Membre(models.Model):
     @property
     def nom_complet(self):
         return f"{self.prenom} {self.nom}"
+    
+    def save(self, *args, **kwargs):
+        self.jour_anniversaire = jour_annuel(self.date_naissance)
+        super().save(*args, **_avec_champ_calcule(kwargs, 'date_naissance', 'jour_anniversaire'))
 
 
 class Role(models.Model):
@@ -79,6 +135,7 @@ class Role(models.Model):
         verbose_name = "Rôle"
         verbose_name_plural = "Rôles"
         ordering = ['nom_role']
+        indexes = [models.Index(fields=['updated_at', 'id'])]
     
     def __str__(self):
         return self.get_nom_role_display()
@@ -94,6 +151,7 @@ class MembreRole(models.Model):
         verbose_name = "Attribution de Rôle"
         verbose_name_plural = "Attributions de Rôles"
         unique_together = ['membre', 'role']
+        indexes = [models.Index(fields=['updated_at', 'id'])]
     
     def __str__(self):
         return f"{self.membre.nom_complet} - {self.role.get_nom_role_display()}"
@@ -141,24 +199,32 @@ class Couple(models.Model):
     is_active = models.BooleanField(default=True)
     statut_couple = models.CharField(max_length=10, choices=STATUT_CHOICES)
     date_mariage = models.DateField(null=True, blank=True)
+    # MMJJ de date_mariage, maintenu par save() pour les rappels d'anniversaire
+    jour_anniversaire_mariage = models.PositiveSmallIntegerField(null=True, editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ActifsManager()
+    tous = models.Manager()
+    
     class Meta:
         verbose_name = "Couple"
         verbose_name_plural = "Couples"
         unique_together = ['membre_mari', 'membre_femme']
+        default_manager_name = 'tous'
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['-date_mariage'], condition=models.Q(is_active=True), name='couple_actif_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.membre_mari.nom_complet} & {self.membre_femme.nom_complet}"
     
-    def clean(self):
-        
-        # Si le couple existe déjà (modification)
+    def verifier_suppression(self):
+        """Refuse la suppression (ou la désactivation) d'un couple qui a des programmes de mariage actifs."""
         if self.pk:
-            # Vérifie s'il y a des programmes actifs
             programmes_actifs = self.programmes_mariage.filter(
-                statut__in=['planifie', 'en_cours']
+                statut__in=ProgrammeMariage.STATUTS_ACTIFS
             ).exists()
             
             if programmes_actifs:
@@ -167,8 +233,12 @@ class Couple(models.Model):
                     "Veuillez d'abord annuler ou terminer tous les programmes associés."
                 )
     
+    def save(self, *args, **kwargs):
+        self.jour_anniversaire_mariage = jour_annuel(self.date_mariage)
+        super().save(*args, **_avec_champ_calcule(kwargs, 'date_mariage', 'jour_anniversaire_mariage'))
+    
     def delete(self, *args, **kwargs):
-        self.clean()
+        self.verifier_suppression()
         super().delete(*args, **kwargs)
 
 
@@ -179,11 +249,12 @@ class ProgrammeMariage(models.Model):
         ('termine', 'Terminé'),
         ('annule', 'Annulé'),
     ]
+    STATUTS_ACTIFS = ['planifie', 'en_cours']
     
     couple = models.ForeignKey(Couple, on_delete=models.CASCADE, related_name='programmes_mariage')
     titre = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
-    date_debut = models.DateTimeField()
+    date_debut = models.DateTimeField(db_index=True)
     date_fin = models.DateTimeField()
     lieu = models.CharField(max_length=200, blank=True, null=True)
     statut = models.CharField(max_length=15, choices=STATUT_CHOICES, default='planifie')
@@ -194,13 +265,24 @@ class ProgrammeMariage(models.Model):
         verbose_name = "Programme de Mariage"
         verbose_name_plural = "Programmes de Mariage"
         ordering = ['-date_debut']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            # Détection des conflits de réservation d'un lieu
+            models.Index(fields=['lieu', 'date_debut', 'date_fin']),
+            # Index partiels limités aux programmes actifs (une petite partie de la table) :
+            # vérification de Couple.verifier_suppression() et recherche des transitions de statut
+            models.Index(fields=['couple'], condition=models.Q(statut__in=['planifie', 'en_cours']),
+                         name='prog_mariage_actif_couple_idx'),
+            models.Index(fields=['date_fin', 'date_debut'], condition=models.Q(statut__in=['planifie', 'en_cours']),
+                         name='prog_mariage_actif_dates_idx'),
+        ]
     
     def __str__(self):
         return f"{self.titre} - {self.couple}"
     
     @property
     def is_actif(self):
-        return self.statut in ['planifie', 'en_cours']
+        return self.statut in self.STATUTS_ACTIFS
 
 
 class ProgrammeEglise(models.Model):
@@ -221,7 +303,7 @@ class ProgrammeEglise(models.Model):
     
     titre = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
-    date_debut = models.DateField(null=True, blank=True)
+    date_debut = models.DateField(null=True, blank=True, db_index=True)
     heure_debut = models.TimeField(null=True, blank=True)
     
     date_fin = models.DateField(null=True, blank=True)
@@ -237,6 +319,10 @@ class ProgrammeEglise(models.Model):
         default='none',
         verbose_name="Récurrence"
     )
+
+    # Début et fin complets (date + heure), maintenus à l'enregistrement pour les requêtes d'intervalle
+    debut_complet = models.DateTimeField(null=True, blank=True, editable=False)
+    fin_complet = models.DateTimeField(null=True, blank=True, editable=False)
     
     
 
@@ -301,10 +387,37 @@ class ProgrammeEglise(models.Model):
             if self.date_debut.weekday() == 3:  # 3 = Jeudi
                 self.recurrence = 'weekly'
     
+    def calculer_intervalle(self):
+        """Met à jour debut_complet/fin_complet à partir des dates et heures saisies."""
+        date_debut = parse_date(self.date_debut) if isinstance(self.date_debut, str) else self.date_debut
+        date_fin = parse_date(self.date_fin) if isinstance(self.date_fin, str) else self.date_fin
+        heure_debut = parse_time(self.heure_debut) if isinstance(self.heure_debut, str) else self.heure_debut
+        heure_fin = parse_time(self.heure_fin) if isinstance(self.heure_fin, str) else self.heure_fin
+
+        if not date_debut:
+            self.debut_complet = self.fin_complet = None
+            return
+        self.debut_complet = timezone.make_aware(datetime.combine(date_debut, heure_debut or time.min))
+        if heure_fin:
+            fin = datetime.combine(date_fin or date_debut, heure_fin)
+        else:
+            # Sans heure de fin, le programme occupe le lieu jusqu'à la fin de la journée
+            fin = datetime.combine((date_fin or date_debut) + timedelta(days=1), time.min)
+        self.fin_complet = max(timezone.make_aware(fin), self.debut_complet)
+
+    def save(self, *args, **kwargs):
+        self.calculer_intervalle()
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Programme d'Église"
         verbose_name_plural = "Programmes d'Église"
         ordering = ['-date_debut']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            # Détection des conflits de réservation d'un lieu
+            models.Index(fields=['lieu', 'debut_complet', 'fin_complet']),
+        ]
     
     def __str__(self):
         return f"{self.titre} - {self.get_categorie_display()}"
@@ -318,10 +431,18 @@ class Groupe(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ActifsManager()
+    tous = models.Manager()
+    
     class Meta:
         verbose_name = "Groupe"
         verbose_name_plural = "Groupes"
         ordering = ['nom_groupe']
+        default_manager_name = 'tous'
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['nom_groupe'], condition=models.Q(is_active=True), name='groupe_actif_nom_idx'),
+        ]
     
     def __str__(self):
         return self.nom_groupe
@@ -337,6 +458,7 @@ class MembreGroupe(models.Model):
         verbose_name = "Appartenance au Groupe"
         verbose_name_plural = "Appartenances aux Groupes"
         unique_together = ['membre', 'groupe']
+        indexes = [models.Index(fields=['updated_at', 'id'])]
     
     def __str__(self):
         return f"{self.membre.nom_complet} - {self.groupe.nom_groupe}"
@@ -362,7 +484,7 @@ class TransactionFinanciere(models.Model):
     
     type_transaction = models.CharField(max_length=10, choices=TYPE_CHOICES)
     montant = models.DecimalField(max_digits=10, decimal_places=2)
-    date_transaction = models.DateTimeField()
+    date_transaction = models.DateTimeField(db_index=True)
     description = models.TextField(blank=True, null=True)
     membre = models.ForeignKey(
         Membre, 
@@ -384,6 +506,7 @@ class TransactionFinanciere(models.Model):
         verbose_name = "Transaction Financière"
         verbose_name_plural = "Transactions Financières"
         ordering = ['-date_transaction']
+        indexes = [models.Index(fields=['updated_at', 'id'])]
     
     def __str__(self):
         membre_str = f" - {self.membre.nom_complet}" if self.membre else ""
@@ -405,7 +528,7 @@ class DonMateriel(models.Model):
         null=True, 
         blank=True
     )
-    date_don = models.DateTimeField()
+    date_don = models.DateTimeField(db_index=True)
     statut_don = models.CharField(max_length=15, choices=STATUT_CHOICES, default='recu')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -414,17 +537,269 @@ class DonMateriel(models.Model):
         verbose_name = "Don Matériel"
         verbose_name_plural = "Dons Matériels"
         ordering = ['-date_don']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            # Agrégations de l'inventaire (par statut et par mois, par donateur) sans lire la table
+            models.Index(fields=['statut_don', 'date_don', 'valeur_estimee']),
+            models.Index(fields=['membre', 'valeur_estimee']),
+        ]
     
     def __str__(self):
         valeur_str = f" ({self.valeur_estimee}€)" if self.valeur_estimee else ""
         return f"{self.membre.nom_complet} - {self.description_objet[:50]}{valeur_str}"
+
+
+class Presence(models.Model):
+    """Présence d'un membre à une occurrence (programme + date) d'un programme d'église."""
+    membre = models.ForeignKey(Membre, on_delete=models.CASCADE, related_name='presences')
+    programme = models.ForeignKey(ProgrammeEglise, on_delete=models.CASCADE, related_name='presences')
+    date_occurrence = models.DateField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Présence"
+        verbose_name_plural = "Présences"
+        unique_together = ['membre', 'programme', 'date_occurrence']
+        indexes = [
+            models.Index(fields=['programme', 'date_occurrence']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.membre_id} - {self.programme_id} ({self.date_occurrence:%d/%m/%Y})"
+
+
+class StatistiquePresence(models.Model):
+    """Taux de présence précalculés chaque nuit par membre, groupe et catégorie."""
+    PORTEE_CHOICES = [
+        ('membre', 'Membre'),
+        ('groupe', 'Groupe'),
+        ('categorie', 'Catégorie'),
+    ]
+
+    portee = models.CharField(max_length=10, choices=PORTEE_CHOICES)
+    cle = models.CharField(max_length=50)
+    presences = models.PositiveIntegerField(default=0)
+    occurrences = models.PositiveIntegerField(default=0)
+    taux = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0'))
+    periode_debut = models.DateField()
+    periode_fin = models.DateField()
+    calcule_le = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Statistique de Présence"
+        verbose_name_plural = "Statistiques de Présence"
+        unique_together = ['portee', 'cle']
+
+    def __str__(self):
+        return f"{self.get_portee_display()} {self.cle}: {self.taux}%"
+
+
 class DemandeAcces(models.Model):
+    STATUT_CHOICES = [
+        ('en_attente', 'En attente'),
+        ('approuvee', 'Approuvée'),
+        ('rejetee', 'Rejetée'),
+    ]
+
     nom_complet = models.CharField(max_length=150)
     email = models.EmailField(unique=True)
     role_souhaite = models.CharField(max_length=100)
     message = models.TextField(blank=True, null=True)
     est_traitee = models.BooleanField(default=False)
+    statut = models.CharField(max_length=15, choices=STATUT_CHOICES, default='en_attente')
     date_demande = models.DateTimeField(auto_now_add=True)
+    traitee_le = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Demande d'Accès"
+        verbose_name_plural = "Demandes d'Accès"
+        # File de modération : demandes en attente, parcourues par (date, id)
+        indexes = [models.Index(fields=['est_traitee', 'date_demande', 'id'])]
 
     def __str__(self):
         return f"Demande de {self.nom_complet} ({self.email})"
+
+
+class Suppression(models.Model):
+    """Trace d'un enregistrement supprimé, pour propager les suppressions aux clients de synchronisation."""
+    modele = models.CharField(max_length=50)
+    objet_id = models.BigIntegerField()
+    supprime_le = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Suppression"
+        verbose_name_plural = "Suppressions"
+        indexes = [models.Index(fields=['modele', 'supprime_le', 'id'])]
+
+    def __str__(self):
+        return f"{self.modele} #{self.objet_id} supprimé le {self.supprime_le:%d/%m/%Y}"
+
+
+class Notification(models.Model):
+    """Message envoyé à un ensemble de membres (groupes, rôles ou toute l'église)."""
+    CANAL_CHOICES = [
+        ('email', 'Email'),
+        ('sms', 'SMS'),
+    ]
+
+    canal = models.CharField(max_length=10, choices=CANAL_CHOICES, default='email')
+    sujet = models.CharField(max_length=200, blank=True)
+    message = models.TextField()
+    description_cible = models.CharField(max_length=255, blank=True)
+    auteur = models.ForeignKey(CompteUtilisateur, on_delete=models.SET_NULL, null=True, blank=True,
+                               related_name='notifications')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Notification"
+        verbose_name_plural = "Notifications"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_canal_display()} - {self.sujet or self.message[:50]}"
+
+
+class EnvoiNotification(models.Model):
+    """Boîte d'envoi : une ligne par destinataire d'une notification, avec son état de livraison."""
+    STATUT_CHOICES = [
+        ('en_attente', 'En attente'),
+        ('en_cours', 'En cours'),
+        ('envoye', 'Envoyé'),
+        ('echec', 'Échec'),
+    ]
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='envois')
+    membre = models.ForeignKey(Membre, on_delete=models.SET_NULL, null=True, blank=True,
+                               related_name='envois_notifications')
+    destinataire = models.CharField(max_length=254)
+    statut = models.CharField(max_length=15, choices=STATUT_CHOICES, default='en_attente')
+    tentatives = models.PositiveSmallIntegerField(default=0)
+    erreur = models.TextField(blank=True)
+    verrouille_le = models.DateTimeField(null=True, blank=True)
+    # Après un échec, l'envoi n'est pas repris avant cette date (délai croissant à chaque tentative)
+    prochain_essai = models.DateTimeField(null=True, blank=True)
+    envoye_le = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Envoi de Notification"
+        verbose_name_plural = "Envois de Notifications"
+        # Un même destinataire ne reçoit qu'une fois une notification
+        unique_together = ['notification', 'destinataire']
+        indexes = [
+            # Réservation des lots par le distributeur : statut puis ordre d'arrivée
+            models.Index(fields=['statut', 'id']),
+            models.Index(fields=['notification', 'statut']),
+        ]
+
+    def __str__(self):
+        return f"{self.destinataire} - {self.get_statut_display()}"
+
+
+# --- Archives : membres inactifs depuis longtemps et leur historique (commande archiver_membres) ---
+
+class MembreArchive(models.Model):
+    """Copie d'un membre retiré des tables courantes ; l'identifiant d'origine est conservé."""
+    id = models.BigIntegerField(primary_key=True)
+    nom = models.CharField(max_length=100)
+    prenom = models.CharField(max_length=100)
+    date_naissance = models.DateField()
+    adresse = models.TextField()
+    telephone = models.CharField(max_length=20)
+    email = models.EmailField()
+    sexe = models.CharField(max_length=1, choices=Membre.SEXE_CHOICES, null=True, blank=True)
+    statut_baptismal = models.CharField(max_length=25, choices=Membre.STATUT_BAPTISMAL_CHOICES)
+    date_adhesion = models.DateField()
+    photo_profil_url = models.URLField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archive_le = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "Membre archivé"
+        verbose_name_plural = "Membres archivés"
+        ordering = ['nom', 'prenom']
+        indexes = [models.Index(fields=['nom', 'prenom'])]
+
+    def __str__(self):
+        return f"{self.prenom} {self.nom}"
+
+    @property
+    def nom_complet(self):
+        return f"{self.prenom} {self.nom}"
+
+
+class TransactionFinanciereArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    membre = models.ForeignKey(MembreArchive, on_delete=models.CASCADE, related_name='transactions')
+    type_transaction = models.CharField(max_length=10, choices=TransactionFinanciere.TYPE_CHOICES)
+    montant = models.DecimalField(max_digits=10, decimal_places=2)
+    date_transaction = models.DateTimeField(db_index=True)
+    description = models.TextField(blank=True, null=True)
+    categorie_depense = models.CharField(
+        max_length=20, choices=TransactionFinanciere.CATEGORIE_DEPENSE_CHOICES, null=True, blank=True
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archive_le = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Transaction archivée"
+        verbose_name_plural = "Transactions archivées"
+        ordering = ['-date_transaction']
+
+    def __str__(self):
+        return f"{self.get_type_transaction_display()}: {self.montant}€ - {self.membre.nom_complet}"
+
+
+class DonMaterielArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    membre = models.ForeignKey(MembreArchive, on_delete=models.CASCADE, related_name='dons_materiels')
+    description_objet = models.TextField()
+    valeur_estimee = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    date_don = models.DateTimeField(db_index=True)
+    statut_don = models.CharField(max_length=15, choices=DonMateriel.STATUT_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archive_le = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Don matériel archivé"
+        verbose_name_plural = "Dons matériels archivés"
+        ordering = ['-date_don']
+
+    def __str__(self):
+        return f"{self.membre.nom_complet} - {self.description_objet[:50]}"
+
+
+class JournalAudit(models.Model):
+    """Journal d'audit en ajout seul : une ligne par création, modification ou suppression d'un objet."""
+    ACTION_CHOICES = [
+        ('creation', 'Création'),
+        ('modification', 'Modification'),
+        ('suppression', 'Suppression'),
+    ]
+
+    modele = models.CharField(max_length=50)
+    objet_id = models.BigIntegerField()
+    action = models.CharField(max_length=15, choices=ACTION_CHOICES)
+    # {champ: [avant, après]}
+    changements = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    # Sans contrainte ni cascade : le journal n'est jamais modifié, même si le compte disparaît
+    auteur = models.ForeignKey(CompteUtilisateur, on_delete=models.DO_NOTHING, db_constraint=False,
+                               null=True, blank=True, related_name='+')
+    # Identifiant commun aux lignes d'une même modification par lot
+    lot = models.UUIDField(null=True, blank=True)
+    horodatage = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Entrée du journal d'audit"
+        verbose_name_plural = "Journal d'audit"
+        ordering = ['-horodatage']
+        indexes = [models.Index(fields=['modele', 'objet_id', 'horodatage'], name='audit_objet_idx')]
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.modele} #{self.objet_id} le {self.horodatage:%d/%m/%Y %H:%M}"
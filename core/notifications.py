@@ -0,0 +1,280 @@
+# notifications.py
+"""Notifications groupées par email ou SMS.
+
+Créer une notification ne fait qu'alimenter la boîte d'envoi
+(EnvoiNotification) : les destinataires sont résolus par une seule requête
+ensembliste, dédoublonnés sur leur adresse puis insérés par lots. La
+livraison se fait hors requête HTTP (commande `distribuer_notifications`) :
+les lots réservés sont envoyés par un nombre borné de threads, chacun
+réutilisant une seule connexion au moteur d'envoi, sous un débit maximal
+par canal. L'état de chaque destinataire est enregistré en base ; un envoi
+en échec est repris par une passe ultérieure, après un délai qui double à
+chaque tentative (`prochain_essai`).
+
+Les moteurs se règlent dans settings.NOTIFICATIONS['backends'] ; tout
+moteur compatible avec `BaseNotificationBackend` peut y être branché
+(fournisseur SMS, API d'emailing, ...).
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import Membre, MembreGroupe, MembreRole, Notification, EnvoiNotification
+
+REGLAGES_PAR_DEFAUT = {
+    'backends': {
+        'email': 'core.notifications.EmailBackend',
+        'sms': 'core.notifications.ConsoleSmsBackend',
+    },
+    'debit': {'email': 10, 'sms': 5},
+    'concurrence': 4,
+    'taille_lot': 200,
+    'tentatives_max': 3,
+    # Délai avant la première nouvelle tentative (secondes), doublé à chaque échec
+    'delai_reessai': 60,
+    'sms_file_path': 'sms.log',
+}
+
+# Un envoi réservé depuis plus longtemps appartient à un distributeur interrompu
+DELAI_VERROU = timedelta(minutes=15)
+
+# Champ du membre utilisé comme adresse pour chaque canal
+CHAMP_ADRESSE = {'email': 'email', 'sms': 'telephone'}
+
+
+def reglage(nom):
+    return getattr(settings, 'NOTIFICATIONS', {}).get(nom, REGLAGES_PAR_DEFAUT[nom])
+
+
+# --- Moteurs d'envoi ---
+
+class BaseNotificationBackend:
+    """Moteur d'envoi d'un canal. Une instance = une connexion, utilisée par un seul thread."""
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, notification, destinataire):
+        """Envoie un message ; lève une exception en cas d'échec."""
+        raise NotImplementedError
+
+
+class EmailBackend(BaseNotificationBackend):
+    """Emails via la configuration Django (EMAIL_BACKEND), avec une connexion SMTP par lot."""
+
+    def open(self):
+        self.connection = get_connection(fail_silently=False)
+        self.connection.open()
+
+    def close(self):
+        self.connection.close()
+
+    def send(self, notification, destinataire):
+        EmailMessage(
+            notification.sujet, notification.message, to=[destinataire], connection=self.connection
+        ).send()
+
+
+class ConsoleSmsBackend(BaseNotificationBackend):
+    """SMS écrits sur la sortie standard (développement)."""
+    _lock = threading.Lock()
+
+    def send(self, notification, destinataire):
+        with self._lock:
+            sys.stdout.write(f"SMS à {destinataire} : {notification.message}\n")
+            sys.stdout.flush()
+
+
+class FileSmsBackend(BaseNotificationBackend):
+    """SMS ajoutés au fichier NOTIFICATIONS['sms_file_path'] (tests locaux)."""
+    _lock = threading.Lock()
+
+    def open(self):
+        self.fichier = open(reglage('sms_file_path'), 'a', encoding='utf-8')
+
+    def close(self):
+        self.fichier.close()
+
+    def send(self, notification, destinataire):
+        with self._lock:
+            self.fichier.write(f"{timezone.now().isoformat()}\t{destinataire}\t{notification.message}\n")
+
+
+def get_backend(canal):
+    return import_string(reglage('backends')[canal])()
+
+
+class _Cadence:
+    """Espace les envois pour ne pas dépasser `debit` messages par seconde, tous threads confondus."""
+
+    def __init__(self, debit):
+        self.intervalle = 1 / debit if debit else 0
+        self._prochain = time.monotonic()
+        self._lock = threading.Lock()
+
+    def attendre(self):
+        if not self.intervalle:
+            return
+        with self._lock:
+            maintenant = time.monotonic()
+            creneau = max(self._prochain, maintenant)
+            self._prochain = creneau + self.intervalle
+        time.sleep(creneau - maintenant)
+
+
+# --- Mise en file ---
+
+def normaliser_adresse(canal, adresse):
+    adresse = (adresse or '').strip()
+    return adresse.lower() if canal == 'email' else adresse.replace(' ', '')
+
+
+def resoudre_destinataires(canal, groupes=(), roles=(), tous=False):
+    """(membre_id, adresse) des membres actifs ciblés, en une requête, dédoublonnés par adresse.
+
+    Un membre présent dans plusieurs groupes ou rôles ciblés n'apparaît
+    qu'une fois (sous-requêtes EXISTS plutôt que jointures).
+    """
+    champ = CHAMP_ADRESSE[canal]
+    membres = Membre.objects.filter(is_active=True).exclude(**{champ: ''})
+    if not tous:
+        membres = membres.filter(
+            Exists(MembreGroupe.objects.filter(membre=OuterRef('pk'), groupe__in=groupes)) |
+            Exists(MembreRole.objects.filter(membre=OuterRef('pk'), role__in=roles))
+        )
+    adresses = {}
+    for membre_id, adresse in membres.order_by('pk').values_list('pk', champ).iterator(chunk_size=2000):
+        adresse = normaliser_adresse(canal, adresse)
+        if adresse:
+            adresses.setdefault(adresse, membre_id)
+    return [(membre_id, adresse) for adresse, membre_id in adresses.items()]
+
+
+def creer_notification(canal, message, sujet='', groupes=(), roles=(), tous=False, auteur=None,
+                       description_cible=''):
+    """Crée une notification et met en file un envoi par destinataire ; aucun message n'est envoyé ici."""
+    destinataires = resoudre_destinataires(canal, groupes, roles, tous)
+    with transaction.atomic():
+        notification = Notification.objects.create(
+            canal=canal, sujet=sujet, message=message, auteur=auteur, description_cible=description_cible
+        )
+        EnvoiNotification.objects.bulk_create(
+            [EnvoiNotification(notification=notification, membre_id=membre_id, destinataire=adresse)
+             for membre_id, adresse in destinataires],
+            batch_size=1000, ignore_conflicts=True,
+        )
+    return notification, len(destinataires)
+
+
+# --- Distribution ---
+
+def liberer_envois_abandonnes():
+    """Remet en attente les envois réservés par un distributeur qui s'est arrêté en cours de lot."""
+    maintenant = timezone.now()
+    return EnvoiNotification.objects.filter(
+        statut='en_cours', verrouille_le__lt=maintenant - DELAI_VERROU
+    ).update(statut='en_attente', verrouille_le=None, updated_at=maintenant)
+
+
+def reserver_lot(taille_lot):
+    """Réserve les plus anciens envois en attente dont le délai de nouvelle tentative est écoulé.
+
+    SKIP LOCKED : plusieurs distributeurs peuvent tourner en parallèle.
+    """
+    maintenant = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            EnvoiNotification.objects.filter(statut='en_attente')
+            .filter(Q(prochain_essai__isnull=True) | Q(prochain_essai__lte=maintenant)).order_by('id')
+            .select_for_update(skip_locked=True).values_list('pk', flat=True)[:taille_lot]
+        )
+        EnvoiNotification.objects.filter(pk__in=ids).update(
+            statut='en_cours', verrouille_le=maintenant, updated_at=maintenant
+        )
+    return list(EnvoiNotification.objects.filter(pk__in=ids).select_related('notification'))
+
+
+def _envoyer(canal, envois, cadence):
+    """Envoie une part du lot avec une seule connexion ; renvoie [(pk, erreur ou None)]."""
+    backend = get_backend(canal)
+    try:
+        backend.open()
+    except Exception as exc:
+        return [(envoi.pk, f"Connexion impossible : {exc}") for envoi in envois]
+    resultats = []
+    try:
+        for envoi in envois:
+            cadence.attendre()
+            try:
+                backend.send(envoi.notification, envoi.destinataire)
+                resultats.append((envoi.pk, None))
+            except Exception as exc:
+                resultats.append((envoi.pk, str(exc) or exc.__class__.__name__))
+    finally:
+        backend.close()
+    return resultats
+
+
+def distribuer_lot(envois, concurrence=None, cadences=None):
+    """Envoie un lot réservé et enregistre l'état de chaque destinataire.
+
+    Les envois d'un canal sont répartis entre au plus `concurrence` threads ;
+    seuls les envois touchent au réseau dans les threads, les écritures en
+    base restent groupées dans le thread appelant.
+    """
+    concurrence = concurrence or reglage('concurrence')
+    cadences = cadences if cadences is not None else {}
+    par_canal = {}
+    for envoi in envois:
+        par_canal.setdefault(envoi.notification.canal, []).append(envoi)
+
+    resultats = []
+    with ThreadPoolExecutor(max_workers=concurrence) as executor:
+        futures = []
+        for canal, envois_canal in par_canal.items():
+            cadence = cadences.setdefault(canal, _Cadence(reglage('debit').get(canal)))
+            for part in (envois_canal[i::concurrence] for i in range(concurrence)):
+                if part:
+                    futures.append(executor.submit(_envoyer, canal, part, cadence))
+        for future in futures:
+            resultats.extend(future.result())
+
+    maintenant = timezone.now()
+    envoyes = [pk for pk, erreur in resultats if erreur is None]
+    EnvoiNotification.objects.filter(pk__in=envoyes).update(
+        statut='envoye', envoye_le=maintenant, erreur='', verrouille_le=None, prochain_essai=None,
+        tentatives=F('tentatives') + 1, updated_at=maintenant,
+    )
+
+    erreurs = {pk: erreur for pk, erreur in resultats if erreur is not None}
+    echecs = [envoi for envoi in envois if envoi.pk in erreurs]
+    tentatives_max = reglage('tentatives_max')
+    delai = reglage('delai_reessai')
+    for envoi in echecs:
+        envoi.tentatives += 1
+        envoi.erreur = erreurs[envoi.pk]
+        envoi.statut = 'echec' if envoi.tentatives >= tentatives_max else 'en_attente'
+        # Délai exponentiel : une panne du fournisseur n'épuise pas les tentatives en une seule passe
+        envoi.prochain_essai = None if envoi.statut == 'echec' else (
+            maintenant + timedelta(seconds=delai * 2 ** (envoi.tentatives - 1))
+        )
+        envoi.verrouille_le = None
+        envoi.updated_at = maintenant
+    EnvoiNotification.objects.bulk_update(
+        echecs, ['tentatives', 'erreur', 'statut', 'prochain_essai', 'verrouille_le', 'updated_at'], batch_size=500
+    )
+    return {
+        'envoyes': len(envoyes),
+        'echecs': sum(1 for envoi in echecs if envoi.statut == 'echec'),
+        'a_reessayer': sum(1 for envoi in echecs if envoi.statut == 'en_attente'),
+    }
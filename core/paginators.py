@@ -0,0 +1,81 @@
+# paginators.py
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginateur qui évite un COUNT(*) sur les très grandes tables.
+
+    Sans filtre, le nombre de lignes est lu dans les statistiques du moteur
+    (pg_class.reltuples sous PostgreSQL, information_schema sous MySQL). Au-delà
+    de `seuil_estimation` lignes, ce nombre approché est utilisé tel quel ;
+    sinon, ou si le moteur ne fournit pas d'estimation, on retombe sur un
+    COUNT exact.
+
+    Une estimation peut s'écarter du nombre réel dans les deux sens : une page
+    au-delà de l'estimation est servie si elle contient des lignes, et une page
+    vide est ramenée à la dernière page non vide (seul cas où un COUNT exact est
+    alors exécuté). `numero_servi` donne le numéro de la page réellement servie.
+    """
+    seuil_estimation = 100000
+    estime = False
+    numero_servi = None
+
+    @cached_property
+    def count(self):
+        estimation = self._estimation()
+        if estimation is not None and estimation > self.seuil_estimation:
+            self.estime = True
+            return estimation
+        return super().count
+
+    def _estimation(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where:
+            # Liste filtrée : seule une requête exacte est fiable
+            return None
+        table = queryset.model._meta.db_table
+        connection = connections[queryset.db]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            elif connection.vendor == 'mysql':
+                cursor.execute(
+                    "SELECT table_rows FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = %s", [table]
+                )
+            else:
+                return None
+            row = cursor.fetchone()
+        if row is None or row[0] is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # Au-delà d'un nombre estimé, la page peut exister : page() le vérifie
+            if self.count and self.estime and int(number) > self.num_pages:
+                return int(number)
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.estime:
+            page = super().page(number)
+        else:
+            # Pas de troncature sur le nombre estimé : la tranche demandée est lue telle quelle
+            debut = (number - 1) * self.per_page
+            lignes = list(self.object_list[debut:debut + self.per_page])
+            if not lignes and number > 1:
+                # Page hors limites : nombre exact, puis dernière page non vide
+                self.count = Paginator.count.func(self)
+                self.__dict__.pop('num_pages', None)
+                self.estime = False
+                return self.page(self.num_pages)
+            page = self._get_page(lignes, number, self)
+        self.numero_servi = page.number
+        return page
@@ -0,0 +1,57 @@
+# permissions.py
+from functools import wraps
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from .models import MembreRole
+from .versions import get_version
+
+SESSION_ROLES_KEY = '_core_roles'
+
+# Rôles ayant accès à toutes les vues protégées
+ROLES_ADMINISTRATION = frozenset({'administrateur'})
+
+
+def get_roles(request):
+    """Ensemble des rôles de l'utilisateur connecté.
+
+    Résolu une fois par session puis conservé dans celle-ci avec la version
+    des attributions de rôles : une modification de MembreRole incrémente
+    cette version et force une nouvelle résolution, sans requête sinon.
+    """
+    if hasattr(request, '_core_roles'):
+        return request._core_roles
+
+    user = request.user
+    version = get_version('membre_role')
+    cached = request.session.get(SESSION_ROLES_KEY)
+    if cached and cached[0] == version and cached[1] == user.pk:
+        roles = frozenset(cached[2])
+    else:
+        roles = frozenset()
+        if user.membre_id:
+            roles = frozenset(
+                MembreRole.objects.filter(membre_id=user.membre_id).values_list('role__nom_role', flat=True)
+            )
+        request.session[SESSION_ROLES_KEY] = (version, user.pk, sorted(roles))
+
+    request._core_roles = roles
+    return roles
+
+
+def has_role(request, *roles):
+    if request.user.is_superuser:
+        return True
+    user_roles = get_roles(request)
+    return not user_roles.isdisjoint(roles) or not user_roles.isdisjoint(ROLES_ADMINISTRATION)
+
+
+def role_required(*roles):
+    """Restreint une vue aux utilisateurs connectés ayant au moins un des rôles donnés."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if not has_role(request, *roles):
+                raise PermissionDenied
+            return view_func(request, *args, **kwargs)
+        return login_required(_wrapped_view)
+    return decorator
@@ -0,0 +1,126 @@
+# planning.py
+"""Réservation des lieux : détection des conflits et recherche de créneaux libres.
+
+Les deux types de programmes (mariage et église) réservent un lieu sur un
+intervalle [début, fin). Deux intervalles se chevauchent si
+`debut < autre_fin AND fin > autre_debut` ; cette condition est évaluée en
+base sur les index (lieu, début, fin) de chaque table. Les programmes
+d'église récurrents sont peu nombreux : leurs occurrences sont dépliées en
+Python sur la seule période demandée.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from django.db.models import Q
+from django.urls import reverse
+from .models import ProgrammeMariage, ProgrammeEglise
+
+STATUTS_MARIAGE_INACTIFS = ['annule']
+
+
+@dataclass(frozen=True)
+class Reservation:
+    debut: datetime
+    fin: datetime
+    lieu: str
+    titre: str
+    url: str
+
+    def as_dict(self):
+        return {
+            'debut': self.debut.isoformat(),
+            'fin': self.fin.isoformat(),
+            'lieu': self.lieu,
+            'titre': self.titre,
+            'url': self.url,
+        }
+
+
+def _ajouter_mois(jour, mois):
+    mois_total = jour.month - 1 + mois
+    annee, mois = jour.year + mois_total // 12, mois_total % 12 + 1
+    return jour.replace(year=annee, month=mois, day=min(jour.day, calendar.monthrange(annee, mois)[1]))
+
+
+def _duree_occurrence(programme):
+    """Durée d'une occurrence récurrente : de l'heure de début à l'heure de fin, sinon la journée."""
+    if programme.heure_debut and programme.heure_fin and programme.heure_fin > programme.heure_debut:
+        return (datetime.combine(date.min, programme.heure_fin) -
+                datetime.combine(date.min, programme.heure_debut))
+    return timedelta(days=1)
+
+
+def _occurrences(programme, debut, fin):
+    """Occurrences [début, fin) d'un programme d'église récurrent qui chevauchent la période."""
+    duree = _duree_occurrence(programme)
+    occurrence, rang = programme.debut_complet, 0
+    if programme.recurrence == 'weekly' and occurrence + duree <= debut:
+        # Saute directement aux semaines proches de la période
+        rang = (debut - occurrence - duree) // timedelta(weeks=1)
+        occurrence = programme.debut_complet + timedelta(weeks=rang)
+    while occurrence < fin:
+        if occurrence + duree > debut:
+            yield occurrence, occurrence + duree
+        rang += 1
+        if programme.recurrence == 'weekly':
+            occurrence = programme.debut_complet + timedelta(weeks=rang)
+        else:
+            occurrence = _ajouter_mois(programme.debut_complet, rang)
+
+
+def reservations(lieux, debut, fin, exclure_mariage=None, exclure_eglise=None):
+    """Réservations des lieux donnés qui chevauchent [debut, fin), triées par début."""
+    resultats = []
+
+    mariages = ProgrammeMariage.objects.filter(
+        lieu__in=lieux, date_debut__lt=fin, date_fin__gt=debut
+    ).exclude(statut__in=STATUTS_MARIAGE_INACTIFS).only('id', 'titre', 'lieu', 'date_debut', 'date_fin')
+    if exclure_mariage is not None:
+        mariages = mariages.exclude(pk=exclure_mariage)
+    for programme in mariages:
+        resultats.append(Reservation(
+            programme.date_debut, programme.date_fin, programme.lieu, programme.titre,
+            reverse('programme_mariage_detail', args=[programme.pk]),
+        ))
+
+    # Programmes ponctuels : requête d'intervalle indexée ; récurrents : dépliés sur la période
+    eglise = ProgrammeEglise.objects.filter(lieu__in=lieux, debut_complet__lt=fin).only(
+        'id', 'titre', 'lieu', 'recurrence', 'heure_debut', 'heure_fin', 'debut_complet', 'fin_complet'
+    )
+    if exclure_eglise is not None:
+        eglise = eglise.exclude(pk=exclure_eglise)
+    for programme in eglise.filter(Q(recurrence='none', fin_complet__gt=debut) | ~Q(recurrence='none')):
+        url = reverse('programme_detail', args=[programme.pk])
+        if programme.recurrence == 'none':
+            resultats.append(Reservation(programme.debut_complet, programme.fin_complet, programme.lieu, programme.titre, url))
+            continue
+        for occurrence_debut, occurrence_fin in _occurrences(programme, debut, fin):
+            resultats.append(Reservation(occurrence_debut, occurrence_fin, programme.lieu, programme.titre, url))
+
+    return sorted(resultats, key=lambda reservation: (reservation.debut, reservation.fin))
+
+
+def conflits(lieu, debut, fin, exclure_mariage=None, exclure_eglise=None):
+    """Réservations du lieu qui empêchent de le réserver sur [debut, fin)."""
+    if not lieu or not debut or not fin:
+        return []
+    return reservations([lieu], debut, fin, exclure_mariage, exclure_eglise)
+
+
+def creneaux_libres(lieux, debut, fin, duree_minimale=timedelta(minutes=30)):
+    """Créneaux libres d'au moins `duree_minimale` pour chaque lieu sur [debut, fin)."""
+    occupes = {lieu: [] for lieu in lieux}
+    for reservation in reservations(lieux, debut, fin):
+        occupes[reservation.lieu].append(reservation)
+
+    libres = {}
+    for lieu, reservations_lieu in occupes.items():
+        creneaux, curseur = [], debut
+        for reservation in reservations_lieu:
+            if reservation.debut - curseur >= duree_minimale:
+                creneaux.append((curseur, reservation.debut))
+            curseur = max(curseur, reservation.fin)
+        if fin - curseur >= duree_minimale:
+            creneaux.append((curseur, fin))
+        libres[lieu] = creneaux
+    return libres
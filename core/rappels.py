@@ -0,0 +1,105 @@
+# rappels.py
+"""Rappels des anniversaires de naissance et de mariage.
+
+Les dates sont comparées via les colonnes indexées `jour_anniversaire`
+(MMJJ, voir models.jour_annuel) : « les 14 prochains jours » devient une ou
+deux plages d'entiers (deux lorsque la période passe le 31 décembre), sans
+parcourir la table des membres. Les anniversaires du 29 février sont
+fêtés le 28 février les années non bissextiles.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from .models import Membre, Couple, jour_annuel
+
+JOURS_RAPPEL = 14
+
+
+@dataclass(frozen=True)
+class Rappel:
+    type: str  # 'naissance' ou 'mariage'
+    date: date
+    jours_restants: int
+    annees: int
+    libelle: str
+    url: str
+
+    @property
+    def est_aujourd_hui(self):
+        return self.jours_restants == 0
+
+
+def _plages(debut, fin):
+    """Plages MMJJ [min, max] couvrant les dates de debut à fin incluses."""
+    if (fin - debut).days >= 365:
+        return [(101, 1231)]
+    plages = []
+    for annee in range(debut.year, fin.year + 1):
+        premier = max(debut, date(annee, 1, 1))
+        dernier = min(fin, date(annee, 12, 31))
+        bas, haut = jour_annuel(premier), jour_annuel(dernier)
+        if haut == 228 and not calendar.isleap(annee):
+            # Le 28 février d'une année non bissextile accueille aussi les natifs du 29
+            haut = 229
+        plages.append((bas, haut))
+    return plages
+
+
+def _condition(champ, debut, fin):
+    condition = Q()
+    for bas, haut in _plages(debut, fin):
+        condition |= Q(**{f'{champ}__range': (bas, haut)})
+    return condition
+
+
+def _prochaine_date(origine, debut):
+    """Prochaine date anniversaire de `origine` à partir de `debut` (29 février -> 28 février)."""
+    for annee in (debut.year, debut.year + 1):
+        jour = origine.day
+        if origine.month == 2 and jour == 29 and not calendar.isleap(annee):
+            jour = 28
+        anniversaire = date(annee, origine.month, jour)
+        if anniversaire >= debut:
+            return anniversaire
+
+
+def anniversaires_a_venir(jours=JOURS_RAPPEL, aujourd_hui=None):
+    """Anniversaires de naissance (membres actifs) et de mariage (couples actifs) des `jours` prochains jours.
+
+    La période commence aujourd'hui et compte `jours` jours (1 = aujourd'hui seulement).
+    """
+    debut = aujourd_hui or timezone.localdate()
+    fin = debut + timedelta(days=max(jours, 1) - 1)
+    rappels = []
+
+    membres = Membre.objects.filter(
+        _condition('jour_anniversaire', debut, fin), is_active=True
+    ).only('id', 'nom', 'prenom', 'date_naissance')
+    for membre in membres:
+        anniversaire = _prochaine_date(membre.date_naissance, debut)
+        rappels.append(Rappel(
+            'naissance', anniversaire, (anniversaire - debut).days,
+            anniversaire.year - membre.date_naissance.year, membre.nom_complet,
+            reverse('membre_detail', args=[membre.pk]),
+        ))
+
+    couples = Couple.objects.filter(
+        _condition('jour_anniversaire_mariage', debut, fin), is_active=True, statut_couple='marie'
+    ).select_related('membre_mari', 'membre_femme').only(
+        'id', 'date_mariage', 'membre_mari__nom', 'membre_mari__prenom',
+        'membre_femme__nom', 'membre_femme__prenom',
+    )
+    for couple in couples:
+        anniversaire = _prochaine_date(couple.date_mariage, debut)
+        rappels.append(Rappel(
+            'mariage', anniversaire, (anniversaire - debut).days,
+            anniversaire.year - couple.date_mariage.year, str(couple),
+            reverse('couple_detail', args=[couple.pk]),
+        ))
+
+    # Les bornes MMJJ sont inclusives : on écarte ce qui dépasserait la période
+    rappels = [rappel for rappel in rappels if rappel.date <= fin]
+    return sorted(rappels, key=lambda rappel: (rappel.date, rappel.type, rappel.libelle))
@@ -0,0 +1,119 @@
+# ratelimit.py
+"""Limitation de débit à fenêtre glissante.
+
+La fenêtre glissante est approchée par deux compteurs à fenêtre fixe : le
+nombre de tentatives de la fenêtre courante plus celui de la précédente,
+pondéré par la part de celle-ci encore couverte. Deux entiers par clé
+suffisent, stockés dans le cache Django (partagé entre workers si le cache
+l'est). Si le cache est indisponible, un stockage en mémoire du processus
+prend le relais.
+"""
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+
+class _MemoryCounters:
+    """Repli en mémoire : compteurs par clé avec expiration, protégés par un verrou."""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: value for key, (value, expires) in
+                ((key, self._data.get(key, (None, 0))) for key in keys)
+                if value is not None and expires > now
+            }
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            value, expires = self._data.get(key, (0, 0))
+            if expires <= now:
+                value = 0
+                expires = now + timeout
+            self._data[key] = (value + 1, expires)
+            if len(self._data) > self.max_keys:
+                self._purge(now)
+            return value + 1
+
+    def _purge(self, now):
+        for key in [key for key, (_, expires) in self._data.items() if expires <= now]:
+            del self._data[key]
+
+
+_memory = _MemoryCounters()
+
+
+class SlidingWindowLimiter:
+    """Autorise au plus `limite` tentatives par `fenetre` secondes et par clé."""
+
+    def __init__(self, nom, limite, fenetre):
+        self.nom = nom
+        self.limite = limite
+        self.fenetre = fenetre
+
+    def _cles(self, cle, maintenant):
+        index = int(maintenant // self.fenetre)
+        prefixe = f"core:rl:{self.nom}:{cle}"
+        return f"{prefixe}:{index}", f"{prefixe}:{index - 1}", index
+
+    def _estimation(self, courante, precedente, index, maintenant):
+        ecoule = (maintenant - index * self.fenetre) / self.fenetre
+        return courante + precedente * (1 - ecoule)
+
+    def _lire(self, cle_courante, cle_precedente):
+        try:
+            valeurs = cache.get_many([cle_courante, cle_precedente])
+        except Exception:
+            valeurs = _memory.get_many([cle_courante, cle_precedente])
+        return valeurs.get(cle_courante, 0), valeurs.get(cle_precedente, 0)
+
+    def _incrementer(self, cle_courante):
+        # Conservée deux fenêtres : elle sert encore de fenêtre « précédente »
+        timeout = self.fenetre * 2
+        try:
+            cache.add(cle_courante, 0, timeout)
+            return cache.incr(cle_courante)
+        except Exception:
+            return _memory.incr(cle_courante, timeout)
+
+    def tentative(self, cle):
+        """Enregistre une tentative ; renvoie False si la limite est déjà atteinte.
+
+        La vérification a lieu avant tout travail coûteux (hachage du mot de
+        passe, écriture en base) : une tentative refusée ne coûte qu'une
+        lecture de cache.
+        """
+        maintenant = time.time()
+        cle_courante, cle_precedente, index = self._cles(cle, maintenant)
+        courante, precedente = self._lire(cle_courante, cle_precedente)
+        if self._estimation(courante, precedente, index, maintenant) >= self.limite:
+            return False
+        self._incrementer(cle_courante)
+        return True
+
+
+def client_ip(request):
+    """Adresse IP du client (X-Forwarded-For uniquement derrière un proxy de confiance)."""
+    if getattr(settings, 'RATELIMIT_TRUST_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _limiter(nom, defaut):
+    limite, fenetre = getattr(settings, 'RATE_LIMITS', {}).get(nom, defaut)
+    return SlidingWindowLimiter(nom, limite, fenetre)
+
+
+login_ip_limiter = _limiter('login_ip', (20, 300))
+login_username_limiter = _limiter('login_username', (5, 300))
+demande_acces_limiter = _limiter('demande_acces', (5, 3600))
@@ -0,0 +1,75 @@
+# ressources.py
+"""Bibliothèques front-end tierces, hébergées dans core/static/vendor.
+
+Chaque bibliothèque est épinglée à une version ; `manage.py
+vendoriser_ressources` télécharge ses fichiers dans
+core/static/vendor/<nom>-<version>/ (à versionner avec le code). Les
+templates les chargent avec `{% ressource_css %}` / `{% ressource_js %}`
+(templatetags/ressources.py) : la copie locale est servie dès qu'elle
+existe, sinon l'adresse du CDN d'origine, pour ne pas casser une
+installation de développement où les fichiers n'ont pas encore été
+récupérés. En production, ce repli est une erreur de la vérification
+système core.E003 (core.checks).
+"""
+from functools import lru_cache
+from pathlib import Path
+from django.contrib.staticfiles import finders
+
+DOSSIER_VENDOR = Path(__file__).resolve().parent / 'static' / 'vendor'
+
+RESSOURCES = {
+    'fontawesome': {
+        'version': '6.4.0',
+        'cdn': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/',
+        'principal': 'css/all.min.css',
+        # Polices référencées par all.min.css (collectstatic exige qu'elles existent)
+        'fichiers': [
+            'css/all.min.css',
+            'webfonts/fa-brands-400.woff2', 'webfonts/fa-brands-400.ttf',
+            'webfonts/fa-regular-400.woff2', 'webfonts/fa-regular-400.ttf',
+            'webfonts/fa-solid-900.woff2', 'webfonts/fa-solid-900.ttf',
+            'webfonts/fa-v4compatibility.woff2', 'webfonts/fa-v4compatibility.ttf',
+        ],
+    },
+    'fullcalendar': {
+        'version': '6.1.8',
+        'cdn': 'https://cdn.jsdelivr.net/npm/fullcalendar@6.1.8/',
+        'principal': 'index.global.min.js',
+        'fichiers': ['index.global.min.js'],
+    },
+    'fullcalendar-fr': {
+        'version': '6.1.8',
+        'cdn': 'https://cdn.jsdelivr.net/npm/@fullcalendar/core@6.1.8/',
+        'principal': 'locales/fr.global.min.js',
+        'fichiers': ['locales/fr.global.min.js'],
+    },
+    'popper': {
+        'version': '2.11.8',
+        'cdn': 'https://unpkg.com/@popperjs/core@2.11.8/',
+        'principal': 'dist/umd/popper.min.js',
+        'fichiers': ['dist/umd/popper.min.js'],
+    },
+    'tippy': {
+        'version': '6.3.7',
+        'cdn': 'https://unpkg.com/tippy.js@6.3.7/',
+        'principal': 'dist/tippy-bundle.umd.min.js',
+        'fichiers': ['dist/tippy-bundle.umd.min.js'],
+    },
+}
+
+
+def chemin_statique(nom, fichier=None):
+    """Chemin relatif à STATIC_URL d'un fichier de la bibliothèque (le fichier principal par défaut)."""
+    ressource = RESSOURCES[nom]
+    return f"vendor/{nom}-{ressource['version']}/{fichier or ressource['principal']}"
+
+
+def url_cdn(nom, fichier=None):
+    ressource = RESSOURCES[nom]
+    return ressource['cdn'] + (fichier or ressource['principal'])
+
+
+@lru_cache(maxsize=None)
+def est_vendorisee(nom):
+    """Vrai si tous les fichiers de la bibliothèque sont présents dans les fichiers statiques."""
+    return all(finders.find(chemin_statique(nom, fichier)) for fichier in RESSOURCES[nom]['fichiers'])
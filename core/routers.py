@@ -0,0 +1,106 @@
+# routers.py
+"""Lectures des vues de rapport sur une réplique de la base.
+
+Les vues déclarées avec `@lecture_replica` (statistiques, exports, rapports
+financiers) lisent sur l'alias `settings.REPLICA_DATABASE` ; tout le reste,
+et toutes les écritures, vont sur `default`. Les querysets isolés peuvent
+aussi être envoyés sur la réplique avec `sur_replica(queryset)`.
+
+Primaire « collant » : après une écriture, le navigateur reçoit un cookie
+qui renvoie ses lectures vers la base principale pendant
+`REPLICA_STICKY_SECONDS` secondes, le temps que la réplique rattrape son
+retard ; l'utilisateur voit donc toujours ses propres modifications. Au
+sein d'une même requête, une écriture bascule aussi les lectures suivantes
+sur la base principale.
+
+Sans alias de réplique configuré, le routeur ne fait rien.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+
+COOKIE_PRIMAIRE = 'primaire_jusqu_a'
+
+# État de la requête en cours (contextvars : compatible avec les vues async)
+_lecture_replica = ContextVar('lecture_replica', default=False)
+_primaire = ContextVar('primaire', default=False)
+_ecriture = ContextVar('ecriture', default=False)
+
+
+def alias_replica():
+    """Alias de la réplique s'il est configuré, sinon None."""
+    alias = getattr(settings, 'REPLICA_DATABASE', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def alias_lecture():
+    """Base où lire dans le contexte courant : la réplique sauf après une écriture récente."""
+    replica = alias_replica()
+    if replica and not (_primaire.get() or _ecriture.get()):
+        return replica
+    return 'default'
+
+
+def sur_replica(queryset):
+    """Exécute un queryset de lecture sur la réplique, en respectant le primaire collant."""
+    return queryset.using(alias_lecture())
+
+
+def lecture_replica(view_func):
+    """Déclare une vue de rapport : ses lectures vont sur la réplique.
+
+    À placer sous @login_required / @role_required, pour que l'authentification
+    soit résolue sur la base principale.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        jeton = _lecture_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _lecture_replica.reset(jeton)
+    return _wrapped_view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _lecture_replica.get():
+            return alias_lecture()
+        return None
+
+    def db_for_write(self, model, **hints):
+        _ecriture.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaire et réplique contiennent les mêmes données
+        return True
+
+
+class PrimaireCollanteMiddleware:
+    """Renvoie les lectures d'un navigateur vers la base principale peu après ses écritures."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            jusqu_a = float(request.COOKIES.get(COOKIE_PRIMAIRE, 0))
+        except ValueError:
+            jusqu_a = 0
+        jeton_primaire = _primaire.set(jusqu_a > time.time())
+        jeton_ecriture = _ecriture.set(False)
+        try:
+            response = self.get_response(request)
+            # Une requête POST compte comme une écriture même si elle n'a rien modifié en base
+            if _ecriture.get() or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+                duree = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+                response.set_cookie(
+                    COOKIE_PRIMAIRE, str(time.time() + duree), max_age=duree,
+                    httponly=True, samesite='Lax',
+                )
+            return response
+        finally:
+            _ecriture.reset(jeton_ecriture)
+            _primaire.reset(jeton_primaire)
@@ -0,0 +1,543 @@
+# services.py
+import re
+import uuid
+from decimal import Decimal
+from datetime import date
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.db.models import F, Sum, Count, Q, Prefetch, Exists, OuterRef, BooleanField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower, TruncMonth
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from .versions import bump_version
+from .backends import invalider_compte
+from .live import get_broker
+from .permissions import ROLES_ADMINISTRATION
+from .models import (
+    Membre, MembreRole, MembreGroupe, Couple, TransactionFinanciere, DonMateriel,
+    ProgrammeEglise, Presence, DemandeAcces, CompteUtilisateur, Role, Suppression, JournalAudit,
+    Notification, EnvoiNotification,
+)
+
+# Types de transactions comptés comme des dons du membre
+TYPES_CONTRIBUTION = ['offrande', 'don']
+
+# Taille maximale d'un lot de présences envoyé par une tablette
+PRESENCE_BATCH_MAX = 1000
+
+# Nombre maximal de membres ajoutés, retirés ou transférés en une requête
+GROUPE_LOT_MAX = 5000
+
+# Champs modifiables par lot depuis la liste des membres
+CHAMPS_LOT_MEMBRES = ['statut_baptismal', 'is_active', 'date_adhesion']
+
+# Taille minimale d'un mot indexé en texte intégral (innodb_ft_min_token_size)
+RECHERCHE_MOT_MIN = 3
+
+# Rôles qu'une approbation de demande d'accès peut attribuer ; les rôles d'administration,
+# de pasteur et de trésorier ne s'attribuent que depuis l'administration
+ROLES_APPROBATION = (
+    frozenset(nom for nom, _ in Role.ROLES_CHOICES) - ROLES_ADMINISTRATION - {'pasteur', 'tresorier'}
+)
+
+
+def membre_profile_summary(pk):
+    """Résumé complet d'un membre pour la page de détail, en un nombre borné de requêtes."""
+    membre = get_object_or_404(
+        Membre.tous.prefetch_related(
+            Prefetch(
+                'membre_roles',
+                queryset=MembreRole.objects.select_related('role').order_by('role__nom_role'),
+                to_attr='roles_list',
+            ),
+            Prefetch(
+                'membregroupe_set',
+                queryset=MembreGroupe.objects.select_related('groupe').order_by('groupe__nom_groupe'),
+                to_attr='groupes_list',
+            ),
+        ),
+        pk=pk,
+    )
+
+    # Totaux des contributions (à vie et année courante) en une seule agrégation
+    debut_annee = timezone.now().replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    contribution = Q(type_transaction__in=TYPES_CONTRIBUTION)
+    totaux = TransactionFinanciere.objects.filter(membre=membre).aggregate(
+        nombre_transactions=Count('id'),
+        total_contributions=Sum('montant', filter=contribution),
+        total_contributions_annee=Sum(
+            'montant', filter=contribution & Q(date_transaction__gte=debut_annee)
+        ),
+    )
+
+    # Nombre de dons matériels par statut en une seule agrégation
+    dons_par_statut = DonMateriel.objects.filter(membre=membre).aggregate(
+        total=Count('id'),
+        **{
+            statut: Count('id', filter=Q(statut_don=statut))
+            for statut, _ in DonMateriel.STATUT_CHOICES
+        }
+    )
+
+    # Couple du membre, qu'il soit le mari ou la femme
+    couple = Couple.objects.filter(
+        Q(membre_mari=membre) | Q(membre_femme=membre),
+        is_active=True,
+    ).select_related('membre_mari', 'membre_femme').order_by('-date_mariage').first()
+
+    return {
+        'membre': membre,
+        'roles': membre.roles_list,
+        'groupes': membre.groupes_list,
+        'transactions': list(
+            TransactionFinanciere.objects.filter(membre=membre).order_by('-date_transaction')[:10]
+        ),
+        'dons_materiels': list(
+            DonMateriel.objects.filter(membre=membre).order_by('-date_don')[:5]
+        ),
+        'nombre_transactions': totaux['nombre_transactions'],
+        'total_contributions': totaux['total_contributions'] or Decimal('0'),
+        'total_contributions_annee': totaux['total_contributions_annee'] or Decimal('0'),
+        'dons_par_statut': dons_par_statut,
+        'couple': couple,
+    }
+
+
+def debut_mois_courant():
+    return timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def dashboard_counters():
+    """Compteurs principaux du tableau de bord."""
+    transactions_mois = TransactionFinanciere.objects.filter(date_transaction__gte=debut_mois_courant())
+    totaux = transactions_mois.aggregate(
+        offrandes=Sum('montant', filter=Q(type_transaction='offrande')),
+        depenses=Sum('montant', filter=Q(type_transaction='depense')),
+    )
+    offrandes_mois = totaux['offrandes'] or 0
+    depenses_mois = totaux['depenses'] or 0
+    return {
+        'total_membres': Membre.objects.count(),
+        'total_couples': Couple.objects.filter(statut_couple='marie').count(),
+        'offrandes_mois': offrandes_mois,
+        'depenses_mois': depenses_mois,
+        'solde_mois': offrandes_mois - depenses_mois,
+    }
+
+
+def enregistrer_presences(entrees):
+    """Enregistre un lot de présences de façon idempotente.
+
+    `entrees` est une liste de dictionnaires {membre, programme, date}. Les
+    doublons (déjà enregistrés ou répétés dans le lot) sont ignorés grâce à la
+    contrainte d'unicité, ce qui permet aux tablettes de renvoyer leur file
+    d'attente sans risque. Renvoie le nombre d'entrées valides et rejetées.
+    """
+    candidats = set()
+    rejetees = 0
+    for entree in entrees[:PRESENCE_BATCH_MAX]:
+        try:
+            candidats.add((
+                int(entree['membre']),
+                int(entree['programme']),
+                date.fromisoformat(str(entree['date'])),
+            ))
+        except (KeyError, TypeError, ValueError):
+            rejetees += 1
+    rejetees += max(0, len(entrees) - PRESENCE_BATCH_MAX)
+
+    # Vérifie l'existence des membres et programmes en deux requêtes
+    membres_ids = set(Membre.objects.filter(
+        pk__in={membre_id for membre_id, _, _ in candidats}
+    ).values_list('pk', flat=True))
+    programmes_ids = set(ProgrammeEglise.objects.filter(
+        pk__in={programme_id for _, programme_id, _ in candidats}
+    ).values_list('pk', flat=True))
+
+    presences = [
+        Presence(membre_id=membre_id, programme_id=programme_id, date_occurrence=jour)
+        for membre_id, programme_id, jour in candidats
+        if membre_id in membres_ids and programme_id in programmes_ids
+    ]
+    rejetees += len(candidats) - len(presences)
+
+    Presence.objects.bulk_create(presences, batch_size=500, ignore_conflicts=True)
+    return {'acceptees': len(presences), 'rejetees': rejetees}
+
+
+
+def _ids_membres(ids):
+    """Identifiants entiers distincts d'un lot (au plus GROUPE_LOT_MAX) ; les autres valeurs sont ignorées."""
+    valides = set()
+    for valeur in ids[:GROUPE_LOT_MAX]:
+        try:
+            valides.add(int(valeur))
+        except (TypeError, ValueError):
+            continue
+    return valides
+
+
+def ajouter_membres_groupe(groupe, ids):
+    """Ajoute un lot de membres à un groupe ; ceux qui en font déjà partie sont ignorés.
+
+    Une requête vérifie les membres existants et les appartenances déjà
+    présentes, puis un seul bulk_create insère le reste (ignore_conflicts
+    couvre une insertion concurrente sur la contrainte d'unicité).
+    """
+    ids = _ids_membres(ids)
+    membres_ids = set(Membre.objects.filter(pk__in=ids).values_list('pk', flat=True))
+    deja_membres = set(MembreGroupe.objects.filter(
+        groupe=groupe, membre_id__in=membres_ids
+    ).values_list('membre_id', flat=True))
+    nouveaux = [MembreGroupe(membre_id=membre_id, groupe=groupe) for membre_id in membres_ids - deja_membres]
+    MembreGroupe.objects.bulk_create(nouveaux, batch_size=500, ignore_conflicts=True)
+    # bulk_create n'émet pas post_save : version incrémentée une fois pour le lot
+    transaction.on_commit(lambda: bump_version('membre_groupe'))
+    return {'ajoutes': len(nouveaux), 'ignores': len(ids) - len(nouveaux)}
+
+
+def retirer_membres_groupe(groupe, ids):
+    """Retire un lot de membres d'un groupe par un seul DELETE ... WHERE membre_id IN (...).
+
+    La suppression passe outre le collecteur de Django (qui chargerait et
+    supprimerait chaque ligne pour émettre post_delete) : les traces de
+    suppression du flux de synchronisation sont donc créées ici, en bloc.
+    """
+    appartenances = MembreGroupe.objects.filter(groupe=groupe, membre_id__in=_ids_membres(ids))
+    with transaction.atomic():
+        pks = list(appartenances.values_list('pk', flat=True))
+        if not pks:
+            return {'retires': 0}
+        Suppression.objects.bulk_create(
+            [Suppression(modele='membre_groupe', objet_id=pk) for pk in pks], batch_size=500
+        )
+        retires = appartenances.filter(pk__in=pks)._raw_delete(appartenances.db)
+        transaction.on_commit(lambda: bump_version('membre_groupe'))
+    return {'retires': retires}
+
+
+def transferer_membres_groupe(source, cible, ids):
+    """Transfère un lot de membres d'un groupe à un autre dans une seule transaction."""
+    ids = list(MembreGroupe.objects.filter(
+        groupe=source, membre_id__in=_ids_membres(ids)
+    ).values_list('membre_id', flat=True))
+    with transaction.atomic():
+        ajout = ajouter_membres_groupe(cible, ids)
+        retrait = retirer_membres_groupe(source, ids)
+    return {'transferes': retrait['retires'], 'deja_dans_cible': len(ids) - ajout['ajoutes']}
+
+
+def valider_changements_membres(changements):
+    """Nettoie les changements d'un lot de membres ; renvoie (valeurs, erreurs).
+
+    Seuls les champs de CHAMPS_LOT_MEMBRES sont acceptés ; chaque valeur est
+    convertie et validée par le champ du modèle (choix, format de date...).
+    """
+    valeurs, erreurs = {}, []
+    if not changements:
+        erreurs.append("Aucune modification demandée.")
+    for nom, valeur in changements.items():
+        if nom not in CHAMPS_LOT_MEMBRES:
+            erreurs.append(f"Le champ « {nom} » ne peut pas être modifié par lot.")
+            continue
+        champ = Membre._meta.get_field(nom)
+        try:
+            valeurs[nom] = champ.clean(valeur, None)
+        except ValidationError as e:
+            erreurs.append(f"{champ.verbose_name} : {' '.join(e.messages)}")
+    return valeurs, erreurs
+
+
+def modifier_membres_lot(ids, valeurs, auteur=None):
+    """Applique les mêmes valeurs à un lot de membres par un seul UPDATE.
+
+    `valeurs` vient de valider_changements_membres. Les valeurs actuelles
+    sont lues (et verrouillées) en une requête pour ne modifier que les
+    membres qui changent réellement et écrire une entrée du journal d'audit
+    par membre, en un bulk_create. update() n'émet pas post_save : versions,
+    comptes en cache et tableaux de bord sont invalidés une fois pour le lot.
+    """
+    champs = list(valeurs)
+    with transaction.atomic():
+        actuels = Membre.tous.select_for_update().filter(pk__in=_ids_membres(ids)).values('pk', *champs)
+        journal = []
+        lot = uuid.uuid4()
+        for membre in actuels:
+            diff = {
+                champ: [membre[champ], valeur] for champ, valeur in valeurs.items() if membre[champ] != valeur
+            }
+            if diff:
+                journal.append(JournalAudit(
+                    modele='membre', objet_id=membre['pk'], action='modification',
+                    changements=diff, auteur=auteur, lot=lot,
+                ))
+        modifies = [entree.objet_id for entree in journal]
+        if modifies:
+            Membre.tous.filter(pk__in=modifies).update(**valeurs, updated_at=timezone.now())
+            JournalAudit.objects.bulk_create(journal, batch_size=500)
+            comptes = list(CompteUtilisateur.objects.filter(membre_id__in=modifies).values_list('pk', flat=True))
+
+            def invalider():
+                bump_version('membre')
+                for compte_id in comptes:
+                    invalider_compte(compte_id)
+                get_broker().publish({'type': 'refresh'})
+            transaction.on_commit(invalider)
+    return {'modifies': len(modifies), 'inchanges': len(actuels) - len(modifies), 'lot': str(lot)}
+
+
+def rejeter_demandes(ids):
+    """Rejette en une requête les demandes d'accès encore en attente."""
+    return DemandeAcces.objects.filter(pk__in=ids, est_traitee=False).update(
+        est_traitee=True, statut='rejetee', traitee_le=timezone.now()
+    )
+
+
+def approuver_demandes(ids, roles=None, adresse_site=''):
+    """Approuve un lot de demandes d'accès.
+
+    Crée les comptes utilisateurs en un seul bulk_create, sans mot de passe
+    utilisable, et les relie au membre portant le même email lorsqu'il existe.
+    `roles` ({id de demande: nom de rôle}) donne le rôle choisi par le
+    modérateur pour chaque demande ; le rôle souhaité saisi par le demandeur
+    n'est jamais attribué tel quel, et seuls les ROLES_APPROBATION peuvent
+    l'être. Chaque compte reçoit par email (boîte d'envoi des notifications)
+    un lien à usage unique pour définir son mot de passe : aucun mot de passe
+    n'est affiché ni stocké en clair.
+
+    Renvoie la liste des demandes approuvées et le nombre de demandes
+    ignorées car un compte existe déjà pour cet email.
+    """
+    roles = roles or {}
+    demandes = list(DemandeAcces.objects.filter(pk__in=ids, est_traitee=False))
+    emails = [demande.email.lower() for demande in demandes]
+    existants = set(
+        CompteUtilisateur.objects.annotate(username_l=Lower('username'))
+        .filter(username_l__in=emails).values_list('username_l', flat=True)
+    )
+    demandes = [demande for demande in demandes if demande.email.lower() not in existants]
+    ignorees = len(emails) - len(demandes)
+
+    membres = {
+        membre.email_l: membre for membre in
+        Membre.tous.annotate(email_l=Lower('email'))
+        .filter(email_l__in=[demande.email.lower() for demande in demandes],
+                compte_utilisateur__isnull=True)
+    }
+    roles_connus = {role.nom_role: role for role in Role.objects.filter(nom_role__in=ROLES_APPROBATION)}
+
+    maintenant = timezone.now()
+    with transaction.atomic():
+        # Revérifie sous verrou : une autre modération a pu traiter ces demandes entre-temps
+        en_attente = set(DemandeAcces.objects.select_for_update().filter(
+            pk__in=[demande.pk for demande in demandes], est_traitee=False
+        ).values_list('pk', flat=True))
+
+        comptes, membre_roles, approuvees = [], [], []
+        for demande in demandes:
+            if demande.pk not in en_attente:
+                continue
+            prenom, _, nom = demande.nom_complet.partition(' ')
+            membre = membres.get(demande.email.lower())
+            comptes.append(CompteUtilisateur(
+                username=demande.email.lower(), email=demande.email, password=make_password(None),
+                first_name=prenom[:150], last_name=nom[:150], membre=membre,
+            ))
+            role = roles_connus.get(roles.get(demande.pk))
+            if membre is not None and role is not None:
+                membre_roles.append(MembreRole(membre=membre, role=role))
+            approuvees.append(demande)
+
+        CompteUtilisateur.objects.bulk_create(comptes, batch_size=500)
+        MembreRole.objects.bulk_create(membre_roles, batch_size=500, ignore_conflicts=True)
+        if membre_roles:
+            # bulk_create n'émet pas de signaux
+            transaction.on_commit(lambda: bump_version('membre_role'))
+        DemandeAcces.objects.filter(pk__in=[demande.pk for demande in approuvees]).update(
+            est_traitee=True, statut='approuvee', traitee_le=maintenant
+        )
+        _envoyer_liens_activation(comptes, adresse_site)
+    return approuvees, ignorees
+
+
+def _envoyer_liens_activation(comptes, adresse_site):
+    """Met en file, pour chaque nouveau compte, l'email contenant son lien de définition du mot de passe."""
+    # bulk_create ne renvoie pas les clés primaires sous MySQL : relecture par identifiant
+    pks = dict(CompteUtilisateur.objects.filter(
+        username__in=[compte.username for compte in comptes]
+    ).values_list('username', 'pk'))
+    envois = []
+    for compte in comptes:
+        compte.pk = pks[compte.username]
+        lien = adresse_site + reverse('activer_compte', args=[
+            urlsafe_base64_encode(force_bytes(compte.pk)), default_token_generator.make_token(compte),
+        ])
+        # Message propre à chaque destinataire : une notification par compte
+        notification = Notification.objects.create(
+            canal='email', sujet="Votre accès a été approuvé",
+            message=(
+                f"Bonjour {compte.first_name},\n\n"
+                f"Votre demande d'accès a été approuvée. Votre identifiant est {compte.username}.\n"
+                f"Définissez votre mot de passe en suivant ce lien (valable "
+                f"{settings.PASSWORD_RESET_TIMEOUT // 86400} jour(s), utilisable une seule fois) :\n{lien}\n"
+            ),
+            description_cible=compte.username,
+        )
+        envois.append(EnvoiNotification(
+            notification=notification, membre_id=compte.membre_id, destinataire=compte.email.lower(),
+        ))
+    EnvoiNotification.objects.bulk_create(envois, batch_size=500)
+
+
+def _en_couple_actif(couple_exclu=None):
+    """Sous-requête EXISTS : le membre courant fait déjà partie d'un couple actif."""
+    couples = Couple.objects.filter(
+        Q(membre_mari=OuterRef('pk')) | Q(membre_femme=OuterRef('pk')),
+        is_active=True,
+    )
+    if couple_exclu is not None:
+        couples = couples.exclude(pk=couple_exclu.pk)
+    return Exists(couples)
+
+
+def conjoints_eligibles(sexe, recherche=None, couple=None):
+    """Membres actifs du sexe donné qui ne sont pas déjà dans un couple actif.
+
+    Utilise l'index (sexe, is_active, nom, prenom) et un NOT EXISTS sur Couple ;
+    seules les colonnes nécessaires aux listes de sélection sont chargées.
+    """
+    membres = Membre.objects.filter(sexe=sexe, is_active=True).filter(
+        ~_en_couple_actif(couple)
+    ).only('id', 'nom', 'prenom').order_by('nom', 'prenom')
+    if recherche:
+        membres = membres.filter(Q(nom__istartswith=recherche) | Q(prenom__istartswith=recherche))
+    return membres
+
+
+def options_conjoints(sexe, couple=None, limite=50):
+    """Premières options d'une liste de sélection de conjoints, en ordre alphabétique.
+
+    Pour un couple modifié, le conjoint actuel est toujours ajouté : au-delà
+    des `limite` premiers noms, il manquerait sinon à la liste et le
+    formulaire enregistrerait un autre conjoint ou aucun.
+    """
+    options = list(conjoints_eligibles(sexe, couple=couple)[:limite])
+    actuel_id = None
+    if couple is not None:
+        actuel_id = couple.membre_mari_id if sexe == 'M' else couple.membre_femme_id
+    if actuel_id is not None and actuel_id not in {membre.pk for membre in options}:
+        options.insert(0, Membre.tous.only('id', 'nom', 'prenom').get(pk=actuel_id))
+    return options
+
+
+def valider_conjoints(mari_id, femme_id, couple=None):
+    """Vérifie en une seule requête qu'un couple peut être enregistré ; renvoie la liste des erreurs."""
+    paire_existante = Couple.tous.filter(membre_mari_id=mari_id, membre_femme_id=femme_id)
+    if couple is not None:
+        paire_existante = paire_existante.exclude(pk=couple.pk)
+    membres = {
+        membre.pk: membre for membre in
+        Membre.tous.filter(pk__in=[mari_id, femme_id]).only('id', 'nom', 'prenom', 'sexe', 'is_active')
+        .annotate(en_couple=_en_couple_actif(couple), paire_existante=Exists(paire_existante))
+    }
+
+    erreurs = []
+    for membre_id, sexe, role in ((mari_id, 'M', 'mari'), (femme_id, 'F', 'femme')):
+        membre = membres.get(int(membre_id))
+        if membre is None:
+            erreurs.append(f"Le membre choisi comme {role} n'existe pas.")
+        elif membre.sexe != sexe:
+            erreurs.append(f"{membre.nom_complet} ne peut pas être choisi(e) comme {role}.")
+        elif not membre.is_active:
+            erreurs.append(f"{membre.nom_complet} n'est pas un membre actif.")
+        elif membre.en_couple:
+            erreurs.append(f"{membre.nom_complet} fait déjà partie d'un couple actif.")
+    if membres and next(iter(membres.values())).paire_existante:
+        erreurs.append("Ce couple existe déjà.")
+    return erreurs
+
+
+def inventaire_dons(nombre_mois=12, nombre_donateurs=10):
+    """Inventaire des dons matériels : totaux par statut et par mois, meilleurs donateurs.
+
+    Les totaux par statut et par mois viennent d'une seule requête groupée sur
+    (statut, mois), couverte par l'index (statut_don, date_don, valeur_estimee) ;
+    le classement des donateurs est une seconde agrégation limitée à quelques lignes.
+    """
+    libelles = dict(DonMateriel.STATUT_CHOICES)
+    par_statut = {statut: {'statut': statut, 'libelle': libelle, 'nombre': 0, 'valeur': Decimal('0')}
+                  for statut, libelle in DonMateriel.STATUT_CHOICES}
+    par_mois = {}
+
+    groupes = (
+        DonMateriel.objects.order_by()
+        .annotate(mois=TruncMonth('date_don'))
+        .values('statut_don', 'mois')
+        .annotate(nombre=Count('id'), valeur=Sum('valeur_estimee'))
+    )
+    for groupe in groupes:
+        valeur = groupe['valeur'] or Decimal('0')
+        statut = par_statut.setdefault(groupe['statut_don'], {
+            'statut': groupe['statut_don'], 'libelle': libelles.get(groupe['statut_don'], groupe['statut_don']),
+            'nombre': 0, 'valeur': Decimal('0'),
+        })
+        statut['nombre'] += groupe['nombre']
+        statut['valeur'] += valeur
+        mois = par_mois.setdefault(groupe['mois'], {
+            'mois': groupe['mois'], 'nombre': 0, 'valeur': Decimal('0'),
+            'par_statut': dict.fromkeys(libelles, 0),
+        })
+        mois['nombre'] += groupe['nombre']
+        mois['valeur'] += valeur
+        mois['par_statut'][groupe['statut_don']] = groupe['nombre']
+
+    top_donateurs = list(
+        DonMateriel.objects.order_by()
+        .values('membre_id', 'membre__nom', 'membre__prenom')
+        .annotate(nombre=Count('id'), valeur=Sum('valeur_estimee'))
+        .order_by(F('valeur').desc(nulls_last=True), '-nombre')[:nombre_donateurs]
+    )
+
+    derniers_mois = sorted((mois for mois in par_mois if mois is not None), reverse=True)[:nombre_mois]
+    return {
+        'par_statut': list(par_statut.values()),
+        'par_mois': [par_mois[mois] for mois in derniers_mois],
+        'total_nombre': sum(statut['nombre'] for statut in par_statut.values()),
+        'total_valeur': sum((statut['valeur'] for statut in par_statut.values()), Decimal('0')),
+        'top_donateurs': top_donateurs,
+    }
+
+
+def rechercher_dons(dons, terme):
+    """Filtre les dons sur leur description via l'index texte intégral du moteur.
+
+    Chaque mot est cherché en préfixe (« chais » trouve « chaises »). Sous
+    SQLite, ou si aucun mot n'est assez long pour l'index, on retombe sur un
+    LIKE classique.
+    """
+    mots = [mot for mot in re.findall(r'\w+', terme) if len(mot) >= RECHERCHE_MOT_MIN]
+    vendor = connections[dons.db].vendor
+    if mots and vendor == 'postgresql':
+        # Même expression que l'index GIN créé par la migration 0013
+        condition = RawSQL(
+            "to_tsvector('french'::regconfig, COALESCE(core_donmateriel.description_objet, '')) "
+            "@@ to_tsquery('french'::regconfig, %s)",
+            [' & '.join(f'{mot}:*' for mot in mots)],
+            output_field=BooleanField(),
+        )
+        return dons.filter(condition)
+    if mots and vendor == 'mysql':
+        condition = RawSQL(
+            "MATCH (core_donmateriel.description_objet) AGAINST (%s IN BOOLEAN MODE)",
+            [' '.join(f'+{mot}*' for mot in mots)],
+            output_field=BooleanField(),
+        )
+        return dons.filter(condition)
+    return dons.filter(description_objet__icontains=terme)
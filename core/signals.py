@@ -0,0 +1,166 @@
+# signals.py
+from datetime import datetime
+from decimal import Decimal
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Suppression, Membre, Couple, TransactionFinanciere, CompteUtilisateur
+from .backends import invalider_compte
+from .sync import SYNC_NAMES
+from .live import get_broker
+from .services import debut_mois_courant
+from .versions import bump_version
+from . import audit
+
+
+@receiver(post_delete)
+def enregistrer_suppression(sender, instance, **kwargs):
+    """Crée une trace de suppression pour les modèles du flux de synchronisation."""
+    name = SYNC_NAMES.get(sender)
+    if name is not None:
+        Suppression.objects.create(modele=name, objet_id=instance.pk)
+
+
+# --- Compteurs en direct du tableau de bord ---
+
+def _contribution(instance):
+    """Part de l'instance dans les compteurs du tableau de bord (None si inconnue)."""
+    # Seuls les membres et couples actifs sont comptés (managers `objects`)
+    if isinstance(instance, Membre):
+        return {'total_membres': 1 if instance.is_active else 0}
+    if isinstance(instance, Couple):
+        return {'total_couples': 1 if instance.is_active and instance.statut_couple == 'marie' else 0}
+    if not isinstance(instance.date_transaction, datetime):
+        return None
+    montant = Decimal(str(instance.montant or 0))
+    dans_le_mois = instance.date_transaction >= debut_mois_courant()
+    offrande = montant if dans_le_mois and instance.type_transaction == 'offrande' else Decimal('0')
+    depense = montant if dans_le_mois and instance.type_transaction == 'depense' else Decimal('0')
+    return {'offrandes_mois': offrande, 'depenses_mois': depense, 'solde_mois': offrande - depense}
+
+
+def _publier(model, delta, **extra):
+    if delta is None:
+        event = {'type': 'refresh'}
+    else:
+        delta = {key: value for key, value in delta.items() if value}
+        if not delta and not extra:
+            return
+        event = {'type': 'delta', 'model': model, 'counters': delta, **extra}
+    # Publication après validation, pour ne jamais annoncer une écriture annulée
+    transaction.on_commit(lambda: get_broker().publish(event))
+
+
+@receiver(pre_save, sender=Membre)
+@receiver(pre_save, sender=Couple)
+@receiver(pre_save, sender=TransactionFinanciere)
+def memoriser_contribution(sender, instance, **kwargs):
+    """Mémorise l'ancienne contribution et les anciennes valeurs (journal d'audit) avant une modification.
+
+    Une seule requête par écriture, partagée par les compteurs et l'audit.
+    """
+    instance._contribution_precedente = None
+    instance._audit_precedent = None
+    if instance.pk:
+        precedent = sender._default_manager.filter(pk=instance.pk).first()
+        if precedent is not None:
+            instance._contribution_precedente = _contribution(precedent)
+            instance._audit_precedent = audit.instantane(precedent)
+
+
+@receiver(post_save, sender=Membre)
+@receiver(post_save, sender=Couple)
+@receiver(post_save, sender=TransactionFinanciere)
+def publier_compteurs_sauvegarde(sender, instance, created, **kwargs):
+    model = sender._meta.model_name
+    if sender is Membre and created:
+        _publier(model, _contribution(instance), nouveau_membre={
+            'id': instance.pk,
+            'nom_complet': instance.nom_complet,
+            'statut_baptismal': instance.statut_baptismal,
+        })
+        return
+
+    nouvelle = _contribution(instance)
+    if created:
+        _publier(model, nouvelle)
+        return
+    precedente = getattr(instance, '_contribution_precedente', None)
+    if nouvelle is None or precedente is None:
+        # Ancienne ou nouvelle valeur inconnue : les tableaux de bord rechargent leurs compteurs
+        _publier(model, None)
+        return
+    _publier(model, {key: value - precedente.get(key, 0) for key, value in nouvelle.items()})
+
+
+@receiver(post_delete, sender=Membre)
+@receiver(post_delete, sender=Couple)
+@receiver(post_delete, sender=TransactionFinanciere)
+def publier_compteurs_suppression(sender, instance, **kwargs):
+    contribution = _contribution(instance)
+    delta = None if contribution is None else {key: -value for key, value in contribution.items()}
+    _publier(sender._meta.model_name, delta)
+
+
+# --- Journal d'audit ---
+
+@receiver(post_save, sender=Membre)
+@receiver(post_save, sender=Couple)
+@receiver(post_save, sender=TransactionFinanciere)
+def auditer_sauvegarde(sender, instance, created, update_fields=None, **kwargs):
+    apres = audit.instantane(instance)
+    precedent = getattr(instance, '_audit_precedent', None)
+    if created or precedent is None:
+        changements = {nom: [None, valeur] for nom, valeur in apres.items() if valeur not in (None, '')}
+        action = 'creation'
+    else:
+        champs = None if update_fields is None else {sender._meta.get_field(nom).attname for nom in update_fields}
+        changements = audit.differences(precedent, apres, champs)
+        action = 'modification'
+    if changements:
+        audit.enregistrer(audit.MODELES_AUDITES[sender], instance.pk, action, changements)
+
+
+@receiver(post_delete, sender=Membre)
+@receiver(post_delete, sender=Couple)
+@receiver(post_delete, sender=TransactionFinanciere)
+def auditer_suppression(sender, instance, **kwargs):
+    avant = audit.instantane(instance)
+    changements = {nom: [valeur, None] for nom, valeur in avant.items() if valeur not in (None, '')}
+    audit.enregistrer(audit.MODELES_AUDITES[sender], instance.pk, 'suppression', changements)
+
+
+# --- Versions des modèles (invalidation des caches applicatifs) ---
+
+@receiver(post_save)
+@receiver(post_delete)
+def incrementer_version(sender, **kwargs):
+    """Une version par modèle synchronisé ('membre', 'membre_role', 'transaction', ...).
+
+    'membre' reconstruit l'annuaire, 'membre_role' les ensembles de rôles
+    conservés en session ; toutes servent aux ETag des pages.
+    """
+    name = SYNC_NAMES.get(sender)
+    if name is not None:
+        # Après validation, pour qu'une reconstruction voie bien la nouvelle ligne
+        transaction.on_commit(lambda: bump_version(name))
+
+
+# --- Cache des comptes utilisateurs ---
+
+@receiver(post_save, sender=CompteUtilisateur)
+@receiver(post_delete, sender=CompteUtilisateur)
+def invalider_cache_compte(sender, instance, update_fields=None, **kwargs):
+    invalider_compte(instance.pk)
+    # Les rôles conservés en session dépendent du membre lié au compte : un changement de membre
+    # invalide les ensembles de rôles (la mise à jour de last_login à chaque connexion ne le fait pas)
+    if update_fields is None or 'membre' in update_fields:
+        transaction.on_commit(lambda: bump_version('membre_role'))
+
+
+@receiver(post_save, sender=Membre)
+def invalider_cache_compte_membre(sender, instance, created, **kwargs):
+    # Le compte mis en cache embarque son membre (select_related)
+    if not created:
+        for compte_id in CompteUtilisateur.objects.filter(membre=instance).values_list('pk', flat=True):
+            invalider_compte(compte_id)
@@ -0,0 +1,12 @@
+// Construction du CSS Tailwind de production : `python manage.py construire_css`.
+// Seules les classes présentes dans les templates (scripts inline compris) sont conservées.
+module.exports = {
+  content: {
+    relative: true,
+    files: ['../templates/**/*.html', '../static/core/js/**/*.js'],
+  },
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};
@@ -0,0 +1,131 @@
+# staticfiles.py
+"""Service des fichiers statiques collectés (profil de rendu production).
+
+`collectstatic` avec `StockageCompresse` nomme les fichiers par empreinte
+(ManifestStaticFilesStorage) et écrit à côté de chaque fichier texte ses
+variantes précompressées `.gz` et `.br` (brotli si le module est installé).
+
+Les fichiers de STATIC_ROOT sont indexés au démarrage puis servis par
+`StatiquesMiddleware`, avant le reste de la pile, dans la variante la plus
+compacte acceptée par le navigateur. Les noms avec empreinte sont servis
+avec un cache d'un an marqué `immutable`. Les autres fichiers gardent un
+cache court, puisqu'ils peuvent changer sous le même nom.
+"""
+import gzip
+import mimetypes
+import os
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CACHE_EMPREINTE = 'public, max-age=31536000, immutable'
+CACHE_COURT = 'public, max-age=300'
+
+EXTENSIONS_COMPRESSIBLES = {'.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ttf', '.eot'}
+# Variantes par ordre de préférence : (encodage HTTP, suffixe du fichier)
+VARIANTES = [('br', '.br'), ('gzip', '.gz')]
+# Une variante qui ne gagne pas au moins 5 % n'est pas conservée
+GAIN_MIN = 0.95
+
+
+def compresser(chemin):
+    """Écrit les variantes .gz et .br d'un fichier ; renvoie les suffixes écrits."""
+    with open(chemin, 'rb') as fichier:
+        contenu = fichier.read()
+    variantes = {'.gz': gzip.compress(contenu, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variantes['.br'] = brotli.compress(contenu)
+    produits = []
+    for suffixe, compresse in variantes.items():
+        if len(compresse) < len(contenu) * GAIN_MIN:
+            with open(chemin + suffixe, 'wb') as fichier:
+                fichier.write(compresse)
+            produits.append(suffixe)
+        elif os.path.exists(chemin + suffixe):
+            os.remove(chemin + suffixe)
+    return produits
+
+
+class StockageCompresse(ManifestStaticFilesStorage):
+    """Stockage à empreintes qui précompresse les fichiers texte après collectstatic."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for dossier, _, noms in os.walk(self.location):
+            for nom in noms:
+                if os.path.splitext(nom)[1] in EXTENSIONS_COMPRESSIBLES:
+                    compresser(os.path.join(dossier, nom))
+
+
+def encodages_acceptes(entete):
+    """Encodages de l'en-tête Accept-Encoding, sans ceux refusés par q=0."""
+    acceptes = set()
+    for partie in entete.split(','):
+        encodage, _, parametre = partie.strip().partition(';')
+        if parametre.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        acceptes.add(encodage.strip().lower())
+    return acceptes
+
+
+class StatiquesMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        racine = settings.STATIC_ROOT
+        if not racine or not os.path.isdir(racine):
+            raise MiddlewareNotUsed("STATIC_ROOT absent : lancez collectstatic.")
+        self.prefixe = settings.STATIC_URL
+        # Noms avec empreinte d'après le manifeste (vide sans ManifestStaticFilesStorage)
+        empreintes = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        self.fichiers = {}
+        for dossier, _, noms in os.walk(racine):
+            presents = set(noms)
+            for nom in noms:
+                if nom.endswith(('.gz', '.br')) and nom[:-3] in presents:
+                    continue
+                chemin = os.path.join(dossier, nom)
+                relatif = os.path.relpath(chemin, racine).replace(os.sep, '/')
+                variantes = [
+                    (encodage, chemin + suffixe) for encodage, suffixe in VARIANTES if nom + suffixe in presents
+                ]
+                self.fichiers[self.prefixe + relatif] = (chemin, relatif in empreintes, variantes)
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefixe):
+            fichier = self.fichiers.get(request.path)
+            if fichier:
+                return self.servir(request, *fichier)
+        return self.get_response(request)
+
+    def servir(self, request, chemin, avec_empreinte, variantes):
+        stat = os.stat(chemin)
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            response = HttpResponseNotModified()
+        else:
+            content_type, _ = mimetypes.guess_type(chemin)
+            acceptes = encodages_acceptes(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            encodage, a_servir = next(
+                ((encodage, variante) for encodage, variante in variantes if encodage in acceptes),
+                (None, chemin)
+            )
+            response = FileResponse(
+                open(a_servir, 'rb'), content_type=content_type or 'application/octet-stream',
+                filename=os.path.basename(chemin),
+            )
+            if encodage:
+                response['Content-Encoding'] = encodage
+        if variantes:
+            response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = CACHE_EMPREINTE if avec_empreinte else CACHE_COURT
+        return response
@@ -0,0 +1,77 @@
+# sync.py
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from .models import (
+    Membre, Role, MembreRole, Couple, ProgrammeMariage, ProgrammeEglise,
+    Groupe, MembreGroupe, TransactionFinanciere, DonMateriel, Presence, Suppression
+)
+
+# Modèles exposés au flux de modifications, par nom public
+SYNC_MODELS = {
+    'membre': Membre,
+    'role': Role,
+    'membre_role': MembreRole,
+    'couple': Couple,
+    'programme_mariage': ProgrammeMariage,
+    'programme_eglise': ProgrammeEglise,
+    'groupe': Groupe,
+    'membre_groupe': MembreGroupe,
+    'transaction': TransactionFinanciere,
+    'don_materiel': DonMateriel,
+    'presence': Presence,
+}
+SYNC_NAMES = {model: name for name, model in SYNC_MODELS.items()}
+
+# Rôles requis pour lire le flux d'un modèle, comme les roles_lecture de l'API JSON (core.api) ;
+# les modèles absents sont lisibles par tout utilisateur connecté
+SYNC_ROLES = {
+    'transaction': ('tresorier', 'pasteur'),
+    'don_materiel': ('tresorier', 'pasteur'),
+}
+
+BATCH_SIZE = 500
+MAX_BATCH_SIZE = 2000
+
+
+def parse_cursor(since, after_id):
+    """Convertit les paramètres de curseur (date ISO, id) ; renvoie (None, 0) pour une synchro complète."""
+    since_dt = parse_datetime(since) if since else None
+    try:
+        after_id = int(after_id) if after_id else 0
+    except ValueError:
+        after_id = 0
+    return since_dt, after_id
+
+
+def _keyset(queryset, date_field, since, after_id, limit):
+    """Page ordonnée par (date, id), strictement après le curseur donné."""
+    if since is not None:
+        queryset = queryset.filter(
+            Q(**{f'{date_field}__gt': since}) |
+            Q(**{date_field: since, 'id__gt': after_id})
+        )
+    rows = list(queryset.order_by(date_field, 'id')[:limit + 1])
+    has_more = len(rows) > limit
+    return rows[:limit], has_more
+
+
+def changes_since(name, since=None, after_id=0, limit=BATCH_SIZE):
+    """Lignes modifiées depuis le curseur, par lots, via l'index (updated_at, id)."""
+    model = SYNC_MODELS[name]
+    limit = max(1, min(limit, MAX_BATCH_SIZE))
+    rows, has_more = _keyset(model._default_manager.values(), 'updated_at', since, after_id, limit)
+    next_cursor = None
+    if rows:
+        next_cursor = {'since': rows[-1]['updated_at'].isoformat(), 'after_id': rows[-1]['id']}
+    return {'results': rows, 'has_more': has_more, 'next': next_cursor}
+
+
+def deletions_since(name, since=None, after_id=0, limit=BATCH_SIZE):
+    """Suppressions enregistrées depuis le curseur pour un modèle."""
+    limit = max(1, min(limit, MAX_BATCH_SIZE))
+    queryset = Suppression.objects.filter(modele=name).values('id', 'objet_id', 'supprime_le')
+    rows, has_more = _keyset(queryset, 'supprime_le', since, after_id, limit)
+    next_cursor = None
+    if rows:
+        next_cursor = {'since': rows[-1]['supprime_le'].isoformat(), 'after_id': rows[-1]['id']}
+    return {'results': rows, 'has_more': has_more, 'next': next_cursor}
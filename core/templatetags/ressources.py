@@ -0,0 +1,35 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html
+from ..ressources import chemin_statique, est_vendorisee, url_cdn
+
+register = template.Library()
+
+TAILWIND_CDN_URL = 'https://cdn.tailwindcss.com'
+
+
+@register.simple_tag
+def tailwind_css():
+    """CSS Tailwind : compilé dans le navigateur (profil dev) ou fichier statique construit (production)."""
+    if settings.TAILWIND_CDN:
+        return format_html('<script src="{}"></script>', TAILWIND_CDN_URL)
+    return format_html('<link rel="stylesheet" href="{}">', static(settings.TAILWIND_CSS))
+
+
+def url_ressource(nom):
+    """Copie locale de la bibliothèque si elle est vendorisée, sinon son CDN."""
+    return static(chemin_statique(nom)) if est_vendorisee(nom) else url_cdn(nom)
+
+
+@register.simple_tag
+def ressource_css(nom):
+    return format_html('<link rel="stylesheet" href="{}">', url_ressource(nom))
+
+
+@register.simple_tag
+def ressource_js(nom, defer=True):
+    """Script d'une bibliothèque, en `defer` par défaut pour ne pas bloquer l'affichage."""
+    if defer:
+        return format_html('<script src="{}" defer></script>', url_ressource(nom))
+    return format_html('<script src="{}"></script>', url_ressource(nom))
@@ -1,3 +1,1159 @@
-from django.test import TestCase
+import base64
+import json
+import re
+import time
+from decimal import Decimal
+from datetime import date, datetime, timedelta, time as dt_time
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.db import transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from .audit import _creer_partition_postgresql
+from .backends import CachedModelBackend
+from .checks import verifier_cache_partage, verifier_css_construit, verifier_ressources_vendorisees
+from .compression import CompressionMiddleware
+from .directory import get_annuaire
+from .models import (
+    CompteUtilisateur, Couple, DemandeAcces, DonMateriel, EnvoiNotification, Groupe, JournalAudit, Membre,
+    MembreArchive, MembreGroupe, MembreRole, Notification, Presence, ProgrammeEglise, ProgrammeMariage, Role,
+    StatistiquePresence, Suppression, TransactionFinanciere,
+)
+from .notifications import BaseNotificationBackend, distribuer_lot, reserver_lot
+from .paginators import EstimatedCountPaginator
+from .planning import conflits
+from .rappels import anniversaires_a_venir
+from .routers import COOKIE_PRIMAIRE, PrimaireCollanteMiddleware, ReplicaRouter, lecture_replica
+from .services import (
+    ROLES_APPROBATION, enregistrer_presences, inventaire_dons, membre_profile_summary, rechercher_dons,
+    valider_conjoints,
+)
+from .versions import get_version
 
-# Create your tests here.
+
+def creer_membre(nom, date_naissance, **champs):
+    return Membre.objects.create(
+        nom=nom, prenom="Test", date_naissance=date_naissance, adresse="1 rue de l'Église",
+        telephone="+22990000000", email=f"{nom.lower()}@exemple.org", date_adhesion=date(2020, 1, 1), **champs
+    )
+
+
+def creer_compte(nom, *roles):
+    """Compte lié à un nouveau membre portant les rôles donnés."""
+    membre = creer_membre(nom, date(1980, 1, 1))
+    for nom_role in roles:
+        MembreRole.objects.create(membre=membre, role=Role.objects.get_or_create(nom_role=nom_role)[0])
+    return CompteUtilisateur.objects.create_user(nom.lower(), f"{nom.lower()}@exemple.org", 'pw', membre=membre)
+
+
+class ResumeMembreTests(TestCase):
+    """Résumé de la page de détail d'un membre (services.membre_profile_summary)."""
+
+    def setUp(self):
+        self.membre = creer_membre("Resume", date(1985, 6, 1))
+        maintenant = timezone.now()
+        for type_transaction, montant, date_transaction in (
+            ('offrande', 100, maintenant),
+            ('don', 50, maintenant),
+            ('offrande', 30, maintenant - timedelta(days=400)),
+            ('depense', 999, maintenant),
+        ):
+            TransactionFinanciere.objects.create(
+                membre=self.membre, type_transaction=type_transaction, montant=montant,
+                date_transaction=date_transaction,
+                categorie_depense='autres' if type_transaction == 'depense' else None,
+            )
+        for statut in ('recu', 'recu', 'utilise'):
+            DonMateriel.objects.create(
+                membre=self.membre, description_objet="Chaises", date_don=maintenant, statut_don=statut,
+            )
+
+    def test_totaux(self):
+        resume = membre_profile_summary(self.membre.pk)
+        self.assertEqual(resume['nombre_transactions'], 4)
+        self.assertEqual(resume['total_contributions'], Decimal('180'))
+        self.assertEqual(resume['total_contributions_annee'], Decimal('150'))
+        self.assertEqual(resume['dons_par_statut']['total'], 3)
+        self.assertEqual(resume['dons_par_statut']['recu'], 2)
+        self.assertIsNone(resume['couple'])
+
+    def test_nombre_de_requetes_borne(self):
+        # Membre + rôles + groupes, deux agrégations, couple, dernières transactions et derniers dons
+        with self.assertNumQueries(8):
+            membre_profile_summary(self.membre.pk)
+        for numero in range(5):
+            TransactionFinanciere.objects.create(
+                membre=self.membre, type_transaction='offrande', montant=numero + 1,
+                date_transaction=timezone.now(),
+            )
+        with self.assertNumQueries(8):
+            membre_profile_summary(self.membre.pk)
+
+
+class FluxSynchronisationTests(TestCase):
+    """Flux de modifications incrémental (core.sync, sync_changes_view)."""
+
+    def setUp(self):
+        cache.clear()
+        self.membre = creer_membre("Flux", date(1990, 1, 1))
+        TransactionFinanciere.objects.create(
+            membre=self.membre, type_transaction='offrande', montant=10, date_transaction=timezone.now(),
+        )
+
+    def lire(self, modele, **params):
+        return self.client.get(reverse('sync_changes', args=[modele]), params)
+
+    def test_modeles_financiers_reserves(self):
+        self.client.force_login(creer_compte("Simple"))
+        self.assertEqual(self.lire('membre').status_code, 200)
+        self.assertEqual(self.lire('transaction').status_code, 403)
+        self.assertEqual(self.lire('don_materiel').status_code, 403)
+
+    def test_tresorier(self):
+        self.client.force_login(creer_compte("Caissier", 'tresorier'))
+        donnees = json.loads(self.lire('transaction').content)
+        self.assertEqual([ligne['membre_id'] for ligne in donnees['changes']['results']], [self.membre.pk])
+
+    def test_reprise_apres_curseur(self):
+        self.client.force_login(creer_compte("Lecteur"))
+        premiere = json.loads(self.lire('membre', limit=1).content)['changes']
+        self.assertTrue(premiere['has_more'])
+        suite = json.loads(self.lire('membre', **premiere['next']).content)['changes']
+        self.assertFalse(suite['has_more'])
+        self.assertNotIn(
+            premiere['results'][0]['id'], [ligne['id'] for ligne in suite['results']],
+        )
+
+
+class PresencesTests(TestCase):
+    """Pointage des présences et taux précalculés (calculer_taux_presence)."""
+
+    def setUp(self):
+        self.programme = ProgrammeEglise.objects.create(
+            titre="Culte", lieu="Grande salle", categorie='culte', date_debut=timezone.localdate(),
+        )
+        self.present = creer_membre("Present", date(1990, 1, 1))
+        self.absent = creer_membre("Absent", date(1990, 1, 2))
+        self.groupe_vide = Groupe.objects.create(nom_groupe="Chorale")
+        self.groupe = Groupe.objects.create(nom_groupe="Jeunesse")
+        MembreGroupe.objects.create(membre=self.present, groupe=self.groupe)
+        MembreGroupe.objects.create(membre=self.absent, groupe=self.groupe)
+
+    def pointer(self, *membres):
+        jour = timezone.localdate().isoformat()
+        return enregistrer_presences([
+            {'membre': membre.pk, 'programme': self.programme.pk, 'date': jour} for membre in membres
+        ])
+
+    def test_pointage_idempotent(self):
+        self.assertEqual(self.pointer(self.present, self.present), {'acceptees': 1, 'rejetees': 0})
+        self.pointer(self.present)
+        self.assertEqual(Presence.objects.count(), 1)
+        resultat = enregistrer_presences([
+            {'membre': 'x'}, {'membre': 0, 'programme': self.programme.pk, 'date': '2026-01-01'},
+        ])
+        self.assertEqual(resultat, {'acceptees': 0, 'rejetees': 2})
+
+    def test_taux_sans_presence_a_zero(self):
+        self.pointer(self.present)
+        call_command('calculer_taux_presence', stdout=StringIO())
+        taux = {
+            (statistique.portee, statistique.cle): statistique.taux
+            for statistique in StatistiquePresence.objects.all()
+        }
+        self.assertEqual(taux['membre', str(self.present.pk)], Decimal('100'))
+        self.assertEqual(taux['membre', str(self.absent.pk)], Decimal('0'))
+        self.assertEqual(taux['groupe', str(self.groupe.pk)], Decimal('50'))
+        self.assertEqual(taux['groupe', str(self.groupe_vide.pk)], Decimal('0'))
+        self.assertEqual(taux['categorie', 'culte'], Decimal('50'))
+
+
+class CompteursDirectTests(TestCase):
+    """Compteurs du tableau de bord : flux SSE sous ASGI, interrogation sous WSGI."""
+
+    def setUp(self):
+        self.compte = CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw')
+        creer_membre("Compteur", date(1990, 1, 1))
+
+    def test_flux_desactive_sous_wsgi(self):
+        self.client.force_login(self.compte)
+        self.assertEqual(self.client.get(reverse('dashboard_events')).status_code, 204)
+        page = self.client.get(reverse('dashboard'))
+        self.assertFalse(page.context['flux_direct'])
+        self.assertNotContains(page, reverse('dashboard_events'))
+        self.assertContains(page, reverse('dashboard_compteurs'))
+
+    def test_compteurs_json(self):
+        self.client.force_login(self.compte)
+        response = self.client.get(reverse('dashboard_compteurs'))
+        self.assertEqual(json.loads(response.content)['total_membres'], 1)
+        # Revalidation sans changement : 304
+        self.assertEqual(
+            self.client.get(reverse('dashboard_compteurs'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+
+    async def test_flux_sous_asgi(self):
+        await self.async_client.aforce_login(self.compte)
+        response = await self.async_client.get(reverse('dashboard_events'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        contenu = response.streaming_content
+        premier = await anext(contenu)
+        await contenu.aclose()
+        self.assertTrue(premier.startswith(b'event: snapshot'))
+
+
+class AnnuaireTests(TestCase):
+    """Annuaire compact des membres (core.directory)."""
+
+    def setUp(self):
+        cache.clear()
+        creer_membre("Durand", date(1990, 1, 1), sexe='M')
+        creer_membre("Dupont", date(1990, 1, 1), sexe='F')
+        creer_membre("Martin", date(1990, 1, 1), sexe='M', is_active=False)
+
+    def test_recherche_par_prefixe(self):
+        annuaire = get_annuaire()
+        self.assertEqual([entree.nom for entree in annuaire.prefixe("du")], ["Dupont", "Durand"])
+        self.assertEqual([entree.nom for entree in annuaire.prefixe("DUR")], ["Durand"])
+        self.assertEqual(annuaire.prefixe("z"), [])
+
+    def test_filtres(self):
+        annuaire = get_annuaire()
+        self.assertEqual([entree.nom for entree in annuaire.filtrer(sexe='M')], ["Durand", "Martin"])
+        self.assertEqual([entree.nom for entree in annuaire.filtrer(actifs_seulement=True)], ["Dupont", "Durand"])
+
+    def test_reconstruit_apres_modification(self):
+        annuaire = get_annuaire()
+        self.assertIs(get_annuaire(), annuaire)
+        with self.captureOnCommitCallbacks(execute=True):
+            creer_membre("Bernard", date(1990, 1, 1))
+        nouveau = get_annuaire()
+        self.assertIsNot(nouveau, annuaire)
+        self.assertEqual(len(nouveau), 4)
+
+
+class PaginationEstimeeTests(TestCase):
+    """Pagination des grandes listes sur un nombre de lignes estimé (core.paginators)."""
+
+    def setUp(self):
+        for numero in range(5):
+            creer_membre(f"Membre{numero}", date(1990, 1, 1))
+
+    def paginer(self, estimation):
+        paginator = EstimatedCountPaginator(Membre.objects.order_by('id'), 2)
+        paginator.seuil_estimation = 0
+        paginator._estimation = lambda: estimation
+        return paginator
+
+    def test_estimation_trop_haute(self):
+        paginator = self.paginer(20)
+        page = paginator.page(8)
+        self.assertEqual(page.number, 3)
+        self.assertEqual(len(page.object_list), 1)
+        self.assertEqual(paginator.count, 5)
+
+    def test_estimation_trop_basse(self):
+        page = self.paginer(2).page(3)
+        self.assertEqual((page.number, len(page.object_list)), (3, 1))
+
+    def test_liste_admin_ramenee_a_la_derniere_page(self):
+        self.client.force_login(CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw'))
+        with mock.patch.object(EstimatedCountPaginator, 'seuil_estimation', 0), \
+                mock.patch.object(EstimatedCountPaginator, '_estimation', return_value=1000):
+            response = self.client.get(reverse('admin:core_membre_changelist'), {'p': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].page_num, 1)
+        self.assertEqual(len(response.context['cl'].result_list), 5)
+
+
+class CacheComptesTests(TestCase):
+    """Résolution en cache de l'utilisateur de session (core.backends)."""
+
+    def setUp(self):
+        cache.clear()
+        self.compte = creer_compte("Session")
+        self.backend = CachedModelBackend()
+
+    def test_servi_depuis_le_cache(self):
+        self.assertEqual(self.backend.get_user(self.compte.pk), self.compte)
+        with self.assertNumQueries(0):
+            compte = self.backend.get_user(self.compte.pk)
+            self.assertEqual(compte.membre.nom, "Session")
+
+    def test_invalide_a_la_modification(self):
+        self.backend.get_user(self.compte.pk)
+        self.compte.is_active = False
+        self.compte.save()
+        self.assertIsNone(self.backend.get_user(self.compte.pk))
+
+    def test_invalide_a_la_modification_du_membre(self):
+        self.backend.get_user(self.compte.pk)
+        membre = self.compte.membre
+        membre.nom = "Renomme"
+        membre.save()
+        self.assertEqual(self.backend.get_user(self.compte.pk).membre.nom, "Renomme")
+
+    def test_connexion(self):
+        self.assertTrue(self.client.login(username='session', password='pw'))
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+
+
+class ModerationDemandesTests(TestCase):
+    """Approbation des demandes d'accès (services.approuver_demandes)."""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw'))
+        self.membre = creer_membre("Demandeur", date(1990, 1, 1))
+        self.demande = DemandeAcces.objects.create(
+            nom_complet="Test Demandeur", email="Demandeur@exemple.org", role_souhaite='administrateur',
+        )
+
+    def approuver(self, **donnees):
+        return self.client.post(reverse('demande_acces_moderation'), {
+            'action': 'approuver', 'demandes': [self.demande.pk], **donnees,
+        })
+
+    def roles(self):
+        return set(MembreRole.objects.filter(membre=self.membre).values_list('role__nom_role', flat=True))
+
+    def test_role_souhaite_jamais_attribue(self):
+        self.approuver()
+        compte = CompteUtilisateur.objects.get(username='demandeur@exemple.org')
+        self.assertEqual(compte.membre, self.membre)
+        self.assertEqual(self.roles(), set())
+
+    def test_role_choisi_par_le_moderateur(self):
+        Role.objects.get_or_create(nom_role='diacre')
+        self.approuver(**{f'role_{self.demande.pk}': 'diacre'})
+        self.assertEqual(self.roles(), {'diacre'})
+
+    def test_roles_sensibles_refuses(self):
+        Role.objects.get_or_create(nom_role='administrateur')
+        self.approuver(**{f'role_{self.demande.pk}': 'administrateur'})
+        self.assertEqual(self.roles(), set())
+        self.assertFalse(ROLES_APPROBATION & {'administrateur', 'pasteur', 'tresorier'})
+
+    def test_lien_d_activation_envoye_par_email(self):
+        response = self.approuver()
+        self.assertRedirects(response, reverse('demande_acces_moderation'))
+        compte = CompteUtilisateur.objects.get(username='demandeur@exemple.org')
+        self.assertFalse(compte.has_usable_password())
+        envoi = EnvoiNotification.objects.select_related('notification').get()
+        self.assertEqual(envoi.destinataire, 'demandeur@exemple.org')
+        lien = re.search(r'https?://\S+', envoi.notification.message).group()
+
+        self.client.logout()
+        formulaire = self.client.get(lien, follow=True)
+        self.assertTrue(formulaire.context['validlink'])
+        self.client.post(formulaire.redirect_chain[-1][0], {
+            'new_password1': 'Motdepasse-solide-42', 'new_password2': 'Motdepasse-solide-42',
+        })
+        self.assertTrue(self.client.login(username='demandeur@exemple.org', password='Motdepasse-solide-42'))
+        # Lien à usage unique
+        self.client.logout()
+        self.assertFalse(self.client.get(lien, follow=True).context['validlink'])
+
+
+class CacheRolesTests(TestCase):
+    """Rôles conservés en session et invalidation (core.permissions)."""
+
+    def setUp(self):
+        cache.clear()
+        self.compte = creer_compte("Benevole")
+        self.client.force_login(self.compte)
+
+    def acces_finances(self):
+        return self.client.get(reverse('transaction_list')).status_code
+
+    def test_attribution_de_role_prise_en_compte(self):
+        self.assertEqual(self.acces_finances(), 403)
+        with self.captureOnCommitCallbacks(execute=True):
+            MembreRole.objects.create(
+                membre=self.compte.membre, role=Role.objects.get_or_create(nom_role='tresorier')[0],
+            )
+        self.assertEqual(self.acces_finances(), 200)
+
+    def test_changement_de_membre_lie(self):
+        self.assertEqual(self.acces_finances(), 403)
+        tresorier = creer_compte("Tresorier", 'tresorier')
+        membre = tresorier.membre
+        tresorier.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.compte.membre = membre
+            self.compte.save()
+        self.assertEqual(self.acces_finances(), 200)
+
+    def test_connexion_ne_vide_pas_les_roles(self):
+        version = get_version('membre_role')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username='benevole', password='pw')
+        self.assertEqual(get_version('membre_role'), version)
+
+    @override_settings(RENDER_PROFILE='production')
+    def test_cache_par_processus_refuse_en_production(self):
+        self.assertEqual([erreur.id for erreur in verifier_cache_partage(None)], ['core.E001'])
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}):
+            self.assertEqual(verifier_cache_partage(None), [])
+        with override_settings(RENDER_PROFILE='dev'):
+            self.assertEqual(verifier_cache_partage(None), [])
+
+
+class FormulaireCoupleTests(TestCase):
+    """Listes de conjoints du formulaire de couple (services.options_conjoints)."""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw'))
+        creer_membre("Adam", date(1980, 1, 1), sexe='M')
+        creer_membre("Alice", date(1980, 1, 1), sexe='F')
+        self.mari = creer_membre("Zola", date(1980, 1, 1), sexe='M')
+        self.femme = creer_membre("Zoe", date(1980, 1, 1), sexe='F')
+        self.couple = Couple.objects.create(
+            membre_mari=self.mari, membre_femme=self.femme, statut_couple='marie',
+        )
+
+    @mock.patch('core.views.CONJOINTS_PAR_PAGE', 1)
+    def test_conjoints_actuels_dans_les_listes(self):
+        response = self.client.get(reverse('couple_update', args=[self.couple.pk]))
+        self.assertEqual([membre.nom for membre in response.context['membres_hommes']], ["Zola", "Adam"])
+        self.assertEqual([membre.nom for membre in response.context['membres_femmes']], ["Zoe", "Alice"])
+        self.assertContains(response, f'<option value="{self.mari.pk}" selected>', html=False)
+
+    @mock.patch('core.views.CONJOINTS_PAR_PAGE', 1)
+    def test_creation_sans_conjoints_deja_maries(self):
+        response = self.client.get(reverse('couple_create'))
+        self.assertEqual([membre.nom for membre in response.context['membres_hommes']], ["Adam"])
+
+    def test_membre_deja_en_couple_refuse(self):
+        adam = Membre.objects.get(nom="Adam")
+        erreurs = valider_conjoints(self.mari.pk, Membre.objects.get(nom="Alice").pk)
+        self.assertEqual(len(erreurs), 1)
+        self.assertEqual(valider_conjoints(adam.pk, self.femme.pk, self.couple), [])
+
+
+class AvancementProgrammesMariageTests(TestCase):
+    """Transitions de statut par lots des programmes de mariage (avancer_programmes_mariage)."""
+
+    def setUp(self):
+        self.couple = Couple.objects.create(
+            membre_mari=creer_membre("Epoux", date(1980, 1, 1), sexe='M'),
+            membre_femme=creer_membre("Epouse", date(1980, 1, 1), sexe='F'),
+            statut_couple='fiance',
+        )
+        maintenant = timezone.now()
+        self.programmes = {
+            nom: ProgrammeMariage.objects.create(
+                couple=self.couple, titre=nom, statut=statut,
+                date_debut=maintenant + timedelta(hours=debut), date_fin=maintenant + timedelta(hours=fin),
+            )
+            for nom, statut, debut, fin in (
+                ("Fini", 'planifie', -5, -4),
+                ("Fini en cours", 'en_cours', -3, -1),
+                ("Commence", 'planifie', -1, 2),
+                ("A venir", 'planifie', 24, 26),
+                ("Annule", 'annule', -5, -4),
+            )
+        }
+
+    def statuts(self):
+        return dict(ProgrammeMariage.objects.values_list('titre', 'statut'))
+
+    def test_transitions(self):
+        avant = ProgrammeMariage.objects.get(titre="Fini").updated_at
+        call_command('avancer_programmes_mariage', '--taille-lot', '1', stdout=StringIO())
+        self.assertEqual(self.statuts(), {
+            "Fini": 'termine', "Fini en cours": 'termine', "Commence": 'en_cours',
+            "A venir": 'planifie', "Annule": 'annule',
+        })
+        # updated_at avancé pour le flux de synchronisation
+        self.assertGreater(ProgrammeMariage.objects.get(titre="Fini").updated_at, avant)
+
+    def test_idempotent(self):
+        call_command('avancer_programmes_mariage', stdout=StringIO())
+        sortie = StringIO()
+        call_command('avancer_programmes_mariage', stdout=sortie)
+        self.assertIn("0 programme(s) terminé(s), 0 programme(s) passé(s) en cours", sortie.getvalue())
+
+
+class InventaireDonsTests(TestCase):
+    """Inventaire et recherche des dons matériels (services.inventaire_dons, rechercher_dons)."""
+
+    def setUp(self):
+        self.genereux = creer_membre("Genereux", date(1980, 1, 1))
+        self.modeste = creer_membre("Modeste", date(1980, 1, 1))
+        maintenant = timezone.now()
+        for membre, description, valeur, statut, jours in (
+            (self.genereux, "Chaises pliantes", 300, 'recu', 0),
+            (self.genereux, "Sonorisation", 700, 'utilise', 0),
+            (self.modeste, "Nappes", 50, 'recu', 0),
+            (self.modeste, "Cantiques", None, 'recu', 70),
+        ):
+            DonMateriel.objects.create(
+                membre=membre, description_objet=description, valeur_estimee=valeur, statut_don=statut,
+                date_don=maintenant - timedelta(days=jours),
+            )
+
+    def test_totaux(self):
+        inventaire = inventaire_dons()
+        par_statut = {statut['statut']: statut for statut in inventaire['par_statut']}
+        self.assertEqual((par_statut['recu']['nombre'], par_statut['recu']['valeur']), (3, Decimal('350')))
+        self.assertEqual(par_statut['utilise']['valeur'], Decimal('700'))
+        self.assertEqual((inventaire['total_nombre'], inventaire['total_valeur']), (4, Decimal('1050')))
+        self.assertEqual(sum(mois['nombre'] for mois in inventaire['par_mois']), 4)
+        self.assertEqual(
+            [donateur['membre_id'] for donateur in inventaire['top_donateurs']], [self.genereux.pk, self.modeste.pk]
+        )
+
+    def test_recherche(self):
+        resultats = rechercher_dons(DonMateriel.objects.all(), "chaises")
+        self.assertEqual([don.description_objet for don in resultats], ["Chaises pliantes"])
+
+    def test_liste_reservee_aux_finances(self):
+        cache.clear()
+        self.client.force_login(creer_compte("Simple"))
+        self.assertEqual(self.client.get(reverse('don_materiel_list')).status_code, 403)
+        self.client.force_login(creer_compte("Caissier", 'tresorier'))
+        response = self.client.get(reverse('don_materiel_list'), {'statut': 'recu'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['page_obj'].object_list), 3)
+
+
+class MembresGroupeLotTests(TestCase):
+    """Ajout, retrait et transfert de membres par lot (groupes)."""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(creer_compte("Berger", 'pasteur'))
+        self.source = Groupe.objects.create(nom_groupe="Chorale")
+        self.cible = Groupe.objects.create(nom_groupe="Jeunesse")
+        self.membres = [creer_membre(f"Choriste{numero}", date(1990, 1, 1)) for numero in range(3)]
+
+    def envoyer(self, nom, groupe, **donnees):
+        return self.client.post(
+            reverse(nom, args=[groupe.pk]), json.dumps(donnees), content_type='application/json',
+        )
+
+    def ids(self, groupe):
+        return set(MembreGroupe.objects.filter(groupe=groupe).values_list('membre_id', flat=True))
+
+    def test_ajout_idempotent(self):
+        ids = [membre.pk for membre in self.membres]
+        resultat = json.loads(self.envoyer('groupe_membres_ajouter', self.source, membres=ids + ['x', 0]).content)
+        self.assertEqual(resultat, {'ajoutes': 3, 'ignores': 1})
+        resultat = json.loads(self.envoyer('groupe_membres_ajouter', self.source, membres=ids).content)
+        self.assertEqual(resultat, {'ajoutes': 0, 'ignores': 3})
+
+    def test_retrait_avec_traces_de_suppression(self):
+        self.envoyer('groupe_membres_ajouter', self.source, membres=[membre.pk for membre in self.membres])
+        pks = set(MembreGroupe.objects.filter(membre=self.membres[0]).values_list('pk', flat=True))
+        resultat = json.loads(self.envoyer('groupe_membres_retirer', self.source, membres=[self.membres[0].pk]).content)
+        self.assertEqual(resultat, {'retires': 1})
+        self.assertEqual(self.ids(self.source), {self.membres[1].pk, self.membres[2].pk})
+        self.assertEqual(
+            set(Suppression.objects.filter(modele='membre_groupe').values_list('objet_id', flat=True)), pks
+        )
+
+    def test_transfert(self):
+        self.envoyer('groupe_membres_ajouter', self.source, membres=[membre.pk for membre in self.membres])
+        self.envoyer('groupe_membres_ajouter', self.cible, membres=[self.membres[0].pk])
+        resultat = json.loads(self.envoyer(
+            'groupe_membres_transferer', self.source,
+            membres=[self.membres[0].pk, self.membres[1].pk], groupe_cible=self.cible.pk,
+        ).content)
+        self.assertEqual(resultat, {'transferes': 2, 'deja_dans_cible': 1})
+        self.assertEqual(self.ids(self.source), {self.membres[2].pk})
+        self.assertEqual(self.ids(self.cible), {self.membres[0].pk, self.membres[1].pk})
+
+    def test_reserve_aux_pasteurs(self):
+        self.client.force_login(creer_compte("Simple"))
+        response = self.envoyer('groupe_membres_ajouter', self.source, membres=[self.membres[0].pk])
+        self.assertEqual(response.status_code, 403)
+
+
+class LimitationConnexionTests(TestCase):
+    """Limitation de débit des tentatives de connexion (core.ratelimit)."""
+
+    def setUp(self):
+        cache.clear()
+
+    def tenter(self, username='inconnu'):
+        return self.client.post(reverse('login'), {'username': username, 'password': 'mauvais'})
+
+    def test_sixieme_tentative_refusee(self):
+        for _ in range(5):
+            self.assertEqual(self.tenter().status_code, 200)
+        self.assertEqual(self.tenter().status_code, 429)
+
+    def test_limite_par_utilisateur(self):
+        for _ in range(5):
+            self.tenter('alice')
+        self.assertEqual(self.tenter('alice').status_code, 429)
+        self.assertEqual(self.tenter('bob').status_code, 200)
+
+    def test_fenetre_reinitialisee(self):
+        debut = time.time()
+        with mock.patch('core.ratelimit.time.time', return_value=debut):
+            for _ in range(5):
+                self.tenter()
+            self.assertEqual(self.tenter().status_code, 429)
+        # Deux fenêtres plus tard, courante et précédente sont vides
+        with mock.patch('core.ratelimit.time.time', return_value=debut + 2 * 300):
+            self.assertEqual(self.tenter().status_code, 200)
+
+
+class ConflitsLieuxTests(TestCase):
+    """Détection des doubles réservations de lieux (core.planning)."""
+
+    def setUp(self):
+        ProgrammeEglise.objects.create(
+            titre="Culte", lieu="Grande salle", categorie='culte',
+            date_debut=date(2026, 3, 1), heure_debut=dt_time(9), heure_fin=dt_time(11),
+        )
+        ProgrammeEglise.objects.create(
+            titre="Prière du mercredi", lieu="Chapelle", categorie='reunion_priere', recurrence='weekly',
+            date_debut=date(2026, 3, 4), heure_debut=dt_time(18), heure_fin=dt_time(19),
+        )
+
+    def moment(self, jour, heure):
+        return timezone.make_aware(datetime.combine(jour, dt_time(heure)))
+
+    def test_intervalles_contigus_sans_conflit(self):
+        jour = date(2026, 3, 1)
+        self.assertEqual(conflits("Grande salle", self.moment(jour, 11), self.moment(jour, 12)), [])
+        self.assertEqual(conflits("Grande salle", self.moment(jour, 7), self.moment(jour, 9)), [])
+
+    def test_chevauchement_detecte(self):
+        jour = date(2026, 3, 1)
+        resultat = conflits("Grande salle", self.moment(jour, 10), self.moment(jour, 12))
+        self.assertEqual([reservation.titre for reservation in resultat], ["Culte"])
+
+    def test_occurrence_recurrente_en_conflit(self):
+        # Cinquième mercredi après la première occurrence
+        jour = date(2026, 4, 8)
+        resultat = conflits("Chapelle", self.moment(jour, 18), self.moment(jour, 20))
+        self.assertEqual(len(resultat), 1)
+        self.assertEqual(resultat[0].debut, self.moment(jour, 18))
+
+    def test_occurrence_recurrente_contigue(self):
+        jour = date(2026, 4, 8)
+        self.assertEqual(conflits("Chapelle", self.moment(jour, 19), self.moment(jour, 21)), [])
+        # Jeudi : aucune occurrence
+        jeudi = jour + timedelta(days=1)
+        self.assertEqual(conflits("Chapelle", self.moment(jeudi, 18), self.moment(jeudi, 19)), [])
+
+
+class AnniversairesTests(TestCase):
+    """Rappels d'anniversaires sur les colonnes MMJJ (core.rappels)."""
+
+    def test_passage_de_l_annee(self):
+        creer_membre("Decembre", date(1990, 12, 30))
+        creer_membre("Janvier", date(1985, 1, 3))
+        creer_membre("Tard", date(1990, 1, 10))
+        rappels = anniversaires_a_venir(jours=14, aujourd_hui=date(2026, 12, 25))
+        self.assertEqual(
+            [(rappel.libelle, rappel.date, rappel.jours_restants, rappel.annees) for rappel in rappels],
+            [("Test Decembre", date(2026, 12, 30), 5, 36), ("Test Janvier", date(2027, 1, 3), 9, 42)],
+        )
+
+    def test_29_fevrier_annee_non_bissextile(self):
+        creer_membre("Bissextile", date(2000, 2, 29))
+        rappels = anniversaires_a_venir(jours=14, aujourd_hui=date(2027, 2, 20))
+        self.assertEqual([(rappel.date, rappel.annees) for rappel in rappels], [(date(2027, 2, 28), 27)])
+        # Période se terminant le 28 février : le 29 y est rattaché
+        rappels = anniversaires_a_venir(jours=14, aujourd_hui=date(2027, 2, 15))
+        self.assertEqual([rappel.date for rappel in rappels], [date(2027, 2, 28)])
+        # Année bissextile : fêté le 29
+        rappels = anniversaires_a_venir(jours=14, aujourd_hui=date(2028, 2, 20))
+        self.assertEqual([rappel.date for rappel in rappels], [date(2028, 2, 29)])
+
+    def test_membres_inactifs_ignores(self):
+        creer_membre("Inactif", date(1990, 6, 2), is_active=False)
+        self.assertEqual(anniversaires_a_venir(jours=7, aujourd_hui=date(2026, 6, 1)), [])
+
+
+class DesactivationMembresTests(TestCase):
+    """Suppression douce et archivage des membres (membre_delete_view, core.archives)."""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw'))
+        self.membre = creer_membre("Partant", date(1970, 1, 1))
+        TransactionFinanciere.objects.create(
+            membre=self.membre, type_transaction='don', montant=20, date_transaction=timezone.now() - timedelta(days=900),
+        )
+
+    def test_confirmation(self):
+        response = self.client.get(reverse('membre_delete', args=[self.membre.pk]))
+        self.assertContains(response, "Désactiver le membre")
+        self.assertNotContains(response, "irréversible")
+
+    def test_desactivation_conserve_le_membre(self):
+        self.client.post(reverse('membre_delete', args=[self.membre.pk]))
+        self.assertFalse(Membre.objects.filter(pk=self.membre.pk).exists())
+        self.assertFalse(Membre.tous.get(pk=self.membre.pk).is_active)
+        self.assertEqual(self.membre.transactions.count(), 1)
+
+    def test_archivage_apres_delai(self):
+        Membre.tous.filter(pk=self.membre.pk).update(
+            is_active=False, updated_at=timezone.now() - timedelta(days=800),
+        )
+        actif = creer_membre("Actif", date(1970, 1, 1))
+        call_command('archiver_membres', stdout=StringIO())
+        self.assertFalse(Membre.tous.filter(pk=self.membre.pk).exists())
+        archive = MembreArchive.objects.get(pk=self.membre.pk)
+        self.assertEqual(archive.transactions.count(), 1)
+        self.assertTrue(Membre.objects.filter(pk=actif.pk).exists())
+
+
+class SmsEnEchecBackend(BaseNotificationBackend):
+    def send(self, notification, destinataire):
+        raise ConnectionError("Fournisseur indisponible")
+
+
+@override_settings(NOTIFICATIONS={
+    'backends': {'sms': 'core.tests.SmsEnEchecBackend'},
+    'debit': {'sms': 0}, 'concurrence': 1, 'taille_lot': 10, 'tentatives_max': 3, 'delai_reessai': 60,
+})
+class ReessaiNotificationsTests(TestCase):
+    """Nouvelles tentatives des envois en échec (core.notifications)."""
+
+    def setUp(self):
+        notification = Notification.objects.create(canal='sms', message="Réunion ce soir")
+        self.envoi = EnvoiNotification.objects.create(notification=notification, destinataire="+22990000000")
+
+    def test_echec_differe_avec_delai_croissant(self):
+        debut = timezone.now()
+        distribuer_lot(reserver_lot(10))
+        self.envoi.refresh_from_db()
+        self.assertEqual((self.envoi.statut, self.envoi.tentatives), ('en_attente', 1))
+        # Pas repris dans la même passe
+        self.assertEqual(reserver_lot(10), [])
+
+        with mock.patch('core.notifications.timezone.now', return_value=debut + timedelta(seconds=61)):
+            distribuer_lot(reserver_lot(10))
+        self.envoi.refresh_from_db()
+        self.assertEqual(self.envoi.tentatives, 2)
+        self.assertGreaterEqual(self.envoi.prochain_essai - (debut + timedelta(seconds=61)), timedelta(seconds=120))
+
+    def test_echec_definitif(self):
+        EnvoiNotification.objects.filter(pk=self.envoi.pk).update(tentatives=2)
+        resultat = distribuer_lot(reserver_lot(10))
+        self.envoi.refresh_from_db()
+        self.assertEqual(resultat['echecs'], 1)
+        self.assertEqual(self.envoi.statut, 'echec')
+        self.assertIsNone(self.envoi.prochain_essai)
+
+
+@mock.patch('core.routers.alias_replica', return_value='replica')
+class RepliqueLectureTests(TestCase):
+    """Routage des vues de rapport vers la réplique et primaire collant (core.routers)."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def appeler(self, request, vue):
+        return PrimaireCollanteMiddleware(lecture_replica(vue))(request)
+
+    def test_lecture_sur_replica(self, _alias):
+        bases = []
+        self.appeler(RequestFactory().get('/'), lambda request: bases.append(self.router.db_for_read(Membre)) or HttpResponse())
+        self.assertEqual(bases, ['replica'])
+        # Hors vue de rapport, le routeur laisse Django choisir (default)
+        self.assertIsNone(self.router.db_for_read(Membre))
+
+    def test_ecriture_bascule_sur_primaire(self, _alias):
+        bases = []
+
+        def vue(request):
+            self.router.db_for_write(Membre)
+            bases.append(self.router.db_for_read(Membre))
+            return HttpResponse()
+        response = self.appeler(RequestFactory().get('/'), vue)
+        self.assertEqual(bases, ['default'])
+        self.assertIn(COOKIE_PRIMAIRE, response.cookies)
+
+    def test_cookie_primaire_collant(self, _alias):
+        bases = []
+
+        def vue(request):
+            bases.append(self.router.db_for_read(Membre))
+            return HttpResponse()
+        response = self.appeler(RequestFactory().post('/'), vue)
+        self.assertIn(COOKIE_PRIMAIRE, response.cookies)
+        request = RequestFactory().get('/')
+        request.COOKIES[COOKIE_PRIMAIRE] = response.cookies[COOKIE_PRIMAIRE].value
+        self.appeler(request, vue)
+        request = RequestFactory().get('/')
+        request.COOKIES[COOKIE_PRIMAIRE] = str(time.time() - 1)
+        self.appeler(request, vue)
+        self.assertEqual(bases, ['replica', 'default', 'replica'])
+
+    def test_sans_replica(self, alias):
+        alias.return_value = None
+        bases = []
+        self.appeler(RequestFactory().get('/'), lambda request: bases.append(self.router.db_for_read(Membre)) or HttpResponse())
+        self.assertEqual(bases, ['default'])
+
+
+class CssConstruitTests(TestCase):
+    """Vérification système du CSS Tailwind construit (core.checks)."""
+
+    @override_settings(TAILWIND_CDN=False)
+    def test_css_absent(self):
+        with mock.patch('core.checks.finders.find', return_value=None):
+            self.assertEqual([erreur.id for erreur in verifier_css_construit(None)], ['core.E002'])
+
+    @override_settings(TAILWIND_CDN=False)
+    def test_css_construit(self):
+        with mock.patch('core.checks.finders.find', return_value='/static/core/css/tailwind.css'):
+            self.assertEqual(verifier_css_construit(None), [])
+
+    @override_settings(TAILWIND_CDN=True)
+    def test_cdn(self):
+        with mock.patch('core.checks.finders.find', return_value=None):
+            self.assertEqual(verifier_css_construit(None), [])
+
+    @override_settings(TAILWIND_CDN=False, TAILWIND_CSS='core/css/tailwind.css')
+    def test_balise_fichier_construit(self):
+        response = self.client.get(reverse('login'))
+        self.assertContains(response, 'core/css/tailwind.css')
+        self.assertNotContains(response, 'cdn.tailwindcss.com')
+
+
+class RessourcesVendoriseesTests(TestCase):
+    """Vérification système des bibliothèques front-end vendorisées (core.checks)."""
+
+    @override_settings(RENDER_PROFILE='production')
+    def test_bibliotheque_manquante(self):
+        with mock.patch('core.checks.finders.find', side_effect=lambda chemin: None if 'tippy' in chemin else chemin):
+            erreurs = verifier_ressources_vendorisees(None)
+        self.assertEqual([erreur.id for erreur in erreurs], ['core.E003'])
+        self.assertIn('tippy', erreurs[0].msg)
+        self.assertNotIn('popper', erreurs[0].msg)
+
+    @override_settings(RENDER_PROFILE='production')
+    def test_toutes_vendorisees(self):
+        with mock.patch('core.checks.finders.find', side_effect=lambda chemin: chemin):
+            self.assertEqual(verifier_ressources_vendorisees(None), [])
+
+    @override_settings(RENDER_PROFILE='dev')
+    def test_repli_cdn_en_developpement(self):
+        with mock.patch('core.checks.finders.find', return_value=None):
+            self.assertEqual(verifier_ressources_vendorisees(None), [])
+
+
+class FauxBrotli:
+    @staticmethod
+    def compress(contenu, quality=None):
+        return b'br' + contenu[:10]
+
+
+class CompressionTests(TestCase):
+    """Compression des réponses (core.compression)."""
+
+    def compresser(self, response, accept_encoding='gzip, deflate, br'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def html(self):
+        return HttpResponse('<html>' + 'Bonjour ' * 100 + '</html>')
+
+    def test_html_gzip(self):
+        response = self.compresser(self.html())
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    @mock.patch('core.compression.brotli', FauxBrotli)
+    def test_html_jamais_en_brotli(self):
+        # Le HTML porte le jeton CSRF : gzip avec remplissage aléatoire, même si brotli est accepté
+        response = self.compresser(self.html())
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    @mock.patch('core.compression.brotli', FauxBrotli)
+    def test_json_brotli(self):
+        response = self.compresser(JsonResponse({'donnees': ['valeur'] * 100}))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        response = self.compresser(JsonResponse({'donnees': ['valeur'] * 100}), accept_encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_autres_types_non_compresses(self):
+        response = self.compresser(HttpResponse(b'x' * 1000, content_type='text/event-stream'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class ApiParametresTests(TestCase):
+    """Validation des paramètres de lecture de l'API JSON (core.api)."""
+
+    def setUp(self):
+        compte = CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw')
+        self.client.force_login(compte)
+        for nom in ("Alpha", "Beta", "Gamma"):
+            creer_membre(nom, date(1990, 1, 1))
+
+    def lire(self, ressource, **params):
+        return self.client.get(reverse('api_liste', args=[ressource]), params)
+
+    def test_filtre_invalide(self):
+        response = self.lire('transaction', membre_id='abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('membre_id', json.loads(response.content)['error'])
+
+    def test_filtre_ou_champ_inconnu(self):
+        self.assertEqual(self.lire('membre', mot_de_passe='x').status_code, 400)
+        self.assertEqual(self.lire('membre', fields='id,mot_de_passe').status_code, 400)
+
+    def test_curseur_invalide(self):
+        self.assertEqual(self.lire('membre', cursor='!!!').status_code, 400)
+        trop_grand = base64.urlsafe_b64encode(str(10 ** 30).encode()).decode().rstrip('=')
+        self.assertEqual(self.lire('membre', cursor=trop_grand).status_code, 400)
+        self.assertEqual(self.lire('membre', limit='deux').status_code, 400)
+
+    def test_pagination_par_curseur(self):
+        premiere = json.loads(self.lire('membre', fields='id,nom', limit=2).content)
+        self.assertEqual([ligne['nom'] for ligne in premiere['data']], ["Alpha", "Beta"])
+        suite = json.loads(self.lire('membre', fields='id,nom', limit=2, cursor=premiere['next']).content)
+        self.assertEqual([ligne['nom'] for ligne in suite['data']], ["Gamma"])
+        self.assertIsNone(suite['next'])
+
+    def test_filtre_valide(self):
+        membre = Membre.objects.get(nom="Beta")
+        response = self.lire('transaction', membre_id=str(membre.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['data'], [])
+
+
+class ApiCouplesTests(TestCase):
+    """Écriture des couples par l'API JSON : mêmes règles que le formulaire (core.api)."""
+
+    def setUp(self):
+        self.client.force_login(CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw'))
+        self.mari = creer_membre("Mari", date(1990, 1, 1), sexe='M')
+        self.femme = creer_membre("Femme", date(1990, 1, 1), sexe='F')
+
+    def ecrire(self, methode, donnees, pk=None):
+        url = reverse('api_detail', args=['couple', pk]) if pk else reverse('api_liste', args=['couple'])
+        return getattr(self.client, methode)(url, json.dumps(donnees), content_type='application/json')
+
+    def test_conjoints_invalides(self):
+        autre = creer_membre("Autre", date(1990, 1, 1), sexe='M', is_active=False)
+        response = self.ecrire('post', {
+            'membre_mari_id': autre.pk, 'membre_femme_id': self.mari.pk, 'statut_couple': 'fiance',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(json.loads(response.content)['details']), 2)
+        self.assertFalse(Couple.tous.exists())
+
+    def test_conjoint_deja_en_couple(self):
+        Couple.objects.create(membre_mari=self.mari, membre_femme=self.femme, statut_couple='marie')
+        seconde = creer_membre("Seconde", date(1990, 1, 1), sexe='F')
+        response = self.ecrire('post', {
+            'membre_mari_id': self.mari.pk, 'membre_femme_id': seconde.pk, 'statut_couple': 'fiance',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("couple actif", json.loads(response.content)['details'][0])
+
+    def test_modification_avec_programme_actif(self):
+        couple = Couple.objects.create(membre_mari=self.mari, membre_femme=self.femme, statut_couple='fiance')
+        ProgrammeMariage.objects.create(
+            couple=couple, titre="Mariage", date_debut=timezone.now() + timedelta(days=30),
+            date_fin=timezone.now() + timedelta(days=30, hours=3),
+        )
+        response = self.ecrire('patch', {'statut_couple': 'marie'}, pk=couple.pk)
+        self.assertEqual(response.status_code, 200)
+        couple.refresh_from_db()
+        self.assertEqual(couple.statut_couple, 'marie')
+
+    def test_desactivation_refusee_avec_programme_actif(self):
+        couple = Couple.objects.create(membre_mari=self.mari, membre_femme=self.femme, statut_couple='fiance')
+        programme = ProgrammeMariage.objects.create(
+            couple=couple, titre="Mariage", date_debut=timezone.now() + timedelta(days=30),
+            date_fin=timezone.now() + timedelta(days=30, hours=3),
+        )
+        response = self.client.delete(reverse('api_detail', args=['couple', couple.pk]))
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(Couple.objects.filter(pk=couple.pk).exists())
+
+        programme.statut = 'annule'
+        programme.save()
+        response = self.client.delete(reverse('api_detail', args=['couple', couple.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Couple.objects.filter(pk=couple.pk).exists())
+
+
+class MembresLotTests(TestCase):
+    """Modification par lot des membres (membre_lot_view, services.modifier_membres_lot)."""
+
+    def setUp(self):
+        cache.clear()
+        self.compte = creer_compte("Berger", 'pasteur')
+        self.client.force_login(self.compte)
+        self.membres = [
+            creer_membre(f"Fidele{numero}", date(1990, 1, 1), statut_baptismal='non_baptise') for numero in range(3)
+        ]
+        self.membres[0].statut_baptismal = 'baptise_eglise'
+        self.membres[0].save()
+
+    def envoyer(self, **donnees):
+        return self.client.post(reverse('membre_lot'), json.dumps(donnees), content_type='application/json')
+
+    def test_modification_et_journal(self):
+        ids = [membre.pk for membre in self.membres]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.envoyer(membres=ids + ['x'], changements={'statut_baptismal': 'baptise_eglise'})
+        resultat = json.loads(response.content)
+        self.assertEqual((resultat['modifies'], resultat['inchanges']), (2, 1))
+        self.assertEqual(Membre.objects.filter(statut_baptismal='baptise_eglise').count(), 3)
+        entrees = JournalAudit.objects.filter(lot=resultat['lot'])
+        self.assertEqual({entree.objet_id for entree in entrees}, set(ids[1:]))
+        self.assertEqual(entrees[0].changements, {'statut_baptismal': ['non_baptise', 'baptise_eglise']})
+        self.assertEqual(entrees[0].auteur, self.compte)
+
+    def test_desactivation_par_lot(self):
+        self.envoyer(membres=[self.membres[1].pk], changements={'is_active': False})
+        self.assertFalse(Membre.objects.filter(pk=self.membres[1].pk).exists())
+        self.assertTrue(Membre.tous.filter(pk=self.membres[1].pk).exists())
+
+    def test_changements_invalides(self):
+        ids = [membre.pk for membre in self.membres]
+        for changements in ({'nom': 'X'}, {'statut_baptismal': 'inconnu'}, {'date_adhesion': 'hier'}, {}):
+            response = self.envoyer(membres=ids, changements=changements)
+            self.assertEqual(response.status_code, 400, changements)
+        self.assertEqual(self.envoyer(membres=[], changements={'is_active': False}).status_code, 400)
+        self.assertFalse(JournalAudit.objects.exists())
+
+    def test_reserve_au_pasteur(self):
+        self.client.force_login(creer_compte("Fidele", 'diacre'))
+        response = self.envoyer(membres=[self.membres[1].pk], changements={'is_active': False})
+        self.assertNotEqual(response.status_code, 200)
+        self.assertTrue(Membre.objects.filter(pk=self.membres[1].pk).exists())
+
+    def test_formulaire_retour_liste(self):
+        response = self.client.post(reverse('membre_lot'), {
+            'membres': [self.membres[1].pk], 'statut_baptismal': 'baptise_autre_eglise', 'next': 'https://ailleurs.example/',
+        })
+        self.assertRedirects(response, reverse('membre_list'), fetch_redirect_response=False)
+        self.membres[1].refresh_from_db()
+        self.assertEqual(self.membres[1].statut_baptismal, 'baptise_autre_eglise')
+
+
+class JournalAuditTests(TransactionTestCase):
+    """Journal d'audit (core.audit) ; les entrées sont écrites après validation, d'où TransactionTestCase."""
+
+    def setUp(self):
+        cache.clear()
+        self.compte = CompteUtilisateur.objects.create_superuser('admin', 'admin@exemple.org', 'pw')
+        self.membre = creer_membre("Audit", date(1990, 5, 17))
+
+    def test_creation(self):
+        entree = JournalAudit.objects.get(modele='membre', objet_id=self.membre.pk)
+        self.assertEqual(entree.action, 'creation')
+        self.assertEqual(entree.changements['nom'], [None, "Audit"])
+
+    def test_seuls_les_champs_modifies(self):
+        self.membre.adresse = "2 avenue de la Paix"
+        self.membre.save()
+        entree = JournalAudit.objects.filter(modele='membre', action='modification').get()
+        self.assertEqual(entree.changements, {'adresse': ["1 rue de l'Église", "2 avenue de la Paix"]})
+
+    def test_sauvegarde_sans_changement_non_journalisee(self):
+        self.membre.save()
+        self.assertFalse(JournalAudit.objects.filter(action='modification').exists())
+
+    def test_ecriture_annulee_non_journalisee(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.membre.adresse = "Annulée"
+            self.membre.save()
+            raise RuntimeError
+        self.assertFalse(JournalAudit.objects.filter(action='modification').exists())
+
+    def test_suppression(self):
+        pk = self.membre.pk
+        self.membre.delete()
+        entree = JournalAudit.objects.get(modele='membre', objet_id=pk, action='suppression')
+        self.assertEqual(entree.changements['nom'], ["Audit", None])
+
+    def test_requete_un_seul_insert_avec_auteur(self):
+        self.client.force_login(self.compte)
+        response = self.client.patch(
+            reverse('api_detail', args=['membre', self.membre.pk]),
+            json.dumps({'adresse': "3 place du Marché", 'statut_baptismal': 'baptise_eglise'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        entree = JournalAudit.objects.filter(modele='membre', action='modification').get()
+        self.assertEqual(set(entree.changements), {'adresse', 'statut_baptismal'})
+        self.assertEqual(entree.auteur_id, self.compte.pk)
+
+    def test_action_admin_journalisee(self):
+        autre = creer_membre("Second", date(1992, 3, 3))
+        self.client.force_login(self.compte)
+        self.client.post(reverse('admin:core_membre_changelist'), {
+            'action': 'desactiver_membres', '_selected_action': [self.membre.pk, autre.pk],
+        })
+        self.assertEqual(Membre.tous.filter(is_active=False).count(), 2)
+        entrees = JournalAudit.objects.filter(modele='membre', action='modification')
+        self.assertEqual(entrees.count(), 2)
+        for entree in entrees:
+            self.assertEqual(entree.changements, {'is_active': [True, False]})
+            self.assertEqual(entree.auteur_id, self.compte.pk)
+
+    def test_action_admin_dons_journalisee(self):
+        don = DonMateriel.objects.create(
+            membre=self.membre, description_objet="Chaises", valeur_estimee=100, date_don=timezone.now(),
+        )
+        self.client.force_login(self.compte)
+        self.client.post(reverse('admin:core_donmateriel_changelist'), {
+            'action': 'marquer_utilises', '_selected_action': [don.pk],
+        })
+        entree = JournalAudit.objects.get(modele='don_materiel', objet_id=don.pk)
+        self.assertEqual(entree.changements, {'statut_don': [don.statut_don, 'utilise']})
+
+
+class CurseurEnregistreur:
+    """Curseur factice qui note les requêtes ; `reponses` donne le résultat des SELECT successifs."""
+
+    def __init__(self, reponses):
+        self.reponses = list(reponses)
+        self.requetes = []
+
+    def execute(self, sql, params=None):
+        self.requetes.append(sql)
+
+    def fetchone(self):
+        return self.reponses.pop(0)
+
+
+class PartitionsJournalTests(TestCase):
+    """Création des partitions mensuelles du journal d'audit (core.audit)."""
+
+    def test_sans_partitionnement_sous_sqlite(self):
+        sortie = StringIO()
+        call_command('partitions_journal', stdout=sortie)
+        self.assertIn("rien à faire", sortie.getvalue())
+
+    def test_partition_simple(self):
+        curseur = CurseurEnregistreur([(1,), (False,)])
+        _creer_partition_postgresql(curseur, 'core_journalaudit_p202611', date(2026, 11, 1), date(2026, 12, 1))
+        self.assertTrue(curseur.requetes[-1].startswith("CREATE TABLE core_journalaudit_p202611 PARTITION OF"))
+        self.assertFalse(any('DETACH' in requete for requete in curseur.requetes))
+
+    def test_lignes_deplacees_depuis_la_partition_par_defaut(self):
+        curseur = CurseurEnregistreur([(1,), (True,)])
+        _creer_partition_postgresql(curseur, 'core_journalaudit_p202611', date(2026, 11, 1), date(2026, 12, 1))
+        requetes = [requete.split(' (')[0] for requete in curseur.requetes[2:]]
+        self.assertEqual(requetes, [
+            "ALTER TABLE core_journalaudit DETACH PARTITION core_journalaudit_defaut",
+            "ALTER TABLE core_journalaudit_defaut RENAME TO core_journalaudit_defaut_ancien",
+            "CREATE TABLE core_journalaudit_p202611 PARTITION OF core_journalaudit FOR VALUES FROM",
+            "CREATE TABLE core_journalaudit_defaut PARTITION OF core_journalaudit DEFAULT",
+            "INSERT INTO core_journalaudit SELECT * FROM core_journalaudit_defaut_ancien",
+            "DROP TABLE core_journalaudit_defaut_ancien",
+        ])
+        self.assertFalse(any(requete.startswith(('DELETE', 'UPDATE')) for requete in curseur.requetes))
@@ -6,7 +6,8 @@
 # ]
 
 # urls.py
-from django.urls import path
+from django.contrib.auth import views as auth_views
+from django.urls import path, reverse_lazy
 from . import views
 
 urlpatterns = [
@@ -15,8 +16,14 @@ urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('demande-acces/', views.request_access, name='requestAccess'),
+    path('demandes-acces/moderation/', views.demande_acces_moderation_view, name='demande_acces_moderation'),
+    path('compte/activer/<uidb64>/<token>/', auth_views.PasswordResetConfirmView.as_view(
+        template_name='core/definir_mot_de_passe.html', success_url=reverse_lazy('login'),
+    ), name='activer_compte'),
     # Dashboard
     path('dashboard/', views.dashboard_view, name='dashboard'),
+    path('dashboard/evenements/', views.dashboard_events_view, name='dashboard_events'),
+    path('dashboard/compteurs/', views.dashboard_compteurs_view, name='dashboard_compteurs'),
     
     # Membres
     path('membres/', views.membre_list_view, name='membre_list'),
@@ -25,6 +32,7 @@ urlpatterns = [
     path('membres/<int:pk>/modifier/', views.membre_update_view, name='membre_update'),
     path('membres/<int:pk>/supprimer/', views.membre_delete_view, name='membre_delete'),
     path('membres/export/', views.membre_export_view, name='membre_export'),
+    path('membres/lot/', views.membre_lot_view, name='membre_lot'),
     
     # Couples
     path('couples/', views.couple_list_view, name='couple_list'),
@@ -32,11 +40,13 @@ urlpatterns = [
     path('couples/ajouter/', views.couple_form_view, name='couple_create'),
     path('couples/<int:pk>/modifier/', views.couple_form_view, name='couple_update'),
     path('couples/<int:pk>/supprimer/', views.couple_delete_view, name='couple_delete'),
+    path('couples/conjoints-eligibles/', views.conjoints_eligibles_view, name='conjoints_eligibles'),
 
     
     # Programmes d'église
     path('programmes/', views.programme_eglise_list_view, name='programme_list'),
     path('programmes/calendrier/', views.programme_eglise_calendar_view, name='programme_calendar'),
+    path('programmes/creneaux-libres/', views.creneaux_libres_view, name='creneaux_libres'),
     path('programmes/creer/', views.programme_eglise_create_view, name='programme_create'),
     path('programmes/<int:pk>/', views.programme_eglise_detail_view, name='programme_detail'),
     path('programmes/<int:pk>/modifier/', views.programme_eglise_update_view, name='programme_update'),
@@ -50,9 +60,16 @@ urlpatterns = [
     path('programmes-mariage/<int:pk>/update/', views.programme_mariage_update_view, name='programme_mariage_update'),
     path('programmes-mariage/<int:pk>/delete/', views.programme_mariage_delete_view, name='programme_mariage_delete'),
     
+    # Présences
+    path('presences/pointage/', views.presence_checkin_view, name='presence_checkin'),
+
     # Groupes
     path('groupes/', views.groupe_list_view, name='groupe_list'),
     path('groupes/<int:pk>/', views.groupe_detail_view, name='groupe_detail'),
+    path('notifications/', views.notification_view, name='notifications'),
+    path('groupes/<int:pk>/membres/ajouter/', views.groupe_membres_ajouter_view, name='groupe_membres_ajouter'),
+    path('groupes/<int:pk>/membres/retirer/', views.groupe_membres_retirer_view, name='groupe_membres_retirer'),
+    path('groupes/<int:pk>/membres/transferer/', views.groupe_membres_transferer_view, name='groupe_membres_transferer'),
     
     # Finances
     path('finances/transactions/', views.transaction_list_view, name='transaction_list'),
@@ -64,4 +81,14 @@ urlpatterns = [
     
     # Statistiques
     path('statistiques/', views.statistiques_view, name='statistiques'),
+
+    # Synchronisation incrémentale
+    path('sync/<str:modele>/', views.sync_changes_view, name='sync_changes'),
+
+    # API JSON
+    path('api/<str:ressource>/', views.api_liste_view, name='api_liste'),
+    path('api/<str:ressource>/<int:pk>/', views.api_detail_view, name='api_detail'),
+
+    # Journal d'audit
+    path('historique/<str:modele>/<int:pk>/', views.journal_audit_view, name='journal_audit'),
 ]
\ No newline at end of file
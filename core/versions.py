@@ -0,0 +1,42 @@
+# versions.py
+"""Compteurs de version par modèle, stockés dans le cache.
+
+Chaque écriture incrémente le compteur du modèle ; les caches applicatifs
+(annuaire des membres, ...) comparent leur version à celle-ci pour savoir
+s'ils doivent se reconstruire, sans interroger la base. Les ETag des pages
+(core.conditionnel) en sont aussi dérivés.
+
+Un compteur absent du cache repart d'un horodatage en millisecondes : après
+un vidage ou un redémarrage du cache, une version ne reprend donc jamais une
+valeur déjà distribuée.
+"""
+import time
+from django.core.cache import cache
+
+VERSION_KEY = 'core:version:{}'
+
+
+def _version_initiale():
+    return int(time.time() * 1000)
+
+
+def get_version(name):
+    """Version courante d'un modèle (initialisée si absente du cache)."""
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        initiale = _version_initiale()
+        cache.add(key, initiale, timeout=None)
+        version = cache.get(key, initiale)
+    return version
+
+
+def bump_version(name):
+    """Incrémente la version d'un modèle après une écriture."""
+    key = VERSION_KEY.format(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Clé absente (cache vidé ou redémarré) : on repart d'une valeur nouvelle
+        cache.add(key, _version_initiale(), timeout=None)
+        return cache.incr(key)
@@ -1,21 +1,50 @@
 import json
+import asyncio
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404, StreamingHttpResponse
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.asgi import ASGIRequest
 from django.db.models import Sum, Count, Q
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.core.paginator import Paginator
 import csv
 from django.http import HttpResponse
 from datetime import datetime, timedelta,date
 from .models import *
-from django.db import transaction
+from .services import (
+    membre_profile_summary, enregistrer_presences, dashboard_counters,
+    approuver_demandes, rejeter_demandes, conjoints_eligibles, options_conjoints, valider_conjoints,
+    inventaire_dons, rechercher_dons, ajouter_membres_groupe, retirer_membres_groupe,
+    transferer_membres_groupe, valider_changements_membres, modifier_membres_lot, CHAMPS_LOT_MEMBRES,
+    ROLES_APPROBATION,
+)
+from .live import get_broker
+from .directory import get_annuaire
+from .paginators import EstimatedCountPaginator
+from .permissions import role_required, has_role
+from . import api, audit
+from .planning import conflits, creneaux_libres
+from .rappels import anniversaires_a_venir
+from .notifications import creer_notification
+from .routers import lecture_replica
+from .conditionnel import version_page
+from .ratelimit import client_ip, login_ip_limiter, login_username_limiter, demande_acces_limiter
+from .sync import SYNC_MODELS, SYNC_ROLES, BATCH_SIZE, parse_cursor, changes_since, deletions_since
+from django.db import transaction, IntegrityError
+from asgiref.sync import sync_to_async
 from django.utils.timezone import make_aware
+from django.utils.dateparse import parse_datetime, parse_date
+from django.core.serializers.json import DjangoJSONEncoder
+from django.views.decorators.http import require_POST, require_http_methods
 
 @login_required
+@lecture_replica
 def membre_export_view(request):
     # Créer la réponse HTTP avec l'en-tête CSV
     response = HttpResponse(content_type='text/csv')
@@ -62,20 +91,28 @@ def request_access(request):
         email = request.POST.get('email')
         role = request.POST.get('role')
         message = request.POST.get('message')
-        with transaction.atomic():
-            if DemandeAcces.objects.filter(email=email, est_traitee=False).exists():
-                messages.warning(request, "Une demande en attente existe déjà avec cet email.")
-                return redirect('requestAccess')
-            
-            DemandeAcces.objects.create(
-                nom_complet=name,
-                email=email,
-                role_souhaite=role,
-                message=message,
-            )
-            messages.success(request, "Votre demande a été envoyée avec succès.")
+
+        # Limite les soumissions en rafale avant tout accès à la base
+        if not demande_acces_limiter.tentative(client_ip(request)):
+            messages.error(request, "Trop de demandes envoyées. Veuillez réessayer plus tard.")
+            return render(request, 'core/requestAccess.html', status=429)
+
+        # Une seule insertion : la contrainte d'unicité sur l'email détecte les doublons
+        try:
+            with transaction.atomic():
+                DemandeAcces.objects.create(
+                    nom_complet=name,
+                    email=email,
+                    role_souhaite=role,
+                    message=message,
+                )
+        except IntegrityError:
+            messages.warning(request, "Une demande existe déjà avec cet email.")
             return redirect('requestAccess')
 
+        messages.success(request, "Votre demande a été envoyée avec succès.")
+        return redirect('requestAccess')
+
     return render(request, 'core/requestAccess.html')
 
 def login_view(request):
@@ -83,6 +120,12 @@ def login_view(request):
         username = request.POST.get('username')
         password = request.POST.get('password')
 
+        # Refus avant le hachage du mot de passe, qui est volontairement coûteux
+        if not (login_ip_limiter.tentative(client_ip(request)) and
+                login_username_limiter.tentative((username or '').lower())):
+            messages.error(request, "Trop de tentatives de connexion. Veuillez réessayer dans quelques minutes.")
+            return render(request, 'core/login.html', status=429)
+
         user = authenticate(request, username=username, password=password)
         
         if user is not None:
@@ -103,29 +146,13 @@ def logout_view(request):
 @login_required
 def dashboard_view(request):
     """Tableau de bord principal"""
-    # Statistiques générales
-    total_membres = Membre.objects.count()
-    total_couples = Couple.objects.filter(statut_couple='marie').count()
+    # Statistiques générales et transactions du mois
+    context = dashboard_counters()
     programmes_semaine = ProgrammeEglise.objects.filter(
         date_debut__gte=timezone.now(),
         date_debut__lte=timezone.now() + timedelta(days=7)
     ).count()
 
-    
-    # Transactions du mois
-    debut_mois = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    transactions_mois = TransactionFinanciere.objects.filter(
-        date_transaction__gte=debut_mois
-    )
-    
-    offrandes_mois = transactions_mois.filter(type_transaction='offrande').aggregate(
-        total=Sum('montant')
-    )['total'] or 0
-    
-    depenses_mois = transactions_mois.filter(type_transaction='depense').aggregate(
-        total=Sum('montant')
-    )['total'] or 0
-    
     # Programmes à venir
     programmes_a_venir = ProgrammeEglise.objects.filter(
         date_debut__gte=timezone.now()
@@ -145,25 +172,67 @@ def dashboard_view(request):
         created_at__gte=timezone.now() - timedelta(days=30)
     ).order_by('-created_at')[:5]
     
-    context = {
-        'total_membres': total_membres,
-        'total_couples': total_couples,
+    context.update({
         'programmes_semaine': programmes_semaine,
-        'offrandes_mois': offrandes_mois,
-        'depenses_mois': depenses_mois,
-        'solde_mois': offrandes_mois - depenses_mois,
         'programmes_a_venir': programmes_a_venir,
         'nouveaux_membres': nouveaux_membres,
         'nouveaux_membres_2jrs': nouveaux_membres_2jrs,
-        'nouveaux_couples': nouveaux_couples
-    }
+        'nouveaux_couples': nouveaux_couples,
+        'anniversaires': anniversaires_a_venir(),
+        # Le flux SSE n'est servi que sous ASGI ; sous WSGI la page interroge les compteurs périodiquement
+        'flux_direct': isinstance(request, ASGIRequest),
+    })
     
     return render(request, 'core/index.html', context)
 
 @login_required
+@version_page('membre', 'couple', 'transaction')
+def dashboard_compteurs_view(request):
+    """Compteurs du tableau de bord en JSON, interrogés périodiquement quand le flux SSE n'est pas disponible"""
+    return JsonResponse(dashboard_counters(), encoder=DjangoJSONEncoder)
+
+@login_required
+async def dashboard_events_view(request):
+    """Flux server-sent events des variations de compteurs du tableau de bord"""
+    if not isinstance(request, ASGIRequest):
+        # Sous WSGI, une connexion ouverte bloquerait un worker en permanence : 204 arrête
+        # définitivement l'EventSource et la page passe à l'interrogation périodique
+        return HttpResponse(status=204)
+    broker = get_broker()
+
+    async def stream():
+        queue = broker.subscribe()
+        try:
+            # État initial calculé une seule fois par connexion, ensuite uniquement des deltas
+            counters = await sync_to_async(dashboard_counters)()
+            yield f"event: snapshot\ndata: {json.dumps(counters, cls=DjangoJSONEncoder)}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Commentaire de maintien de connexion
+                    yield ": keepalive\n\n"
+                    continue
+                if event.get('type') == 'refresh':
+                    counters = await sync_to_async(dashboard_counters)()
+                    yield f"event: snapshot\ndata: {json.dumps(counters, cls=DjangoJSONEncoder)}\n\n"
+                else:
+                    yield f"event: delta\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
+        finally:
+            broker.unsubscribe(queue)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+@version_page('membre')
 def membre_list_view(request):
     """Liste des membres avec recherche et filtres"""
-    membres = Membre.objects.all().order_by('nom', 'prenom')
+    # Membres actifs par défaut ; les membres désactivés restent consultables
+    inactifs = request.GET.get('statut') == 'inactifs'
+    membres = (Membre.tous.filter(is_active=False) if inactifs else Membre.objects.all()).order_by('nom', 'prenom')
     
     # Statistiques rapides
     total_baptises = membres.filter(statut_baptismal='baptise_eglise').count()
@@ -194,6 +263,7 @@ def membre_list_view(request):
         'search': search,
         'statut_baptismal': statut_baptismal,
         'statut_choices': Membre.STATUT_BAPTISMAL_CHOICES,
+        'inactifs': inactifs,
         'total_baptises': total_baptises,
         'total_non_baptises': total_non_baptises,
         'total_autre_eglise': total_autre_eglise,
@@ -204,28 +274,9 @@ def membre_list_view(request):
 @login_required
 def membre_detail_view(request, pk):
     """Détail d'un membre"""
-    membre = get_object_or_404(Membre, pk=pk)
-    
-    # Rôles du membre
-    roles = MembreRole.objects.filter(membre=membre).select_related('role')
-    
-    # Groupes du membre
-    groupes = MembreGroupe.objects.filter(membre=membre).select_related('groupe')
-    
-    # Transactions du membre
-    transactions = TransactionFinanciere.objects.filter(membre=membre).order_by('-date_transaction')[:10]
-    
-    # Dons matériels du membre
-    dons_materiels = DonMateriel.objects.filter(membre=membre).order_by('-date_don')[:5]
-    
-    context = {
-        'membre': membre,
-        'roles': roles,
-        'groupes': groupes,
-        'transactions': transactions,
-        'dons_materiels': dons_materiels,
-    }
-    
+    # Rôles, groupes, totaux et couple calculés en un nombre borné de requêtes
+    context = membre_profile_summary(pk)
+
     return render(request, 'membre/membre_detail.html', context)
 
 @login_required
@@ -277,7 +328,7 @@ def membre_create_view(request):
                 errors['email'] = "L'adresse email est requise."
             elif '@' not in email or '.' not in email:
                 errors['email'] = "Format d'adresse email invalide."
-            elif Membre.objects.filter(email=email).exists():
+            elif Membre.tous.filter(email=email).exists():
                 errors['email'] = "Cet email est déjà utilisé par un autre membre."
 
             if statut_baptismal not in [choice[0] for choice in Membre.STATUT_BAPTISMAL_CHOICES]:
@@ -397,19 +448,56 @@ def membre_update_view(request, pk):
 
 @login_required
 def membre_delete_view(request, pk):
+    """Suppression douce : le membre est désactivé, son historique est conservé (voir archiver_membres)"""
     membre = get_object_or_404(Membre, pk=pk)
     
     if request.method == 'POST':
         try:
             with transaction.atomic():
-                membre.delete()
-                messages.success(request, "Le couple a été supprimé avec succès!")
+                membre.is_active = False
+                membre.save(update_fields=['is_active', 'updated_at'])
+                messages.success(request, "Le membre a été désactivé avec succès!")
                 return redirect('membre_list')
         except Exception as e:
-            messages.error(request, f"Erreur lors de la suppression: {str(e)}")
+            messages.error(request, f"Erreur lors de la désactivation: {str(e)}")
             return redirect('membre_detail', pk=pk)
     
-    return redirect('membre_list')
+    # Confirmation sans JavaScript
+    return render(request, 'membre/delete_confirm.html', {'membre': membre})
+
+@role_required('pasteur')
+@require_POST
+def membre_lot_view(request):
+    """Modification par lot (statut baptismal, activation, date d'adhésion) des membres sélectionnés"""
+    ids, parametres = _lot_membres(request)
+    if ids is None:
+        return JsonResponse({'error': 'Liste de membres attendue'}, status=400)
+    if request.content_type == 'application/json':
+        changements = parametres.get('changements')
+        if not isinstance(changements, dict):
+            return JsonResponse({'error': 'Changements attendus'}, status=400)
+    else:
+        # Champs laissés vides dans le formulaire : inchangés
+        changements = {champ: parametres[champ] for champ in CHAMPS_LOT_MEMBRES if parametres.get(champ)}
+    retour = request.POST.get('next') or reverse('membre_list')
+    if not url_has_allowed_host_and_scheme(retour, allowed_hosts={request.get_host()}):
+        retour = reverse('membre_list')
+
+    valeurs, erreurs = valider_changements_membres(changements)
+    if not ids:
+        erreurs.append("Aucun membre sélectionné.")
+    if erreurs:
+        if request.content_type == 'application/json':
+            return JsonResponse({'error': erreurs}, status=400)
+        for erreur in erreurs:
+            messages.error(request, erreur)
+        return redirect(retour)
+
+    resultat = modifier_membres_lot(ids, valeurs, auteur=request.user)
+    if request.content_type == 'application/json':
+        return JsonResponse(resultat)
+    messages.success(request, f"{resultat['modifies']} membre(s) modifié(s).")
+    return redirect(retour)
 
 @login_required
 def couple_list_view(request):
@@ -459,6 +547,8 @@ def couple_detail_view(request, pk):
     
     return render(request, 'couple/detail.html', context)
 
+CONJOINTS_PAR_PAGE = 50
+
 @login_required
 def couple_form_view(request, pk=None):
     """Vue pour créer ou modifier un couple"""
@@ -466,9 +556,9 @@ def couple_form_view(request, pk=None):
     if pk:
         couple = get_object_or_404(Couple, pk=pk)
     
-    # Get all male and female members
-    membres_hommes = Membre.objects.filter(sexe='M').order_by('nom', 'prenom')
-    membres_femmes = Membre.objects.filter(sexe='F').order_by('nom', 'prenom')
+    # Premiers conjoints possibles et conjoints actuels ; la suite est servie par la recherche (autocomplétion)
+    membres_hommes = options_conjoints('M', couple, CONJOINTS_PAR_PAGE)
+    membres_femmes = options_conjoints('F', couple, CONJOINTS_PAR_PAGE)
     
     if request.method == 'POST':
         try:
@@ -484,6 +574,16 @@ def couple_form_view(request, pk=None):
             if not data['membre_mari_id'] or not data['membre_femme_id'] or not data['statut_couple']:
                 messages.error(request, "Veuillez remplir tous les champs obligatoires.")
                 return redirect('couple_create')
+            if not (data['membre_mari_id'].isdigit() and data['membre_femme_id'].isdigit()):
+                messages.error(request, "Sélection de membres invalide.")
+                return redirect('couple_create')
+
+            # Éligibilité des deux conjoints vérifiée en une requête, avant l'insertion
+            erreurs = valider_conjoints(data['membre_mari_id'], data['membre_femme_id'], couple)
+            if erreurs:
+                for erreur in erreurs:
+                    messages.error(request, erreur)
+                return redirect('couple_update', pk=couple.pk) if couple else redirect('couple_create')
             
             if couple:  # Update existing couple
                 for key, value in data.items():
@@ -514,6 +614,26 @@ def couple_form_view(request, pk=None):
     
     return render(request, 'couple/couples_form.html', context)
 
+@login_required
+def conjoints_eligibles_view(request):
+    """Autocomplétion paginée des conjoints possibles (JSON)"""
+    sexe = request.GET.get('sexe')
+    if sexe not in dict(Membre.SEXE_CHOICES):
+        return JsonResponse({'error': 'Sexe invalide'}, status=400)
+
+    couple = None
+    couple_pk = request.GET.get('couple', '')
+    if couple_pk.isdigit():
+        couple = Couple(pk=int(couple_pk))
+
+    membres = conjoints_eligibles(sexe, request.GET.get('q', '').strip(), couple)
+    paginator = Paginator(membres, CONJOINTS_PAR_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    return JsonResponse({
+        'results': [{'id': membre.pk, 'text': membre.nom_complet} for membre in page_obj],
+        'has_next': page_obj.has_next(),
+    })
+
 @login_required
 def couple_delete_view(request, pk):
     couple = get_object_or_404(Couple, pk=pk)
@@ -544,6 +664,24 @@ def combine_date_time(date_str, time_str):
     dt_obj = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
     return make_aware(dt_obj)
 
+def lieu_disponible(request, lieu, debut, fin, exclure_mariage=None, exclure_eglise=None):
+    """Vérifie qu'aucun autre programme n'occupe le lieu ; signale les conflits à l'utilisateur."""
+    reservations = conflits(lieu, debut, fin, exclure_mariage, exclure_eglise)
+    for reservation in reservations[:5]:
+        messages.error(
+            request,
+            f"Le lieu « {lieu} » est déjà réservé par « {reservation.titre} » "
+            f"du {timezone.localtime(reservation.debut):%d/%m/%Y %H:%M} au {timezone.localtime(reservation.fin):%d/%m/%Y %H:%M}."
+        )
+    return not reservations
+
+def parse_datetime_local(value):
+    """Convertit la valeur d'un champ datetime-local en datetime avec fuseau."""
+    dt = parse_datetime(value or '')
+    if dt is not None and timezone.is_naive(dt):
+        dt = make_aware(dt)
+    return dt
+
 @login_required
 def programme_eglise_list_view(request):
     """Liste des programmes d'église"""
@@ -605,7 +743,7 @@ def programme_eglise_detail_view(request, pk):
     
     return render(request, 'programmes/detail.html', context)
 
-@login_required
+@role_required('coordinateur_programme', 'pasteur')
 def programme_eglise_create_view(request):
     if request.method == 'POST':
         
@@ -620,16 +758,19 @@ def programme_eglise_create_view(request):
             'categorie': request.POST.get('categorie'),
             'recurrence': request.POST.get('recurrence')
         }
-        programme = ProgrammeEglise.objects.create(**data)
-        messages.success(request, "Le programme a été créé avec succès!")
-        return redirect('programme_detail', pk=programme.pk)
+        programme = ProgrammeEglise(**data)
+        programme.calculer_intervalle()
+        if lieu_disponible(request, programme.lieu, programme.debut_complet, programme.fin_complet):
+            programme.save()
+            messages.success(request, "Le programme a été créé avec succès!")
+            return redirect('programme_detail', pk=programme.pk)
 
     return render(request, 'programmes/form.html', {
         'categorie_choices': ProgrammeEglise.CATEGORIE_CHOICES,
         'recurrence_choices': ProgrammeEglise.RECURRENCE_CHOICES,
     })
 
-@login_required
+@role_required('coordinateur_programme', 'pasteur')
 def programme_eglise_update_view(request, pk):
     programme = get_object_or_404(ProgrammeEglise, pk=pk)
 
@@ -637,17 +778,19 @@ def programme_eglise_update_view(request, pk):
         try:
             programme.titre = request.POST.get('titre')
             programme.description = request.POST.get('description')
-            programme.date_debut = request.POST.get('date_debut'),
-            programme.heure_debut = request.POST.get('heure_debut')
-            programme.date_fin = request.POST.get('date_fin'),
-            programme.heure_fin = request.POST.get('heure_fin')
+            programme.date_debut = request.POST.get('date_debut') or None
+            programme.heure_debut = request.POST.get('heure_debut') or None
+            programme.date_fin = request.POST.get('date_fin') or None
+            programme.heure_fin = request.POST.get('heure_fin') or None
             programme.lieu = request.POST.get('lieu')
             programme.categorie = request.POST.get('categorie')
             programme.recurrence = request.POST.get('recurrence')
-            programme.save()
-
-            messages.success(request, "Le programme a été modifié avec succès!")
-            return redirect('programme_detail', pk=programme.pk)
+            programme.calculer_intervalle()
+            if lieu_disponible(request, programme.lieu, programme.debut_complet, programme.fin_complet,
+                               exclure_eglise=programme.pk):
+                programme.save()
+                messages.success(request, "Le programme a été modifié avec succès!")
+                return redirect('programme_detail', pk=programme.pk)
         except Exception as e:
             messages.error(request, f"Erreur lors de la modification: {str(e)}")
 
@@ -657,7 +800,7 @@ def programme_eglise_update_view(request, pk):
         'recurrence_choices': ProgrammeEglise.RECURRENCE_CHOICES
     })
 
-@login_required
+@role_required('coordinateur_programme', 'pasteur')
 def programme_eglise_delete_view(request, pk):
     """Supprimer un programme d'église"""
     programme = get_object_or_404(ProgrammeEglise, pk=pk)
@@ -678,6 +821,7 @@ def programme_eglise_delete_view(request, pk):
     return render(request, 'programmes/delete_confirm.html', context)
 
 @login_required
+@version_page('programme_eglise')
 def programme_eglise_calendar_view(request):
     """Vue calendrier des programmes"""
     # Récupérer tous les programmes
@@ -737,6 +881,30 @@ def programme_eglise_calendar_view(request):
     }
     return render(request, 'programmes/calendar.html', context)
 
+@login_required
+def creneaux_libres_view(request):
+    """Créneaux libres d'un ou plusieurs lieux sur une période (JSON)"""
+    lieux = [lieu for lieu in request.GET.getlist('lieu') if lieu]
+    debut = parse_date(request.GET.get('debut') or '')
+    fin = parse_date(request.GET.get('fin') or '')
+    try:
+        duree = timedelta(minutes=int(request.GET.get('duree', 60)))
+    except ValueError:
+        duree = timedelta(minutes=60)
+
+    if not lieux or not debut or not fin or fin < debut:
+        return JsonResponse({'error': 'Paramètres lieu, debut et fin (AAAA-MM-JJ) requis'}, status=400)
+    if (fin - debut).days > 366:
+        return JsonResponse({'error': 'Période limitée à un an'}, status=400)
+
+    debut = make_aware(datetime.combine(debut, datetime.min.time()))
+    fin = make_aware(datetime.combine(fin + timedelta(days=1), datetime.min.time()))
+    libres = creneaux_libres(lieux, debut, fin, duree)
+    return JsonResponse({
+        lieu: [{'debut': timezone.localtime(d).isoformat(), 'fin': timezone.localtime(f).isoformat()} for d, f in creneaux]
+        for lieu, creneaux in libres.items()
+    })
+
 @login_required
 def groupe_list_view(request):
     """Liste des groupes"""
@@ -759,22 +927,109 @@ def groupe_list_view(request):
     
     return render(request, 'groupes/groupe.html', context)
 
+MEMBRES_GROUPE_PAR_PAGE = 50
+
 @login_required
 def groupe_detail_view(request, pk):
     """Détail d'un groupe"""
     groupe = get_object_or_404(Groupe, pk=pk)
     
-    # Membres du groupe
-    membres_groupe = MembreGroupe.objects.filter(groupe=groupe).select_related('membre')
+    # Membres du groupe (index unique (membre, groupe) + tri sur le nom)
+    membres_groupe = MembreGroupe.objects.filter(groupe=groupe).select_related('membre').order_by(
+        'membre__nom', 'membre__prenom'
+    )
+    
+    # Recherche
+    search = request.GET.get('search', '').strip()
+    if search:
+        membres_groupe = membres_groupe.filter(
+            Q(membre__nom__icontains=search) |
+            Q(membre__prenom__icontains=search) |
+            Q(membre__email__icontains=search)
+        )
+    
+    # Pagination
+    paginator = Paginator(membres_groupe, MEMBRES_GROUPE_PAR_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
     
     context = {
         'groupe': groupe,
-        'membres_groupe': membres_groupe,
+        'page_obj': page_obj,
+        'page_range': paginator.get_elided_page_range(page_obj.number),
+        'search': search,
+        'autres_groupes': Groupe.objects.exclude(pk=groupe.pk).only('id', 'nom_groupe'),
+        'tous_membres': get_annuaire().filtrer(actifs_seulement=True),
     }
     
     return render(request, 'groupes/detail.html', context)
 
-@login_required
+def _lot_membres(request):
+    """Lit un lot d'identifiants de membres (JSON {"membres": [...]} ou formulaire) et ses paramètres."""
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return None, None
+        if not isinstance(payload, dict) or not isinstance(payload.get('membres'), list):
+            return None, None
+        return payload['membres'], payload
+    return request.POST.getlist('membres'), request.POST
+
+def _reponse_lot(request, groupe, resultat, message):
+    """Réponse JSON pour l'API, ou message + retour au groupe pour le formulaire."""
+    if request.content_type == 'application/json':
+        return JsonResponse(resultat)
+    messages.success(request, message)
+    return redirect('groupe_detail', pk=groupe.pk)
+
+@role_required('pasteur')
+@require_POST
+def groupe_membres_ajouter_view(request, pk):
+    """Ajout d'un lot de membres à un groupe"""
+    groupe = get_object_or_404(Groupe, pk=pk)
+    ids, _ = _lot_membres(request)
+    if ids is None:
+        return JsonResponse({'error': 'Liste de membres attendue'}, status=400)
+    resultat = ajouter_membres_groupe(groupe, ids)
+    return _reponse_lot(request, groupe, resultat, f"{resultat['ajoutes']} membre(s) ajouté(s) au groupe.")
+
+@role_required('pasteur')
+@require_POST
+def groupe_membres_retirer_view(request, pk):
+    """Retrait d'un lot de membres d'un groupe"""
+    groupe = get_object_or_404(Groupe, pk=pk)
+    ids, _ = _lot_membres(request)
+    if ids is None:
+        return JsonResponse({'error': 'Liste de membres attendue'}, status=400)
+    resultat = retirer_membres_groupe(groupe, ids)
+    return _reponse_lot(request, groupe, resultat, f"{resultat['retires']} membre(s) retiré(s) du groupe.")
+
+@role_required('pasteur')
+@require_POST
+def groupe_membres_transferer_view(request, pk):
+    """Transfert d'un lot de membres vers un autre groupe"""
+    groupe = get_object_or_404(Groupe, pk=pk)
+    ids, parametres = _lot_membres(request)
+    if ids is None:
+        return JsonResponse({'error': 'Liste de membres attendue'}, status=400)
+    cible_id = str(parametres.get('groupe_cible', ''))
+    cible = None
+    if cible_id.isdigit() and int(cible_id) != groupe.pk:
+        cible = Groupe.objects.filter(pk=cible_id).first()
+    if cible is None:
+        if request.content_type == 'application/json':
+            return JsonResponse({'error': 'Groupe cible invalide'}, status=400)
+        messages.error(request, "Veuillez choisir un groupe cible différent.")
+        return redirect('groupe_detail', pk=groupe.pk)
+    resultat = transferer_membres_groupe(groupe, cible, ids)
+    return _reponse_lot(
+        request, groupe, resultat,
+        f"{resultat['transferes']} membre(s) transféré(s) vers « {cible.nom_groupe} »."
+    )
+
+@role_required('tresorier', 'pasteur')
+@version_page('transaction', 'membre')
+@lecture_replica
 def transaction_list_view(request):
     """Liste des transactions financières"""
     transactions = TransactionFinanciere.objects.all().select_related('membre').order_by('-date_transaction')
@@ -817,14 +1072,15 @@ def transaction_list_view(request):
         'total_offrandes': total_offrandes,
         'total_depenses': total_depenses,
         'solde': total_offrandes - total_depenses,
-        'tous_membres': Membre.objects.all().order_by('nom', 'prenom'),
+        'tous_membres': get_annuaire(),
     }
     
     return render(request, 'finances/transactions.html', context)
 
-@login_required
+@role_required('tresorier', 'pasteur')
+@lecture_replica
 def don_materiel_list_view(request):
-    """Liste des dons matériels"""
+    """Inventaire et liste des dons matériels"""
     dons = DonMateriel.objects.all().select_related('membre').order_by('-date_don')
     
     # Filtres
@@ -836,26 +1092,33 @@ def don_materiel_list_view(request):
     if membre:
         dons = dons.filter(membre__id=membre)
     
-    # Recherche
-    search = request.GET.get('search')
+    # Recherche (index texte intégral du moteur)
+    search = request.GET.get('search', '').strip()
     if search:
-        dons = dons.filter(description_objet__icontains=search)
+        dons = rechercher_dons(dons, search)
     
-    # Pagination
-    paginator = Paginator(dons, 20)
+    # Pagination (nombre estimé sur la liste complète, très volumineuse)
+    paginator = EstimatedCountPaginator(dons, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
+    # Filtres conservés dans les liens de pagination
+    filtres = request.GET.copy()
+    filtres.pop('page', None)
+    
     context = {
         'page_obj': page_obj,
+        'page_range': paginator.get_elided_page_range(page_obj.number),
+        'filtres': filtres.urlencode(),
         'statut': statut,
         'membre': membre,
         'search': search,
         'statut_choices': DonMateriel.STATUT_CHOICES,
-        'tous_membres': Membre.objects.all().order_by('nom', 'prenom'),
+        'tous_membres': get_annuaire(),
+        'inventaire': inventaire_dons(),
     }
     
-    return render(request, 'dons/list.html', context)
+    return render(request, 'dons/don.html', context)
 
 @login_required
 def role_list_view(request):
@@ -886,6 +1149,7 @@ def role_detail_view(request, pk):
     return render(request, 'roles/detail.html', context)
 
 @login_required
+@lecture_replica
 def statistiques_view(request):
     """Page des statistiques générales"""
     # Statistiques membres
@@ -977,7 +1241,7 @@ def programme_mariage_detail_view(request, pk):
     
     return render(request, 'programme_mariage/detail.html', context)
 
-@login_required
+@role_required('coordinateur_programme', 'pasteur')
 def programme_mariage_create_view(request, couple_pk):
     """Créer un programme de mariage"""
     couple = get_object_or_404(Couple, pk=couple_pk)
@@ -989,15 +1253,16 @@ def programme_mariage_create_view(request, couple_pk):
                     'couple': couple,
                     'titre': request.POST.get('titre'),
                     'description': request.POST.get('description'),
-                    'date_debut': request.POST.get('date_debut'),
-                    'date_fin': request.POST.get('date_fin'),
+                    'date_debut': parse_datetime_local(request.POST.get('date_debut')),
+                    'date_fin': parse_datetime_local(request.POST.get('date_fin')),
                     'lieu': request.POST.get('lieu'),
                     'statut': request.POST.get('statut', 'planifie')
                 }
                 
-                programme = ProgrammeMariage.objects.create(**data)
-                messages.success(request, "Le programme a été créé avec succès!")
-                return redirect('couple_detail', pk=couple.pk)
+                if lieu_disponible(request, data['lieu'], data['date_debut'], data['date_fin']):
+                    programme = ProgrammeMariage.objects.create(**data)
+                    messages.success(request, "Le programme a été créé avec succès!")
+                    return redirect('couple_detail', pk=couple.pk)
             
         except Exception as e:
             messages.error(request, f"Erreur lors de la création: {str(e)}")
@@ -1009,7 +1274,7 @@ def programme_mariage_create_view(request, couple_pk):
     
     return render(request, 'programme_mariage/form.html', context)
 
-@login_required
+@role_required('coordinateur_programme', 'pasteur')
 def programme_mariage_update_view(request, pk):
     """Modifier un programme de mariage"""
     programme = get_object_or_404(ProgrammeMariage, pk=pk)
@@ -1019,14 +1284,17 @@ def programme_mariage_update_view(request, pk):
             with transaction.atomic():
                 programme.titre = request.POST.get('titre')
                 programme.description = request.POST.get('description')
-                programme.date_debut = request.POST.get('date_debut')
-                programme.date_fin = request.POST.get('date_fin')
+                programme.date_debut = parse_datetime_local(request.POST.get('date_debut'))
+                programme.date_fin = parse_datetime_local(request.POST.get('date_fin'))
                 programme.lieu = request.POST.get('lieu')
                 programme.statut = request.POST.get('statut')
-                programme.save()
-                
-                messages.success(request, "Le programme a été modifié avec succès!")
-                return redirect('programme_mariage_detail', pk=programme.pk)
+                if programme.statut == 'annule' or lieu_disponible(
+                    request, programme.lieu, programme.date_debut, programme.date_fin,
+                    exclure_mariage=programme.pk
+                ):
+                    programme.save()
+                    messages.success(request, "Le programme a été modifié avec succès!")
+                    return redirect('programme_mariage_detail', pk=programme.pk)
                 
         except Exception as e:
             messages.error(request, f"Erreur lors de la modification: {str(e)}")
@@ -1038,7 +1306,7 @@ def programme_mariage_update_view(request, pk):
     
     return render(request, 'programme_mariage/form.html', context)
 
-@login_required
+@role_required('coordinateur_programme', 'pasteur')
 def programme_mariage_couple_select(request):
     """Sélection du couple pour créer un programme"""
     couples = Couple.objects.all().select_related('membre_mari', 'membre_femme').order_by('-date_mariage')
@@ -1050,7 +1318,7 @@ def programme_mariage_couple_select(request):
     
     return render(request, 'programme_mariage/select_couple.html', context)
 
-@login_required
+@role_required('coordinateur_programme', 'pasteur')
 def programme_mariage_delete_view(request, pk):
     """Supprimer un programme de mariage"""
     programme = get_object_or_404(ProgrammeMariage, pk=pk)
@@ -1070,4 +1338,219 @@ def programme_mariage_delete_view(request, pk):
         'programme': programme
     }
     
-    return render(request, 'programme_mariage/delete_confirm.html', context)
\ No newline at end of file
+    return render(request, 'programme_mariage/delete_confirm.html', context)
+
+@login_required
+def sync_changes_view(request, modele):
+    """Flux de modifications incrémental (lignes modifiées et suppressions) pour les clients de synchronisation"""
+    if modele not in SYNC_MODELS:
+        raise Http404("Modèle de synchronisation inconnu")
+    roles = SYNC_ROLES.get(modele)
+    if roles and not has_role(request, *roles):
+        raise PermissionDenied
+
+    try:
+        limit = int(request.GET.get('limit', BATCH_SIZE))
+    except ValueError:
+        limit = BATCH_SIZE
+
+    since, after_id = parse_cursor(request.GET.get('since'), request.GET.get('after_id'))
+    deleted_since, deleted_after_id = parse_cursor(
+        request.GET.get('deleted_since'), request.GET.get('deleted_after_id')
+    )
+
+    return JsonResponse({
+        'modele': modele,
+        'changes': changes_since(modele, since, after_id, limit),
+        'deletions': deletions_since(modele, deleted_since, deleted_after_id, limit),
+    })
+
+def _reponse_api(donnees, status=200):
+    return HttpResponse(api.dumps(donnees), content_type='application/json', status=status)
+
+def _verifier_roles_api(request, roles):
+    if roles and not has_role(request, *roles):
+        raise api.ErreurApi("Accès refusé", status=403)
+
+def _erreur_api(erreur):
+    donnees = {'error': str(erreur)}
+    if erreur.details is not None:
+        donnees['details'] = erreur.details
+    return _reponse_api(donnees, status=erreur.status)
+
+@login_required
+@require_http_methods(['GET', 'POST'])
+def api_liste_view(request, ressource):
+    """API JSON : liste paginée par curseur (GET) ou création (POST)"""
+    try:
+        definition = api.get_ressource(ressource)
+        if request.method == 'POST':
+            _verifier_roles_api(request, definition.roles_ecriture)
+            pk = api.enregistrer(ressource, api.loads(request.body))
+            return _reponse_api(api.detail(ressource, pk, request.GET), status=201)
+        _verifier_roles_api(request, definition.roles_lecture)
+        return _reponse_api(api.lister(ressource, request.GET))
+    except api.ErreurApi as erreur:
+        return _erreur_api(erreur)
+
+@login_required
+@require_http_methods(['GET', 'PATCH', 'PUT', 'DELETE'])
+def api_detail_view(request, ressource, pk):
+    """API JSON : lecture, modification (PATCH partiel, PUT complet) ou suppression d'un objet"""
+    try:
+        definition = api.get_ressource(ressource)
+        if request.method == 'GET':
+            _verifier_roles_api(request, definition.roles_lecture)
+            return _reponse_api(api.detail(ressource, pk, request.GET))
+        _verifier_roles_api(request, definition.roles_ecriture)
+        if request.method == 'DELETE':
+            api.supprimer(ressource, pk)
+            return HttpResponse(status=204)
+        api.enregistrer(ressource, api.loads(request.body), pk=pk, partiel=request.method == 'PATCH')
+        return _reponse_api(api.detail(ressource, pk, request.GET))
+    except api.ErreurApi as erreur:
+        return _erreur_api(erreur)
+
+@login_required
+@require_POST
+def presence_checkin_view(request):
+    """Enregistrement rapide des présences (unitaire ou par lot depuis une tablette)"""
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'JSON invalide'}, status=400)
+        entrees = payload.get('presences', []) if isinstance(payload, dict) else payload
+        if not isinstance(entrees, list):
+            return JsonResponse({'error': 'Liste de présences attendue'}, status=400)
+    else:
+        entrees = [{
+            'membre': request.POST.get('membre'),
+            'programme': request.POST.get('programme'),
+            'date': request.POST.get('date') or timezone.localdate().isoformat(),
+        }]
+
+    return JsonResponse(enregistrer_presences(entrees))
+
+DEMANDES_PAR_PAGE = 50
+
+@staff_member_required
+def demande_acces_moderation_view(request):
+    """File de modération des demandes d'accès, avec approbation et rejet par lot"""
+    if request.method == 'POST':
+        ids = [int(pk) for pk in request.POST.getlist('demandes') if pk.isdigit()]
+        action = request.POST.get('action')
+        if not ids:
+            messages.warning(request, "Aucune demande sélectionnée.")
+        elif action == 'approuver':
+            # Rôle choisi par le modérateur pour chaque demande (jamais le rôle souhaité saisi par le demandeur)
+            roles = {pk: request.POST.get(f'role_{pk}', '') for pk in ids}
+            approuvees, ignorees = approuver_demandes(ids, roles, adresse_site=request.build_absolute_uri('/')[:-1])
+            messages.success(
+                request,
+                f"{len(approuvees)} demande(s) approuvée(s) ; chaque compte reçoit par email "
+                f"un lien pour définir son mot de passe."
+            )
+            if ignorees:
+                messages.warning(request, f"{ignorees} demande(s) ignorée(s) : un compte existe déjà.")
+        elif action == 'rejeter':
+            nombre = rejeter_demandes(ids)
+            messages.success(request, f"{nombre} demande(s) rejetée(s).")
+        return redirect('demande_acces_moderation')
+
+    # Pagination par curseur (date, id) : coût constant quelle que soit la profondeur
+    demandes = DemandeAcces.objects.filter(est_traitee=False).order_by('date_demande', 'id')
+    apres_date = parse_datetime(request.GET.get('apres_date') or '')
+    apres_id = request.GET.get('apres_id', '')
+    if apres_date and apres_id.isdigit():
+        demandes = demandes.filter(
+            Q(date_demande__gt=apres_date) | Q(date_demande=apres_date, id__gt=int(apres_id))
+        )
+    demandes = list(demandes[:DEMANDES_PAR_PAGE + 1])
+    page_suivante = None
+    if len(demandes) > DEMANDES_PAR_PAGE:
+        demandes = demandes[:DEMANDES_PAR_PAGE]
+        page_suivante = {'apres_date': demandes[-1].date_demande.isoformat(), 'apres_id': demandes[-1].pk}
+
+    context = {
+        'demandes': demandes,
+        'page_suivante': page_suivante,
+        'roles_approbation': [choix for choix in Role.ROLES_CHOICES if choix[0] in ROLES_APPROBATION],
+    }
+    return render(request, 'demandes/moderation.html', context)
+
+NOTIFICATIONS_RECENTES = 20
+
+@role_required('pasteur')
+def notification_view(request):
+    """Envoi d'une notification à des groupes, des rôles ou toute l'église, et suivi des envois"""
+    if request.method == 'POST':
+        canal = request.POST.get('canal', 'email')
+        message = request.POST.get('message', '').strip()
+        groupes = [pk for pk in request.POST.getlist('groupes') if pk.isdigit()]
+        roles = [pk for pk in request.POST.getlist('roles') if pk.isdigit()]
+        tous = request.POST.get('tous') == 'on'
+
+        if canal not in dict(Notification.CANAL_CHOICES):
+            messages.error(request, "Canal inconnu.")
+        elif not message:
+            messages.error(request, "Le message est obligatoire.")
+        elif not (tous or groupes or roles):
+            messages.error(request, "Choisissez au moins un groupe, un rôle ou toute l'église.")
+        else:
+            if tous:
+                cible = "Toute l'église"
+            else:
+                noms = [str(groupe) for groupe in Groupe.objects.filter(pk__in=groupes)]
+                noms += [str(role) for role in Role.objects.filter(pk__in=roles)]
+                cible = ', '.join(noms)
+            notification, nombre = creer_notification(
+                canal, message, sujet=request.POST.get('sujet', '').strip(),
+                groupes=groupes, roles=roles, tous=tous,
+                auteur=request.user, description_cible=cible[:255],
+            )
+            messages.success(request, f"Notification mise en file pour {nombre} destinataire(s).")
+            return redirect('notifications')
+
+    # Suivi : nombre d'envois par statut pour les dernières notifications, en une requête
+    notifications = Notification.objects.select_related('auteur').annotate(
+        total=Count('envois'),
+        **{
+            statut: Count('envois', filter=Q(envois__statut=statut))
+            for statut, _ in EnvoiNotification.STATUT_CHOICES
+        }
+    )[:NOTIFICATIONS_RECENTES]
+
+    context = {
+        'notifications': notifications,
+        'canal_choices': Notification.CANAL_CHOICES,
+        'groupes': Groupe.objects.filter(is_active=True).only('id', 'nom_groupe'),
+        'roles': Role.objects.all(),
+    }
+    return render(request, 'notifications/notifications.html', context)
+
+@login_required
+def journal_audit_view(request, modele, pk):
+    """Historique des modifications d'un membre, d'un couple ou d'une transaction"""
+    model = audit.MODELES_PAR_NOM.get(modele)
+    if model is None:
+        raise Http404
+    if not has_role(request, *audit.ROLES_HISTORIQUE[modele]):
+        raise PermissionDenied
+    # L'objet peut avoir été désactivé ou supprimé : son historique reste consultable
+    objet = model._default_manager.filter(pk=pk).first()
+
+    paginator = Paginator(audit.historique(modele, pk), 25)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    for entree in page_obj:
+        entree.lignes = audit.lignes(model, entree.changements)
+
+    context = {
+        'modele': modele,
+        'libelle_modele': model._meta.verbose_name,
+        'objet': objet,
+        'objet_id': pk,
+        'page_obj': page_obj,
+        'page_range': paginator.get_elided_page_range(page_obj.number),
+    }
+    return render(request, 'audit/historique.html', context)